@@ -0,0 +1,198 @@
+"""Per-tool admission control: bounded concurrency with a capped wait queue."""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import inspect
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Tuple, TypeVar
+
+from data_analyst_mcp import config
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class AdmissionRejected(RuntimeError):
+    """Raised instead of queueing a tool call when the tool is over capacity."""
+
+    def __init__(self, name: str, reason: str) -> None:
+        self.name = name
+        self.reason = reason
+        super().__init__(f"{name} is over capacity ({reason}), retry later")
+
+
+class AdmissionController:
+    """Admit at most ``max_concurrency`` concurrent calls; up to ``max_queue`` more wait.
+
+    Calls beyond the queue cap are rejected immediately, and queued calls are rejected
+    after waiting ``queue_timeout`` seconds. ``max_concurrency <= 0`` disables the limit
+    (calls are only counted).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrency: int = 0,
+        max_queue: int = 0,
+        queue_timeout: Optional[float] = None,
+    ) -> None:
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self.queued = 0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._queue_wait_total = 0.0
+        self._queue_wait_max = 0.0
+        self._stats: Dict[str, int] = {
+            "admitted": 0,
+            "queued_total": 0,
+            "rejected": 0,
+            "timed_out": 0,
+        }
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        if self.max_concurrency <= 0:
+            self._admit(0.0)
+            try:
+                yield
+            finally:
+                self.in_flight -= 1
+            return
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        semaphore = self._semaphore
+
+        if semaphore.locked():
+            if self.queued >= self.max_queue:
+                self._stats["rejected"] += 1
+                logger.warning("%s rejected: %d in flight, %d queued", self.name, self.in_flight, self.queued)
+                raise AdmissionRejected(self.name, f"{self.queued} calls already queued")
+            await self._wait(semaphore)
+        else:
+            await semaphore.acquire()
+            self._admit(0.0)
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            semaphore.release()
+
+    async def _wait(self, semaphore: asyncio.Semaphore) -> None:
+        self.queued += 1
+        self._stats["queued_total"] += 1
+        started = time.monotonic()
+        try:
+            # Unlike wait_for, a timeout here cancels acquire() itself, which hands
+            # back a slot it was granted in the meantime.
+            async with asyncio.timeout(self.queue_timeout):
+                await semaphore.acquire()
+        except TimeoutError:
+            self._stats["timed_out"] += 1
+            logger.warning("%s rejected after waiting %.1fs for a slot", self.name, self.queue_timeout)
+            raise AdmissionRejected(
+                self.name, f"no slot within {self.queue_timeout:.1f}s"
+            ) from None
+        finally:
+            self.queued -= 1
+        self._admit(time.monotonic() - started)
+
+    def _admit(self, waited: float) -> None:
+        self.in_flight += 1
+        self._stats["admitted"] += 1
+        self._queue_wait_total += waited
+        self._queue_wait_max = max(self._queue_wait_max, waited)
+
+    def stats(self) -> Dict[str, Any]:
+        admitted = self._stats["admitted"]
+        return {
+            **self._stats,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "queue_wait_avg": self._queue_wait_total / admitted if admitted else 0.0,
+            "queue_wait_max": self._queue_wait_max,
+        }
+
+
+def parse_tool_limits(spec: str) -> Dict[str, Tuple[int, Optional[int]]]:
+    """Parse ``"tool=concurrency[:queue],..."`` into ``{tool: (concurrency, queue)}``."""
+
+    limits: Dict[str, Tuple[int, Optional[int]]] = {}
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        name, sep, value = item.partition("=")
+        if not sep:
+            raise ValueError(f"invalid tool limit {item!r}, expected tool=concurrency[:queue]")
+        concurrency, _, queue = value.partition(":")
+        limits[name.strip()] = (int(concurrency), int(queue) if queue else None)
+    return limits
+
+
+_controllers: Dict[str, AdmissionController] = {}
+
+
+def get_controller(name: str) -> AdmissionController:
+    """Return the process-wide admission controller for tool ``name``."""
+    controller = _controllers.get(name)
+    if controller is None:
+        concurrency, queue = parse_tool_limits(config.TOOL_CONCURRENCY_LIMITS).get(
+            name, (config.TOOL_MAX_CONCURRENCY, None)
+        )
+        controller = AdmissionController(
+            name,
+            max_concurrency=concurrency,
+            max_queue=config.TOOL_MAX_QUEUE if queue is None else queue,
+            queue_timeout=config.TOOL_QUEUE_TIMEOUT or None,
+        )
+        _controllers[name] = controller
+    return controller
+
+
+def admission_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: controller.stats() for name, controller in _controllers.items()}
+
+
+def admission_controlled(name: str) -> Callable[[F], F]:
+    """Run a tool function (coroutine or async generator) inside its admission slot.
+
+    Apply below ``@mcp.tool()``. The wrapper carries the tool's signature with its
+    annotations already evaluated, since FastMCP resolves string annotations against
+    the wrapper's module rather than the tool's. For async generators the slot is
+    taken when iteration starts and held until it ends; FastMCP 1.6 never iterates
+    generator tools, so there it only applies to callers that consume them directly.
+    """
+
+    def decorator(func: F) -> F:
+        if inspect.isasyncgenfunction(func):
+
+            @functools.wraps(func)
+            async def stream_wrapper(*args: Any, **kwargs: Any) -> Any:
+                async with get_controller(name).slot():
+                    async for item in func(*args, **kwargs):
+                        yield item
+
+            wrapped: Any = stream_wrapper
+        else:
+
+            @functools.wraps(func)
+            async def wrapper(*args: Any, **kwargs: Any) -> Any:
+                async with get_controller(name).slot():
+                    return await func(*args, **kwargs)
+
+            wrapped = wrapper
+        wrapped.__signature__ = inspect.signature(func, eval_str=True)
+        return wrapped  # type: ignore[no-any-return]
+
+    return decorator
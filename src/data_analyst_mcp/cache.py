@@ -0,0 +1,451 @@
+"""In-process caching primitives shared by the MCP servers."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, List, Optional, Tuple, TypeVar
+
+from data_analyst_mcp import fastjson
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def stable_hash(value: Any) -> str:
+    """Return a SHA-256 hex digest of ``value`` that is stable across processes."""
+
+    return hashlib.sha256(fastjson.dumps_bytes(value, sort_keys=True)).hexdigest()
+
+
+def approx_size(value: Any) -> int:
+    """Approximate the memory footprint of ``value`` by its JSON encoding length."""
+
+    try:
+        return len(fastjson.dumps_bytes(value))
+    except (TypeError, ValueError):
+        return sys.getsizeof(value)
+
+
+# Disk records are an expiry header line followed by the JSON-encoded value.
+_DISK_SUFFIX = ".json"
+
+
+@dataclass
+class _Entry:
+    value: Any
+    size: int
+    expires_at: Optional[float]
+
+
+class TTLCache:
+    """Thread-safe LRU cache with per-entry TTL and an optional byte budget.
+
+    When ``disk_dir`` is set, entries are also written there as files so they
+    survive restarts and can be shared between processes; values must then be
+    JSON-serializable and keys must be strings (use :func:`stable_hash`). The disk
+    tier is bounded by ``disk_max_entries`` / ``disk_max_bytes`` (file sizes; default
+    to ``max_entries`` / ``max_bytes``): expired and then least recently used files
+    are swept in a background thread on start-up and after every
+    ``disk_max_entries // 8`` writes. Code running on an event loop should use
+    :meth:`aget` / :meth:`aset`, which do the disk I/O in a worker thread.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+        disk_dir: Optional[str] = None,
+        sizeof: Callable[[Any], int] = approx_size,
+        disk_max_entries: Optional[int] = None,
+        disk_max_bytes: Optional[int] = None,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.disk_max_entries = max_entries if disk_max_entries is None else disk_max_entries
+        self.disk_max_bytes = max_bytes if disk_max_bytes is None else disk_max_bytes
+        self._sizeof = sizeof
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._disk_writes = 0
+        self._sweeper: Optional[threading.Thread] = None
+        self._stats: Dict[str, int] = {
+            "hits": 0,
+            "misses": 0,
+            "disk_hits": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "disk_evictions": 0,
+        }
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+            self._start_sweep()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        found, value = self._memory_get(key)
+        if found:
+            return value
+        return self._fallback_get(key, default)
+
+    async def aget(self, key: Hashable, default: Any = None) -> Any:
+        """Like :meth:`get`, reading the disk tier in a worker thread."""
+
+        found, value = self._memory_get(key)
+        if found:
+            return value
+        if self._disk_path(key) is None:
+            return self._fallback_get(key, default)
+        return await asyncio.to_thread(self._fallback_get, key, default)
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        resolved_ttl = self._memory_set(key, value, ttl)
+        self._disk_set(key, value, resolved_ttl)
+
+    async def aset(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Like :meth:`set`, writing the disk tier in a worker thread."""
+
+        resolved_ttl = self._memory_set(key, value, ttl)
+        if self._disk_path(key) is not None:
+            await asyncio.to_thread(self._disk_set, key, value, resolved_ttl)
+
+    def invalidate(self, key: Hashable) -> bool:
+        with self._lock:
+            removed = self._remove(key)
+        path = self._disk_path(key)
+        if path and os.path.exists(path):
+            removed = self._unlink(path) or removed
+        return removed
+
+    def invalidate_where(self, predicate: Callable[[Hashable, Any], bool]) -> int:
+        """Drop every entry, in memory and on disk, for which ``predicate(key, value)`` is true."""
+
+        with self._lock:
+            keys = {key for key, entry in self._entries.items() if predicate(key, entry.value)}
+            for key in keys:
+                self._remove(key)
+        for key, path in self._disk_files():
+            if key in keys:
+                self._unlink(path)
+                continue
+            record = self._read_record(path)
+            if record is not None and predicate(key, record[0]) and self._unlink(path):
+                keys.add(key)
+        return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+        for _, path in self._disk_files():
+            self._unlink(path)
+
+    def sweep_disk(self) -> int:
+        """Remove expired disk entries, then the least recently used ones over budget."""
+
+        if not self.disk_dir:
+            return 0
+        now = time.time()
+        files = []
+        removed = 0
+        for _, path in self._disk_files():
+            try:
+                stat = os.stat(path)
+                with open(path, "rb") as fh:
+                    expires_at = self._parse_header(fh.readline(64))
+            except (OSError, ValueError):
+                # Unreadable or from an older format.
+                removed += self._unlink(path)
+                continue
+            if expires_at is not None and expires_at <= now:
+                removed += self._unlink(path)
+            else:
+                files.append((stat.st_mtime, stat.st_size, path))
+
+        files.sort()
+        total = sum(size for _, size, _ in files)
+        evicted = 0
+        for _, size, path in files:
+            over_entries = len(files) - evicted > self.disk_max_entries
+            over_bytes = self.disk_max_bytes is not None and total > self.disk_max_bytes
+            if not over_entries and not over_bytes:
+                break
+            evicted += 1
+            total -= size
+            removed += self._unlink(path)
+        with self._lock:
+            self._stats["disk_evictions"] += evicted
+            self._disk_writes = 0
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._stats,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _memory_get(self, key: Hashable) -> Tuple[bool, Any]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            if entry.expires_at is not None and entry.expires_at <= now:
+                self._remove(key)
+                self._stats["expirations"] += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return True, entry.value
+
+    def _fallback_get(self, key: Hashable, default: Any) -> Any:
+        record = self._disk_get(key)
+        with self._lock:
+            if record is None:
+                self._stats["misses"] += 1
+                return default
+            value, expires_at = record
+            self._stats["disk_hits"] += 1
+            size = self._sizeof(value) if self.max_bytes is not None else 0
+            # Keep the remaining lifetime from the disk record, not a fresh TTL.
+            remaining = expires_at - time.time() if expires_at is not None else None
+            self._store(key, value, size, remaining)
+        return value
+
+    def _memory_set(self, key: Hashable, value: Any, ttl: Optional[float]) -> Optional[float]:
+        resolved_ttl = self.ttl if ttl is None else ttl
+        size = self._sizeof(value) if self.max_bytes is not None else 0
+        with self._lock:
+            self._store(key, value, size, resolved_ttl)
+        return resolved_ttl
+
+    def _store(self, key: Hashable, value: Any, size: int, ttl: Optional[float]) -> None:
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        self._remove(key)
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        self._entries[key] = _Entry(value=value, size=size, expires_at=expires_at)
+        self._bytes += size
+        while self._entries and (
+            len(self._entries) > self.max_entries
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self._stats["evictions"] += 1
+
+    def _remove(self, key: Hashable) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self._bytes -= entry.size
+        return True
+
+    def _disk_path(self, key: Hashable) -> Optional[str]:
+        if not self.disk_dir or not isinstance(key, str):
+            return None
+        return os.path.join(self.disk_dir, f"{key}{_DISK_SUFFIX}")
+
+    def _disk_files(self) -> List[Tuple[str, str]]:
+        if not self.disk_dir:
+            return []
+        try:
+            names = os.listdir(self.disk_dir)
+        except OSError:
+            return []
+        return [
+            (name[: -len(_DISK_SUFFIX)], os.path.join(self.disk_dir, name))
+            for name in names
+            if name.endswith(_DISK_SUFFIX)
+        ]
+
+    @staticmethod
+    def _unlink(path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            # Already removed by another process sharing the directory.
+            return False
+
+    @staticmethod
+    def _parse_header(line: bytes) -> Optional[float]:
+        # First line of a disk record: the wall-clock expiry, empty when it never expires.
+        if not line.endswith(b"\n"):
+            raise ValueError("missing cache record header")
+        header = line.strip()
+        return float(header) if header else None
+
+    def _read_record(self, path: str) -> Optional[Tuple[Any, Optional[float]]]:
+        try:
+            with open(path, "rb") as fh:
+                expires_at = self._parse_header(fh.readline(64))
+                value = fastjson.loads(fh.read())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exc:
+            logger.warning("read cache entry %s failed: %s", path, exc)
+            return None
+        if expires_at is not None and expires_at <= time.time():
+            self._unlink(path)
+            return None
+        return value, expires_at
+
+    def _disk_get(self, key: Hashable) -> Optional[Tuple[Any, Optional[float]]]:
+        path = self._disk_path(key)
+        if not path or not os.path.exists(path):
+            return None
+        record = self._read_record(path)
+        if record is not None:
+            try:
+                # Mark as recently used for the LRU sweep.
+                os.utime(path)
+            except OSError:
+                pass
+        return record
+
+    def _disk_set(self, key: Hashable, value: Any, ttl: Optional[float]) -> None:
+        path = self._disk_path(key)
+        if not path:
+            return
+        header = repr(time.time() + ttl).encode() if ttl is not None else b""
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as fh:
+                fh.write(header + b"\n" + fastjson.dumps_bytes(value))
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as exc:
+            logger.warning("write cache entry %s failed: %s", path, exc)
+            self._unlink(tmp_path)
+            return
+        with self._lock:
+            self._disk_writes += 1
+            sweep = self._disk_writes > max(1, self.disk_max_entries // 8)
+        if sweep:
+            self._start_sweep()
+
+    def _start_sweep(self) -> None:
+        with self._lock:
+            if self._sweeper is not None and self._sweeper.is_alive():
+                return
+            self._sweeper = threading.Thread(
+                target=self._background_sweep, name="ttl-cache-sweep", daemon=True
+            )
+            self._sweeper.start()
+
+    def _background_sweep(self) -> None:
+        try:
+            self.sweep_disk()
+        except Exception:  # noqa: BLE001
+            logger.exception("sweep of cache directory %s failed", self.disk_dir)
+
+
+class SingleFlight:
+    """Coalesce concurrent async calls sharing a key into a single execution.
+
+    The first caller for a key starts ``func`` in a task owned by the flight; every
+    caller, the first included, awaits that task's result (or exception) instead of
+    issuing a duplicate call. Cancelling a caller only stops its wait: the call keeps
+    running for the others.
+    """
+
+    def __init__(self) -> None:
+        self._inflight: Dict[Hashable, "asyncio.Future[Any]"] = {}
+        self._stats: Dict[str, int] = {"calls": 0, "coalesced": 0}
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        task = self._inflight.get(key)
+        if task is not None:
+            self._stats["coalesced"] += 1
+        else:
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            self._stats["calls"] += 1
+            task.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: "asyncio.Future[Any]") -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved when every caller stopped waiting.
+            task.exception()
+
+    def stats(self) -> Dict[str, int]:
+        return {**self._stats, "in_flight": len(self._inflight)}
+
+
+class AsyncOnce(Generic[T]):
+    """Async once-cell: run an initializer a single time and cache its result.
+
+    The initializer runs in a task owned by the cell, and callers arriving while it
+    runs await the same result instead of starting another one. Cancelling a caller
+    only stops its wait, never the initialization. A failed run is not cached, so the
+    next caller retries.
+    """
+
+    def __init__(self) -> None:
+        self._value: Optional[T] = None
+        self._done = False
+        self._future: Optional["asyncio.Future[T]"] = None
+        self._init_seconds: Optional[float] = None
+        self._stats: Dict[str, int] = {"attempts": 0, "failures": 0, "coalesced": 0}
+
+    @property
+    def done(self) -> bool:
+        return self._done
+
+    async def get(self, init: Callable[[], Awaitable[T]]) -> T:
+        if self._done:
+            return self._value  # type: ignore[return-value]
+        if self._future is not None:
+            self._stats["coalesced"] += 1
+        else:
+            self._stats["attempts"] += 1
+            self._future = asyncio.ensure_future(self._run(init))
+            self._future.add_done_callback(self._finish)
+        return await asyncio.shield(self._future)
+
+    async def _run(self, init: Callable[[], Awaitable[T]]) -> T:
+        started = time.perf_counter()
+        try:
+            value = await init()
+        except BaseException:
+            self._stats["failures"] += 1
+            raise
+        self._value = value
+        self._done = True
+        self._init_seconds = time.perf_counter() - started
+        return value
+
+    def _finish(self, future: "asyncio.Future[T]") -> None:
+        if self._future is future:
+            self._future = None
+        if not future.cancelled():
+            future.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "initialized": self._done,
+            "in_flight": self._future is not None,
+            "init_seconds": self._init_seconds,
+        }
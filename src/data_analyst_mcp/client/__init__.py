@@ -1,25 +1,27 @@
 """Client helpers for working with Ragflow and Vanna APIs."""
 
-from data_analyst_mcp.client.ragflow_server_api_client import (
-    AuthenticatedClient,
-    Client,
-    models,
-)
-from data_analyst_mcp.client.ragflow_server_api_client.api import retrieval
-from data_analyst_mcp.client.ragflow_server_api_client import ragflow_client
-from data_analyst_mcp.client.vanna_server_api_client import (
-    AuthenticatedClient as VannaAuthenticatedClient,
-)
-from data_analyst_mcp.client.vanna_server_api_client import Client as VannaClient
-from data_analyst_mcp.client.vanna_server_api_client import api as vanna_api
+import importlib
+from typing import Any, Dict, Tuple
 
-__all__ = [
-    "Client",
-    "AuthenticatedClient",
-    "retrieval",
-    "models",
-    "ragflow_client",
-    "VannaAuthenticatedClient",
-    "VannaClient",
-    "vanna_api",
-]
+# Exported name -> (module, attribute); resolved on first access so importing one
+# client does not load the other.
+_EXPORTS: Dict[str, Tuple[str, str]] = {
+    "Client": ("data_analyst_mcp.client.ragflow_server_api_client", "Client"),
+    "AuthenticatedClient": ("data_analyst_mcp.client.ragflow_server_api_client", "AuthenticatedClient"),
+    "retrieval": ("data_analyst_mcp.client.ragflow_server_api_client.api.retrieval", ""),
+    "models": ("data_analyst_mcp.client.ragflow_server_api_client.models", ""),
+    "ragflow_client": ("data_analyst_mcp.client.ragflow_server_api_client.ragflow_client", ""),
+    "VannaAuthenticatedClient": ("data_analyst_mcp.client.vanna_server_api_client", "AuthenticatedClient"),
+    "VannaClient": ("data_analyst_mcp.client.vanna_server_api_client", "Client"),
+    "vanna_api": ("data_analyst_mcp.client.vanna_server_api_client.api", ""),
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attribute = _EXPORTS[name]
+    module = importlib.import_module(module_name)
+    return getattr(module, attribute) if attribute else module
@@ -1,5 +1,13 @@
 """API package for lightrag_server_api_client."""
 
-from . import default, documents, graph, ollama, query
+import importlib
+from typing import Any
 
 __all__ = ["default", "documents", "graph", "ollama", "query"]
+
+
+def __getattr__(name: str) -> Any:
+    # Endpoint groups are imported on first access; callers usually need only one.
+    if name in __all__:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
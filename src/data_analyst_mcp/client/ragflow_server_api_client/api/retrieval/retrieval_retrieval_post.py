@@ -1,5 +1,5 @@
 from http import HTTPStatus
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, Optional, Type, TypeVar, Union
 
 import httpx
 
@@ -7,7 +7,14 @@ from ... import errors
 from ...client import AuthenticatedClient, Client
 from ...types import Response
 from ...models.ragflow_retrieval_request import RagflowRetrievalRequest
-from ...models.ragflow_retrieval_response import RagflowRetrievalResponse
+from ...models.ragflow_retrieval_response import (
+    RagflowRetrievalResponse,
+    RagflowRetrievalResponseLite,
+)
+
+# ``response_model`` selects the parsed shape: the full response, or
+# ``RagflowRetrievalResponseLite`` to skip chunk fields the caller does not use.
+R = TypeVar("R", bound=RagflowRetrievalResponseLite)
 
 
 def _get_kwargs(*, json_body: RagflowRetrievalRequest) -> Dict[str, Any]:
@@ -22,10 +29,14 @@ def _get_kwargs(*, json_body: RagflowRetrievalRequest) -> Dict[str, Any]:
 
 
 def _parse_response(
-    *, client: Union[AuthenticatedClient, Client], response: httpx.Response
-) -> Optional[RagflowRetrievalResponse]:
+    *,
+    client: Union[AuthenticatedClient, Client],
+    response: httpx.Response,
+    response_model: Type[R] = RagflowRetrievalResponse,  # type: ignore[assignment]
+) -> Optional[R]:
     if response.status_code == 200:
-        return RagflowRetrievalResponse.model_validate(response.json())
+        # Validate straight from the body bytes; pydantic parses them without a dict round trip.
+        return response_model.model_validate_json(response.content)
 
     if client.raise_on_unexpected_status:
         raise errors.UnexpectedStatus(response.status_code, response.content)
@@ -33,52 +44,71 @@ def _parse_response(
 
 
 def _build_response(
-    *, client: Union[AuthenticatedClient, Client], response: httpx.Response
-) -> Response[RagflowRetrievalResponse]:
+    *,
+    client: Union[AuthenticatedClient, Client],
+    response: httpx.Response,
+    response_model: Type[R] = RagflowRetrievalResponse,  # type: ignore[assignment]
+) -> Response[R]:
     return Response(
         status_code=HTTPStatus(response.status_code),
         content=response.content,
         headers=response.headers,
-        parsed=_parse_response(client=client, response=response),
+        parsed=_parse_response(client=client, response=response, response_model=response_model),
     )
 
 
 def sync_detailed(
-    *, client: AuthenticatedClient, json_body: RagflowRetrievalRequest
-) -> Response[RagflowRetrievalResponse]:
+    *,
+    client: AuthenticatedClient,
+    json_body: RagflowRetrievalRequest,
+    response_model: Type[R] = RagflowRetrievalResponse,  # type: ignore[assignment]
+) -> Response[R]:
     """Call Ragflow retrieval endpoint."""
 
     kwargs = _get_kwargs(json_body=json_body)
 
     response = client.get_httpx_client().request(**kwargs)
 
-    return _build_response(client=client, response=response)
+    return _build_response(client=client, response=response, response_model=response_model)
 
 
-def sync(*, client: AuthenticatedClient, json_body: RagflowRetrievalRequest) -> RagflowRetrievalResponse:
+def sync(
+    *,
+    client: AuthenticatedClient,
+    json_body: RagflowRetrievalRequest,
+    response_model: Type[R] = RagflowRetrievalResponse,  # type: ignore[assignment]
+) -> R:
     """Call Ragflow retrieval endpoint."""
 
-    return sync_detailed(client=client, json_body=json_body).parsed
+    return sync_detailed(client=client, json_body=json_body, response_model=response_model).parsed
 
 
 async def asyncio_detailed(
-    *, client: AuthenticatedClient, json_body: RagflowRetrievalRequest
-) -> Response[RagflowRetrievalResponse]:
+    *,
+    client: AuthenticatedClient,
+    json_body: RagflowRetrievalRequest,
+    response_model: Type[R] = RagflowRetrievalResponse,  # type: ignore[assignment]
+) -> Response[R]:
     """Call Ragflow retrieval endpoint asynchronously."""
 
     kwargs = _get_kwargs(json_body=json_body)
 
     response = await client.get_async_httpx_client().request(**kwargs)
 
-    return _build_response(client=client, response=response)
+    return _build_response(client=client, response=response, response_model=response_model)
 
 
 async def asyncio(
-    *, client: AuthenticatedClient, json_body: RagflowRetrievalRequest
-) -> RagflowRetrievalResponse:
+    *,
+    client: AuthenticatedClient,
+    json_body: RagflowRetrievalRequest,
+    response_model: Type[R] = RagflowRetrievalResponse,  # type: ignore[assignment]
+) -> R:
     """Call Ragflow retrieval endpoint asynchronously."""
 
-    detailed_response = await asyncio_detailed(client=client, json_body=json_body)
+    detailed_response = await asyncio_detailed(
+        client=client, json_body=json_body, response_model=response_model
+    )
     if detailed_response.parsed is None:
         raise errors.UnexpectedStatus(detailed_response.status_code, detailed_response.content)
     return detailed_response.parsed
@@ -36,9 +36,12 @@ from .ragflow_retrieval_request import (
 )
 from .ragflow_retrieval_response import (
     RagflowChunk,
+    RagflowChunkLite,
     RagflowDocAgg,
     RagflowRetrievalData,
+    RagflowRetrievalDataLite,
     RagflowRetrievalResponse,
+    RagflowRetrievalResponseLite,
 )
 
 __all__ = (
@@ -71,12 +74,15 @@ __all__ = (
     "QueryRequestMode",
     "QueryResponse",
     "RagflowChunk",
+    "RagflowChunkLite",
     "RagflowDocAgg",
     "RagflowMetadataCondition",
     "RagflowMetadataConditionClause",
     "RagflowRetrievalData",
+    "RagflowRetrievalDataLite",
     "RagflowRetrievalRequest",
     "RagflowRetrievalResponse",
+    "RagflowRetrievalResponseLite",
     "RelationRequest",
     "RelationRequestProperties",
     "ValidationError",
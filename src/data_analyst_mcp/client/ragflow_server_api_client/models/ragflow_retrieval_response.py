@@ -5,18 +5,27 @@ from typing import List, Optional
 from pydantic import BaseModel
 
 
-class RagflowChunk(BaseModel):
+class RagflowChunkLite(BaseModel):
+    """Chunk fields returned by the MCP retrieval tools.
+
+    Parsing into the ``*Lite`` models skips the remaining chunk fields (token lists,
+    positions, per-signal similarities) without building Python objects for them.
+    """
+
     content: str
-    content_ltks: Optional[str] = None
     document_id: Optional[str] = None
     document_keyword: Optional[str] = None
     highlight: Optional[str] = None
     id: Optional[str] = None
+    similarity: Optional[float] = None
+
+
+class RagflowChunk(RagflowChunkLite):
+    content_ltks: Optional[str] = None
     image_id: Optional[str] = None
     important_keywords: Optional[List[str]] = None
     kb_id: Optional[str] = None
     positions: Optional[List[str]] = None
-    similarity: Optional[float] = None
     term_similarity: Optional[float] = None
     vector_similarity: Optional[float] = None
 
@@ -27,16 +36,24 @@ class RagflowDocAgg(BaseModel):
     doc_name: str
 
 
-class RagflowRetrievalData(BaseModel):
-    chunks: List[RagflowChunk]
+class RagflowRetrievalDataLite(BaseModel):
+    chunks: List[RagflowChunkLite]
     doc_aggs: List[RagflowDocAgg]
     total: int
 
 
-class RagflowRetrievalResponse(BaseModel):
+class RagflowRetrievalData(RagflowRetrievalDataLite):
+    chunks: List[RagflowChunk]
+
+
+class RagflowRetrievalResponseLite(BaseModel):
     code: int
-    data: Optional[RagflowRetrievalData] = None
+    data: Optional[RagflowRetrievalDataLite] = None
     message: Optional[str] = None
 
     def is_success(self) -> bool:
         return self.code == 0
+
+
+class RagflowRetrievalResponse(RagflowRetrievalResponseLite):
+    data: Optional[RagflowRetrievalData] = None
@@ -1,7 +1,9 @@
 """Convenience helpers for Ragflow API calls."""
 
 import os
-from typing import List, Optional
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional, Type, TypeVar
+
+import httpx
 
 from .api.retrieval import retrieval_retrieval_post
 from .client import AuthenticatedClient
@@ -9,13 +11,28 @@ from .models.ragflow_retrieval_request import (
     RagflowMetadataCondition,
     RagflowRetrievalRequest,
 )
-from .models.ragflow_retrieval_response import RagflowRetrievalResponse
+from .models.ragflow_retrieval_response import (
+    RagflowRetrievalResponse,
+    RagflowRetrievalResponseLite,
+)
+
+if TYPE_CHECKING:
+    from data_analyst_mcp.retrieval_cache import RetrievalCache
+
+R = TypeVar("R", bound=RagflowRetrievalResponseLite)
 
 
 def build_ragflow_client(
-    base_url: Optional[str] = None, api_key: Optional[str] = None
+    base_url: Optional[str] = None,
+    api_key: Optional[str] = None,
+    timeout: Optional[httpx.Timeout] = None,
+    httpx_args: Optional[Dict[str, Any]] = None,
 ) -> AuthenticatedClient:
-    """Create an authenticated Ragflow API client using environment fallbacks."""
+    """Create an authenticated Ragflow API client using environment fallbacks.
+
+    ``timeout`` and ``httpx_args`` (e.g. ``limits``, ``http2``) are passed to the
+    underlying ``httpx`` clients.
+    """
 
     resolved_base_url = base_url or os.getenv("RAGFLOW_API_BASE")
     resolved_api_key = api_key or os.getenv("RAGFLOW_API_KEY")
@@ -27,6 +44,8 @@ def build_ragflow_client(
         base_url=resolved_base_url,
         token=resolved_api_key,
         verify_ssl=False,
+        timeout=timeout,
+        httpx_args=httpx_args or {},
     )
 
 
@@ -47,8 +66,17 @@ async def ragflow_retrieve_chunks(
     metadata_condition: Optional[RagflowMetadataCondition] = None,
     cross_languages: Optional[List[str]] = None,
     rerank_id: Optional[str] = None,
-) -> RagflowRetrievalResponse:
-    """Execute Ragflow retrieval."""
+    cache: Optional["RetrievalCache"] = None,
+    response_model: Type[R] = RagflowRetrievalResponse,  # type: ignore[assignment]
+    wrap_call: Optional[Callable[[Callable[[], Awaitable[Any]]], Awaitable[Any]]] = None,
+) -> R:
+    """Execute Ragflow retrieval, serving repeated requests from ``cache`` when given.
+
+    ``response_model=RagflowRetrievalResponseLite`` parses only the chunk fields the
+    MCP tools return. A cached response is reused when it has at least those fields.
+    ``wrap_call`` (e.g. retries through a circuit breaker) wraps only the request to
+    Ragflow, so cache hits never pass through it.
+    """
 
     request = RagflowRetrievalRequest(
         question=question,
@@ -67,4 +95,18 @@ async def ragflow_retrieve_chunks(
         rerank_id=rerank_id,
     )
 
-    return await retrieval_retrieval_post.asyncio(client=client, json_body=request)
+    if cache is not None:
+        cached = cache.get(request)
+        if isinstance(cached, response_model):
+            return cached
+
+    def _send() -> Awaitable[R]:
+        return retrieval_retrieval_post.asyncio(
+            client=client, json_body=request, response_model=response_model
+        )
+
+    response: R = await (wrap_call(_send) if wrap_call is not None else _send())
+
+    if cache is not None:
+        cache.set(request, response)
+    return response
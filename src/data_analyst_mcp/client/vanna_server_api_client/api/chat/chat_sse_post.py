@@ -2,11 +2,12 @@
 
 from __future__ import annotations
 
-import json
 from typing import Any, AsyncIterator, Dict, List, Optional
 
 import httpx
 
+from data_analyst_mcp import fastjson
+
 from ...client import AuthenticatedClient
 
 
@@ -19,7 +20,11 @@ async def chat_sse_stream(
     acceptable_responses: Optional[List[str]] = None,
     timeout: Optional[float | httpx.Timeout] = None,
 ) -> AsyncIterator[Dict[str, Any]]:
-    """Stream responses from Vanna `/api/v0/chat_sse` endpoint."""
+    """Stream responses from Vanna `/api/v0/chat_sse` endpoint.
+
+    With ``timeout=None`` the client's connect/write/pool timeouts apply but reads
+    never time out, so long pauses between events do not cut the answer off.
+    """
 
     url = client.base_url + "/api/v0/chat_sse"
 
@@ -37,7 +42,16 @@ async def chat_sse_stream(
     }
     payload = {key: value for key, value in payload.items() if value is not None}
 
-    async with client.get_async_httpx_client().stream(
+    http_client = client.get_async_httpx_client()
+    if timeout is None:
+        timeout = httpx.Timeout(
+            connect=http_client.timeout.connect,
+            read=None,
+            write=http_client.timeout.write,
+            pool=http_client.timeout.pool,
+        )
+
+    async with http_client.stream(
         "POST", url, headers=headers, json=payload, timeout=timeout
     ) as response:
         response.raise_for_status()
@@ -50,5 +64,5 @@ async def chat_sse_stream(
             if not raw_json or raw_json == "[DONE]":
                 break
 
-            data = json.loads(raw_json)
+            data = fastjson.loads(raw_json)
             yield data
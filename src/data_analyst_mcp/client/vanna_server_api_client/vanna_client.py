@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 import os
-from typing import Optional
+from typing import Any, Dict, Optional
+
+import httpx
 
 from .api.chat.chat_sse_post import chat_sse_stream
 from .client import AuthenticatedClient
@@ -11,8 +13,17 @@ from .client import AuthenticatedClient
 __all__ = ["build_vanna_client", "chat_sse_stream"]
 
 
-def build_vanna_client(base_url: Optional[str] = None, api_key: Optional[str] = None) -> AuthenticatedClient:
-    """Build an authenticated Vanna client from parameters or environment variables."""
+def build_vanna_client(
+    base_url: Optional[str] = None,
+    api_key: Optional[str] = None,
+    timeout: Optional[httpx.Timeout] = None,
+    httpx_args: Optional[Dict[str, Any]] = None,
+) -> AuthenticatedClient:
+    """Build an authenticated Vanna client from parameters or environment variables.
+
+    ``timeout`` and ``httpx_args`` (e.g. ``limits``, ``http2``) are passed to the
+    underlying ``httpx`` clients.
+    """
 
     resolved_base_url = base_url or os.getenv("VANNA_API_BASE")
     resolved_api_key = api_key or os.getenv("VANNA_API_KEY")
@@ -24,4 +35,6 @@ def build_vanna_client(base_url: Optional[str] = None, api_key: Optional[str] =
         base_url=resolved_base_url,
         token=resolved_api_key,
         verify_ssl=False,
+        timeout=timeout,
+        httpx_args=httpx_args or {},
     )
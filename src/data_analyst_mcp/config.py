@@ -1,93 +1,300 @@
 """
 Configuration module for Vanna MCP server (with Ragflow compatibility).
+
+Settings are resolved lazily: the ``.env`` file and environment variables are read
+once, on first access of a setting such as ``config.RAGFLOW_API_BASE_URL``, so
+importing the package has no side effects. Command line arguments are only parsed
+by entry points, through :func:`configure`; a host process's own ``sys.argv`` is
+never read.
 """
 
 import argparse
 import os
+import threading
+from types import SimpleNamespace
+from typing import Any, Dict, Optional, Sequence
 
 from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
-DEFAULT_HOST = os.getenv("RAGFLOW_API_HOST", "localhost")
-DEFAULT_PORT = int(os.getenv("RAGFLOW_API_PORT", 9621))
-DEFAULT_API_KEY = os.getenv("RAGFLOW_API_KEY", "")
-DEFAULT_API_BASE = os.getenv("RAGFLOW_API_BASE")
 
-DEFAULT_VANNA_HOST = os.getenv("VANNA_API_HOST", DEFAULT_HOST)
-DEFAULT_VANNA_PORT = int(os.getenv("VANNA_API_PORT", 9621))
-DEFAULT_VANNA_API_KEY = os.getenv("VANNA_API_KEY", "")
-DEFAULT_VANNA_API_BASE = os.getenv("VANNA_API_BASE")
+class Settings(SimpleNamespace):
+    """Resolved configuration values, exposed as upper-case attributes."""
+
+
+_settings: Optional[Settings] = None
+_settings_lock = threading.Lock()
 
-DEFAULT_VANNA_LLM_MODEL = os.getenv("VANNA_LLM_MODEL", "deepseek-chat")
-DEFAULT_VANNA_LLM_API_KEY = os.getenv("VANNA_LLM_API_KEY", "")
-DEFAULT_VANNA_LLM_BASE_URL = os.getenv("VANNA_LLM_BASE_URL", "https://api.deepseek.com/v1")
 
-DEFAULT_VANNA_PG_CONN_STR = os.getenv("VANNA_PG_CONN_STR", "")
+def _env_flag(name: str, default: bool = False) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in {"1", "true", "yes", "on"}
 
-DEFAULT_VANNA_MEMORY_COLLECTION = os.getenv("VANNA_MEMORY_COLLECTION", "vanna_memory")
-DEFAULT_VANNA_CHROMA_DIR = os.getenv("VANNA_CHROMA_DIR", "./chroma_db")
 
-DEFAULT_VANNA_EMBED_BASE_URL = os.getenv("VANNA_EMBED_BASE_URL", "")
-DEFAULT_VANNA_EMBED_API_KEY = os.getenv("VANNA_EMBED_API_KEY", "")
-DEFAULT_VANNA_EMBED_MODEL = os.getenv("VANNA_EMBED_MODEL", "qwen3-emb-0.6b")
+def _env_settings() -> Dict[str, Any]:
+    """Read settings from the environment, after loading the ``.env`` file."""
 
-DEFAULT_RICH_ASSET_TIMEOUT = float(os.getenv("RICH_ASSET_TIMEOUT", "8"))
+    load_dotenv()
+    host = os.getenv("RAGFLOW_API_HOST", "localhost")
 
+    return {
+        "RAGFLOW_API_HOST": host,
+        "RAGFLOW_API_PORT": int(os.getenv("RAGFLOW_API_PORT", 9621)),
+        "RAGFLOW_API_KEY": os.getenv("RAGFLOW_API_KEY", ""),
+        "RAGFLOW_API_BASE_URL": os.getenv("RAGFLOW_API_BASE"),
+        "RAGFLOW_RETRIEVAL_CACHE_ENABLED": _env_flag("RAGFLOW_RETRIEVAL_CACHE_ENABLED", True),
+        "RAGFLOW_RETRIEVAL_CACHE_TTL": float(os.getenv("RAGFLOW_RETRIEVAL_CACHE_TTL", "300")),
+        "RAGFLOW_RETRIEVAL_CACHE_MAX_ENTRIES": int(
+            os.getenv("RAGFLOW_RETRIEVAL_CACHE_MAX_ENTRIES", "256")
+        ),
+        "RAGFLOW_BATCH_CONCURRENCY": int(os.getenv("RAGFLOW_BATCH_CONCURRENCY", "4")),
+        "VANNA_API_HOST": os.getenv("VANNA_API_HOST", host),
+        "VANNA_API_PORT": int(os.getenv("VANNA_API_PORT", 9621)),
+        "VANNA_API_KEY": os.getenv("VANNA_API_KEY", ""),
+        "VANNA_API_BASE_URL": os.getenv("VANNA_API_BASE"),
+        "HTTP_MAX_CONNECTIONS": int(os.getenv("HTTP_MAX_CONNECTIONS", "100")),
+        "HTTP_MAX_KEEPALIVE_CONNECTIONS": int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20")),
+        "HTTP_KEEPALIVE_EXPIRY": float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30")),
+        "HTTP2": _env_flag("HTTP2"),
+        "HTTP_CONNECT_TIMEOUT": float(os.getenv("HTTP_CONNECT_TIMEOUT", "5")),
+        "HTTP_READ_TIMEOUT": float(os.getenv("HTTP_READ_TIMEOUT", "60")),
+        "HTTP_WRITE_TIMEOUT": float(os.getenv("HTTP_WRITE_TIMEOUT", "30")),
+        "HTTP_POOL_TIMEOUT": float(os.getenv("HTTP_POOL_TIMEOUT", "10")),
+        "JSON_BACKEND": os.getenv("JSON_BACKEND", "auto"),
+        "RETRY_ATTEMPTS": int(os.getenv("RETRY_ATTEMPTS", "2")),
+        "RETRY_BACKOFF_BASE": float(os.getenv("RETRY_BACKOFF_BASE", "0.2")),
+        "RETRY_BACKOFF_MAX": float(os.getenv("RETRY_BACKOFF_MAX", "2")),
+        "TOOL_MAX_CONCURRENCY": int(os.getenv("TOOL_MAX_CONCURRENCY", "0")),
+        "TOOL_MAX_QUEUE": int(os.getenv("TOOL_MAX_QUEUE", "32")),
+        "TOOL_QUEUE_TIMEOUT": float(os.getenv("TOOL_QUEUE_TIMEOUT", "30")),
+        "TOOL_CONCURRENCY_LIMITS": os.getenv("TOOL_CONCURRENCY_LIMITS", ""),
+        "CIRCUIT_FAILURE_THRESHOLD": int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5")),
+        "CIRCUIT_RESET_TIMEOUT": float(os.getenv("CIRCUIT_RESET_TIMEOUT", "30")),
+        "VANNA_LLM_MODEL": os.getenv("VANNA_LLM_MODEL", "deepseek-chat"),
+        "VANNA_LLM_API_KEY": os.getenv("VANNA_LLM_API_KEY", ""),
+        "VANNA_LLM_BASE_URL": os.getenv("VANNA_LLM_BASE_URL", "https://api.deepseek.com/v1"),
+        "VANNA_LLM_TEMPERATURE": float(os.getenv("VANNA_LLM_TEMPERATURE", "0.7")),
+        "VANNA_LLM_CACHE": os.getenv("VANNA_LLM_CACHE", "off"),
+        "VANNA_LLM_CACHE_TTL": float(os.getenv("VANNA_LLM_CACHE_TTL", "3600")),
+        "VANNA_LLM_CACHE_MAX_ENTRIES": int(os.getenv("VANNA_LLM_CACHE_MAX_ENTRIES", "512")),
+        "VANNA_PG_CONN_STR": os.getenv("VANNA_PG_CONN_STR", ""),
+        "VANNA_PG_POOL_MIN_SIZE": int(os.getenv("VANNA_PG_POOL_MIN_SIZE", "1")),
+        "VANNA_PG_POOL_MAX_SIZE": int(os.getenv("VANNA_PG_POOL_MAX_SIZE", "10")),
+        "VANNA_PG_POOL_TIMEOUT": float(os.getenv("VANNA_PG_POOL_TIMEOUT", "30")),
+        "VANNA_SQL_STATEMENT_TIMEOUT": float(os.getenv("VANNA_SQL_STATEMENT_TIMEOUT", "60")),
+        "VANNA_SQL_ROW_LIMIT": int(os.getenv("VANNA_SQL_ROW_LIMIT", "0")),
+        "VANNA_SQL_CACHE_ENABLED": _env_flag("VANNA_SQL_CACHE_ENABLED", True),
+        "VANNA_SQL_CACHE_TTL": float(os.getenv("VANNA_SQL_CACHE_TTL", "300")),
+        "VANNA_SQL_CACHE_MAX_ENTRIES": int(os.getenv("VANNA_SQL_CACHE_MAX_ENTRIES", "256")),
+        "VANNA_SQL_CACHE_MAX_BYTES": int(
+            os.getenv("VANNA_SQL_CACHE_MAX_BYTES", str(64 * 1024 * 1024))
+        ),
+        "VANNA_MEMORY_COLLECTION": os.getenv("VANNA_MEMORY_COLLECTION", "vanna_memory"),
+        "VANNA_CHROMA_DIR": os.getenv("VANNA_CHROMA_DIR", "./chroma_db"),
+        "VANNA_EMBED_BASE_URL": os.getenv("VANNA_EMBED_BASE_URL", ""),
+        "VANNA_EMBED_API_KEY": os.getenv("VANNA_EMBED_API_KEY", ""),
+        "VANNA_EMBED_MODEL": os.getenv("VANNA_EMBED_MODEL", "qwen3-emb-0.6b"),
+        "VANNA_EMBED_CACHE_ENABLED": _env_flag("VANNA_EMBED_CACHE_ENABLED", True),
+        "VANNA_EMBED_CACHE_MAX_ENTRIES": int(os.getenv("VANNA_EMBED_CACHE_MAX_ENTRIES", "4096")),
+        "VANNA_EMBED_CACHE_MAX_BYTES": int(
+            os.getenv("VANNA_EMBED_CACHE_MAX_BYTES", str(64 * 1024 * 1024))
+        ),
+        "VANNA_EMBED_CACHE_DIR": os.getenv("VANNA_EMBED_CACHE_DIR", ""),
+        "VANNA_EMBED_BATCH_WINDOW_MS": float(os.getenv("VANNA_EMBED_BATCH_WINDOW_MS", "0")),
+        "VANNA_EMBED_BATCH_MAX_SIZE": int(os.getenv("VANNA_EMBED_BATCH_MAX_SIZE", "64")),
+        "VANNA_CONVERSATION_MAX": int(os.getenv("VANNA_CONVERSATION_MAX", "1000")),
+        "VANNA_CONVERSATION_IDLE_TTL": float(os.getenv("VANNA_CONVERSATION_IDLE_TTL", "86400")),
+        "VANNA_CONVERSATION_MAX_TURNS": int(os.getenv("VANNA_CONVERSATION_MAX_TURNS", "20")),
+        "VANNA_CONVERSATION_DB": os.getenv("VANNA_CONVERSATION_DB", ""),
+        "VANNA_WARMUP": _env_flag("VANNA_WARMUP"),
+        "VANNA_MCP_WORKERS": int(os.getenv("VANNA_MCP_WORKERS", "1")),
+        "VANNA_RAW_EVENTS": os.getenv("VANNA_RAW_EVENTS", "full"),
+        "VANNA_RAW_EVENTS_MAX_BYTES": int(os.getenv("VANNA_RAW_EVENTS_MAX_BYTES", "0")),
+        "RICH_ASSET_BASE_URL": os.getenv("RICH_ASSET_BASE_URL"),
+        "RICH_ASSET_TIMEOUT": float(os.getenv("RICH_ASSET_TIMEOUT", "8")),
+        "RICH_ASSET_MAX_CONNECTIONS": int(os.getenv("RICH_ASSET_MAX_CONNECTIONS", "20")),
+        "RICH_ASSET_MAX_KEEPALIVE_CONNECTIONS": int(
+            os.getenv("RICH_ASSET_MAX_KEEPALIVE_CONNECTIONS", "10")
+        ),
+        "RICH_ASSET_PIPELINE": _env_flag("RICH_ASSET_PIPELINE"),
+        "RICH_ASSET_CACHE_ENABLED": _env_flag("RICH_ASSET_CACHE_ENABLED", True),
+        "RICH_ASSET_CACHE_TTL": float(os.getenv("RICH_ASSET_CACHE_TTL", "3600")),
+        "RICH_ASSET_CACHE_MAX_ENTRIES": int(os.getenv("RICH_ASSET_CACHE_MAX_ENTRIES", "512")),
+        "RICH_ASSET_CACHE_MAX_BYTES": int(
+            os.getenv("RICH_ASSET_CACHE_MAX_BYTES", str(16 * 1024 * 1024))
+        ),
+        "RICH_ASSET_CACHE_DIR": os.getenv("RICH_ASSET_CACHE_DIR", ""),
+    }
 
-def parse_args():
-    """Parse command line arguments for Vanna MCP server."""
 
-    parser = argparse.ArgumentParser(description="Vanna MCP Server")
+def build_parser(defaults: Dict[str, Any], add_help: bool = True) -> argparse.ArgumentParser:
+    """Build the command line parser; each option overrides the same-named setting."""
+
+    parser = argparse.ArgumentParser(
+        description="Vanna MCP Server", add_help=add_help, allow_abbrev=add_help
+    )
     parser.add_argument(
-        "--host", default=DEFAULT_HOST, help=f"Ragflow API host (default: {DEFAULT_HOST})"
+        "--host",
+        dest="RAGFLOW_API_HOST",
+        default=defaults["RAGFLOW_API_HOST"],
+        help=f"Ragflow API host (default: {defaults['RAGFLOW_API_HOST']})",
     )
     parser.add_argument(
         "--port",
+        dest="RAGFLOW_API_PORT",
         type=int,
-        default=DEFAULT_PORT,
-        help=f"Ragflow API port (default: {DEFAULT_PORT})",
+        default=defaults["RAGFLOW_API_PORT"],
+        help=f"Ragflow API port (default: {defaults['RAGFLOW_API_PORT']})",
+    )
+    parser.add_argument(
+        "--api-key",
+        dest="RAGFLOW_API_KEY",
+        default=defaults["RAGFLOW_API_KEY"],
+        help="Ragflow API key (optional)",
     )
-    parser.add_argument("--api-key", default=DEFAULT_API_KEY, help="Ragflow API key (optional)")
     parser.add_argument(
         "--base-url",
-        default=DEFAULT_API_BASE,
+        dest="RAGFLOW_API_BASE_URL",
+        default=defaults["RAGFLOW_API_BASE_URL"],
         help="Full Ragflow API base URL (overrides host/port if provided)",
     )
     parser.add_argument(
         "--vanna-api-key",
-        default=DEFAULT_VANNA_API_KEY,
+        dest="VANNA_API_KEY",
+        default=defaults["VANNA_API_KEY"],
         help="Vanna API key (optional)",
     )
     parser.add_argument(
         "--vanna-base-url",
-        default=DEFAULT_VANNA_API_BASE,
+        dest="VANNA_API_BASE_URL",
+        default=defaults["VANNA_API_BASE_URL"],
         help="Full Vanna API base URL",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--http-max-connections",
+        dest="HTTP_MAX_CONNECTIONS",
+        type=int,
+        default=defaults["HTTP_MAX_CONNECTIONS"],
+        help=f"Connection pool size for Ragflow/Vanna clients (default: {defaults['HTTP_MAX_CONNECTIONS']})",
+    )
+    parser.add_argument(
+        "--http-max-keepalive-connections",
+        dest="HTTP_MAX_KEEPALIVE_CONNECTIONS",
+        type=int,
+        default=defaults["HTTP_MAX_KEEPALIVE_CONNECTIONS"],
+        help=f"Idle keep-alive connections kept in the pool (default: {defaults['HTTP_MAX_KEEPALIVE_CONNECTIONS']})",
+    )
+    parser.add_argument(
+        "--http-keepalive-expiry",
+        dest="HTTP_KEEPALIVE_EXPIRY",
+        type=float,
+        default=defaults["HTTP_KEEPALIVE_EXPIRY"],
+        help=f"Seconds before an idle keep-alive connection is closed (default: {defaults['HTTP_KEEPALIVE_EXPIRY']})",
+    )
+    parser.add_argument(
+        "--http2",
+        dest="HTTP2",
+        action=argparse.BooleanOptionalAction,
+        default=defaults["HTTP2"],
+        help="Enable HTTP/2 for Ragflow/Vanna clients (requires the h2 package)",
+    )
+    parser.add_argument(
+        "--connect-timeout",
+        dest="HTTP_CONNECT_TIMEOUT",
+        type=float,
+        default=defaults["HTTP_CONNECT_TIMEOUT"],
+        help=f"Connect timeout in seconds (default: {defaults['HTTP_CONNECT_TIMEOUT']})",
+    )
+    parser.add_argument(
+        "--read-timeout",
+        dest="HTTP_READ_TIMEOUT",
+        type=float,
+        default=defaults["HTTP_READ_TIMEOUT"],
+        help=f"Read timeout in seconds (default: {defaults['HTTP_READ_TIMEOUT']})",
+    )
+    parser.add_argument(
+        "--write-timeout",
+        dest="HTTP_WRITE_TIMEOUT",
+        type=float,
+        default=defaults["HTTP_WRITE_TIMEOUT"],
+        help=f"Write timeout in seconds (default: {defaults['HTTP_WRITE_TIMEOUT']})",
+    )
+    parser.add_argument(
+        "--pool-timeout",
+        dest="HTTP_POOL_TIMEOUT",
+        type=float,
+        default=defaults["HTTP_POOL_TIMEOUT"],
+        help=f"Seconds to wait for a free pooled connection (default: {defaults['HTTP_POOL_TIMEOUT']})",
+    )
+    parser.add_argument(
+        "--warmup",
+        dest="VANNA_WARMUP",
+        action=argparse.BooleanOptionalAction,
+        default=defaults["VANNA_WARMUP"],
+        help="Build and warm up the Vanna agent at server start, before reporting ready",
+    )
+    parser.add_argument(
+        "--workers",
+        dest="VANNA_MCP_WORKERS",
+        type=int,
+        default=defaults["VANNA_MCP_WORKERS"],
+        help="Worker processes for the SSE server; 0 uses one per CPU "
+        f"(default: {defaults['VANNA_MCP_WORKERS']})",
+    )
+    parser.add_argument(
+        "--profile-startup",
+        dest="PROFILE_STARTUP",
+        action="store_true",
+        help="Print an import-time breakdown of the server and exit",
+    )
+    return parser
 
 
-args = parse_args()
+def _resolve_settings(argv: Optional[Sequence[str]]) -> Settings:
+    values = _env_settings()
+    args = build_parser(values).parse_args(argv)
+    values.update(vars(args))
+
+    values["RAGFLOW_API_BASE_URL"] = (
+        values["RAGFLOW_API_BASE_URL"]
+        or f"http://{values['RAGFLOW_API_HOST']}:{values['RAGFLOW_API_PORT']}"
+    )
+    values["VANNA_API_BASE_URL"] = (
+        values["VANNA_API_BASE_URL"] or f"http://{values['VANNA_API_HOST']}:{values['VANNA_API_PORT']}"
+    )
+    values["RICH_ASSET_BASE_URL"] = values["RICH_ASSET_BASE_URL"] or values["RAGFLOW_API_BASE_URL"]
+    values["VANNA_RAW_EVENTS_MAX_BYTES"] = values["VANNA_RAW_EVENTS_MAX_BYTES"] or None
+    return Settings(**values)
+
 
-RAGFLOW_API_HOST = args.host
-RAGFLOW_API_PORT = args.port
-RAGFLOW_API_KEY = args.api_key
-RAGFLOW_API_BASE_URL = args.base_url or f"http://{RAGFLOW_API_HOST}:{RAGFLOW_API_PORT}"
-RICH_ASSET_BASE_URL = os.getenv("RICH_ASSET_BASE_URL", RAGFLOW_API_BASE_URL)
-RICH_ASSET_TIMEOUT = DEFAULT_RICH_ASSET_TIMEOUT
+def configure(argv: Optional[Sequence[str]] = None) -> Settings:
+    """Resolve settings from the environment and ``argv`` (default: ``sys.argv[1:]``).
 
-VANNA_API_KEY = args.vanna_api_key
-VANNA_API_BASE_URL = args.vanna_base_url or f"http://{DEFAULT_VANNA_HOST}:{DEFAULT_VANNA_PORT}"
+    Unknown options are rejected, so entry points should call this before serving.
+    Calling it again replaces the previously resolved settings.
+    """
+    global _settings
+    settings = _resolve_settings(argv)
+    with _settings_lock:
+        _settings = settings
+    return settings
 
-VANNA_LLM_MODEL = DEFAULT_VANNA_LLM_MODEL
-VANNA_LLM_API_KEY = DEFAULT_VANNA_LLM_API_KEY
-VANNA_LLM_BASE_URL = DEFAULT_VANNA_LLM_BASE_URL
 
-VANNA_PG_CONN_STR = DEFAULT_VANNA_PG_CONN_STR
+def get_settings() -> Settings:
+    """Return the cached settings, resolving them from the environment on first use."""
+    global _settings
+    if _settings is None:
+        with _settings_lock:
+            if _settings is None:
+                _settings = _resolve_settings([])
+    return _settings
 
-VANNA_MEMORY_COLLECTION = DEFAULT_VANNA_MEMORY_COLLECTION
-VANNA_CHROMA_DIR = DEFAULT_VANNA_CHROMA_DIR
 
-VANNA_EMBED_BASE_URL = DEFAULT_VANNA_EMBED_BASE_URL
-VANNA_EMBED_API_KEY = DEFAULT_VANNA_EMBED_API_KEY
-VANNA_EMBED_MODEL = DEFAULT_VANNA_EMBED_MODEL
+def __getattr__(name: str) -> Any:
+    if name.isupper():
+        try:
+            return getattr(get_settings(), name)
+        except AttributeError:
+            pass
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,102 @@
+"""JSON encode/decode used on hot paths, backed by orjson when it is installed.
+
+``JSON_BACKEND`` selects ``orjson``, ``stdlib`` or ``auto`` (orjson if importable).
+Both backends produce compact UTF-8 JSON, and values JSON cannot represent natively
+(pydantic models, datetimes, sets, ...) are converted with
+``pydantic_core.to_jsonable_python``, falling back to ``str``.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from typing import Any, Optional, Union
+
+import pydantic_core
+
+from data_analyst_mcp import config
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("auto", "orjson", "stdlib")
+
+
+def _default(value: Any) -> Any:
+    return pydantic_core.to_jsonable_python(value, fallback=str)
+
+
+class _StdlibBackend:
+    name = "stdlib"
+
+    def loads(self, data: Union[str, bytes, bytearray]) -> Any:
+        return json.loads(data)
+
+    def dumps(self, value: Any, sort_keys: bool = False) -> bytes:
+        return json.dumps(
+            value, ensure_ascii=False, separators=(",", ":"), sort_keys=sort_keys, default=_default
+        ).encode("utf-8")
+
+
+class _OrjsonBackend:
+    name = "orjson"
+
+    def __init__(self, fallback: _StdlibBackend) -> None:
+        self._fallback = fallback
+
+    def loads(self, data: Union[str, bytes, bytearray]) -> Any:
+        return orjson.loads(data)
+
+    def dumps(self, value: Any, sort_keys: bool = False) -> bytes:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(value, default=_default, option=option)
+        except TypeError:
+            # e.g. integers beyond 64 bits, which orjson refuses
+            return self._fallback.dumps(value, sort_keys=sort_keys)
+
+
+_backend: Optional[Union[_StdlibBackend, _OrjsonBackend]] = None
+
+
+def _resolve_backend() -> Union[_StdlibBackend, _OrjsonBackend]:
+    choice = config.JSON_BACKEND
+    if choice not in BACKENDS:
+        raise ValueError(f"invalid JSON_BACKEND {choice!r}, expected one of {BACKENDS}")
+    stdlib = _StdlibBackend()
+    if choice == "stdlib":
+        return stdlib
+    if orjson is None:
+        if choice == "orjson":
+            logger.warning("JSON_BACKEND=orjson but orjson is not installed; using the json module")
+        return stdlib
+    return _OrjsonBackend(stdlib)
+
+
+def _get_backend() -> Union[_StdlibBackend, _OrjsonBackend]:
+    global _backend
+    if _backend is None:
+        _backend = _resolve_backend()
+    return _backend
+
+
+def backend_name() -> str:
+    return _get_backend().name
+
+
+def loads(data: Union[str, bytes, bytearray]) -> Any:
+    return _get_backend().loads(data)
+
+
+def dumps_bytes(value: Any, sort_keys: bool = False) -> bytes:
+    return _get_backend().dumps(value, sort_keys=sort_keys)
+
+
+def dumps(value: Any, sort_keys: bool = False) -> str:
+    return _get_backend().dumps(value, sort_keys=sort_keys).decode("utf-8")
@@ -0,0 +1,48 @@
+"""FastMCP server whose tool results are encoded with :mod:`data_analyst_mcp.fastjson`.
+
+The override relies on FastMCP internals (``_convert_to_content`` and
+``_tool_manager``), which pyproject pins to ``mcp<1.7``. If they are missing,
+:class:`FastJSONMCP` behaves like stock ``FastMCP``.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Sequence, Union
+
+from mcp.server.fastmcp import FastMCP
+from mcp.types import EmbeddedResource, ImageContent, TextContent
+
+from data_analyst_mcp import fastjson
+
+try:
+    from mcp.server.fastmcp.server import _convert_to_content
+except ImportError:  # pragma: no cover - depends on the installed mcp version
+    _convert_to_content = None
+
+Content = Union[TextContent, ImageContent, EmbeddedResource]
+
+
+def tool_result_content(result: Any) -> Sequence[Content]:
+    """Convert a tool result to MCP content, encoding dicts and models in one pass.
+
+    FastMCP 1.6 converts results with ``to_jsonable_python`` and then ``json.dumps``;
+    other result types (strings, images, lists of contents) keep its handling.
+    """
+
+    if isinstance(result, dict) or hasattr(result, "model_dump"):
+        return [TextContent(type="text", text=fastjson.dumps(result))]
+    assert _convert_to_content is not None
+    return _convert_to_content(result)
+
+
+class FastJSONMCP(FastMCP):
+    """``FastMCP`` whose tool results are serialized through :mod:`data_analyst_mcp.fastjson`."""
+
+    async def call_tool(
+        self, name: str, arguments: dict[str, Any]
+    ) -> Sequence[Content]:
+        if _convert_to_content is None or not hasattr(self, "_tool_manager"):
+            return await super().call_tool(name, arguments)
+        context = self.get_context()
+        result = await self._tool_manager.call_tool(name, arguments, context=context)
+        return tool_result_content(result)
@@ -6,7 +6,7 @@ import logging
 import sys
 
 from data_analyst_mcp import config
-from data_analyst_mcp.server import mcp
+from data_analyst_mcp.startup_profile import run_startup_profile
 
 logging.basicConfig(
     level=logging.INFO,
@@ -21,6 +21,12 @@ logger = logging.getLogger(__name__)
 def main():
     """Main function for server startup."""
     try:
+        settings = config.configure()
+        if settings.PROFILE_STARTUP:
+            sys.exit(run_startup_profile("data_analyst_mcp.server"))
+
+        from data_analyst_mcp.server import mcp
+
         log_level = getattr(logging, "INFO")
         logging.getLogger().setLevel(log_level)
 
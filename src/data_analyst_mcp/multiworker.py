@@ -0,0 +1,203 @@
+"""Run the SSE MCP app in several worker processes sharing one listening socket.
+
+SSE sessions live in the worker that accepted the ``GET /sse`` stream, but the
+kernel hands the client's ``POST /messages/`` requests to any worker. Each worker
+therefore also listens on a private loopback port, and :class:`SessionForwarder`
+passes messages for sessions it does not know on to its peers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import multiprocessing.connection
+import os
+import signal
+import socket
+from typing import Any, Awaitable, Callable, Dict, List, MutableSequence, Optional, Sequence
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+FORWARDED_HEADER = "x-mcp-forwarded"
+
+ASGIApp = Callable[..., Awaitable[None]]
+
+
+def resolve_worker_count(workers: int) -> int:
+    """``workers <= 0`` means one worker per CPU."""
+    return workers if workers > 0 else os.cpu_count() or 1
+
+
+class SessionForwarder:
+    """ASGI wrapper for the SSE message endpoint that forwards unknown sessions to peers.
+
+    The request is first handled locally; if the local transport answers 404 (no such
+    session) the body is re-posted to each peer's loopback port until one accepts it.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        peer_ports: Callable[[], Sequence[int]],
+        client: Optional[httpx.AsyncClient] = None,
+    ) -> None:
+        self.app = app
+        self.peer_ports = peer_ports
+        self._client = client
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        headers = dict(scope.get("headers") or [])
+        if scope["type"] != "http" or FORWARDED_HEADER.encode() in headers:
+            await self.app(scope, receive, send)
+            return
+
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+
+        async def replay() -> Dict[str, Any]:
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        local: List[Dict[str, Any]] = []
+
+        async def capture(message: Dict[str, Any]) -> None:
+            local.append(message)
+
+        await self.app(scope, replay, capture)
+        status = next((m["status"] for m in local if m["type"] == "http.response.start"), None)
+        if status == 404:
+            forwarded = await self._forward(scope, body)
+            if forwarded is not None:
+                await _send_response(send, forwarded)
+                return
+        for message in local:
+            await send(message)
+
+    async def _forward(self, scope: Dict[str, Any], body: bytes) -> Optional[httpx.Response]:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=10)
+        client = self._client
+        root_path, path = scope.get("root_path", ""), scope["path"]
+        if not path.startswith(root_path):
+            path = root_path + path
+        query = scope.get("query_string", b"").decode("latin-1")
+        content_type = dict(scope.get("headers") or []).get(b"content-type", b"application/json")
+        for port in self.peer_ports():
+            url = f"http://127.0.0.1:{port}{path}" + (f"?{query}" if query else "")
+            try:
+                response = await client.post(
+                    url,
+                    content=body,
+                    headers={FORWARDED_HEADER: "1", "content-type": content_type.decode("latin-1")},
+                )
+            except httpx.HTTPError as exc:
+                logger.warning("forwarding message to worker port %d failed: %s", port, exc)
+                continue
+            if response.status_code != 404:
+                return response
+        return None
+
+
+async def _send_response(send: Any, response: httpx.Response) -> None:
+    headers = [
+        (name.encode("latin-1"), value.encode("latin-1"))
+        for name, value in response.headers.items()
+        if name.lower() in ("content-type", "content-length")
+    ]
+    await send({"type": "http.response.start", "status": response.status_code, "headers": headers})
+    await send({"type": "http.response.body", "body": response.content})
+
+
+def _worker_main(
+    index: int,
+    public: socket.socket,
+    ports: MutableSequence[int],
+    app_factory: Callable[[Callable[[], List[int]]], Any],
+    log_level: str,
+) -> None:
+    import uvicorn
+
+    private = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    private.bind(("127.0.0.1", 0))
+    private.listen(128)
+    ports[index] = private.getsockname()[1]
+
+    def peer_ports() -> List[int]:
+        return [port for i, port in enumerate(ports) if i != index and port]
+
+    server = uvicorn.Server(uvicorn.Config(app_factory(peer_ports), log_level=log_level))
+    asyncio.run(server.serve(sockets=[public, private]))
+
+
+def run_workers(
+    app_factory: Callable[[Callable[[], List[int]]], Any],
+    host: str,
+    port: int,
+    workers: int,
+    log_level: str = "info",
+) -> None:
+    """Bind ``host:port`` once and serve it from ``workers`` forked processes.
+
+    ``app_factory(peer_ports)`` is called in each worker, so every worker builds its
+    own app state (agent, clients, caches).
+
+    Dead workers are not restarted: their SSE sessions are gone and peers would keep
+    forwarding to their loopback ports. If a worker exits, the parent stops the others
+    and exits with status 1, leaving the restart to the process supervisor.
+    """
+
+    public = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    public.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    public.bind((host, port))
+    public.listen(2048)
+    public.set_inheritable(True)
+
+    ctx = multiprocessing.get_context("fork")
+    ports = ctx.Array("i", workers, lock=False)
+    processes = [
+        ctx.Process(
+            target=_worker_main,
+            args=(index, public, ports, app_factory, log_level),
+            name=f"vanna-mcp-worker-{index}",
+        )
+        for index in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    logger.info("Serving on http://%s:%d with %d workers", host, port, workers)
+
+    stopping = False
+
+    def _stop(signum: int, frame: Any) -> None:
+        nonlocal stopping
+        stopping = True
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+    previous_handler = signal.signal(signal.SIGTERM, _stop)
+    try:
+        multiprocessing.connection.wait([process.sentinel for process in processes])
+        if not stopping:
+            for process in processes:
+                if not process.is_alive():
+                    logger.error("%s exited with code %s, stopping", process.name, process.exitcode)
+            _stop(signal.SIGTERM, None)
+            for process in processes:
+                process.join()
+            raise SystemExit(1)
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        _stop(signal.SIGINT, None)
+        for process in processes:
+            process.join()
+    finally:
+        signal.signal(signal.SIGTERM, previous_handler)
+        public.close()
@@ -0,0 +1,237 @@
+"""Retry with jittered backoff and per-upstream circuit breakers for API calls."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, TypeVar
+
+import httpx
+
+from data_analyst_mcp import config
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS_CODES = frozenset({429, 502, 503, 504})
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling an upstream whose circuit breaker is open."""
+
+    def __init__(self, name: str, retry_after: float) -> None:
+        self.name = name
+        self.retry_after = retry_after
+        super().__init__(f"{name} is unavailable (circuit open, retry in {retry_after:.1f}s)")
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Return whether ``exc`` is a transient upstream failure worth retrying."""
+
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in RETRYABLE_STATUS_CODES
+    if isinstance(exc, (httpx.TimeoutException, httpx.TransportError)):
+        return True
+    # errors.UnexpectedStatus of the generated clients
+    status_code = getattr(exc, "status_code", None)
+    return isinstance(status_code, int) and status_code in RETRYABLE_STATUS_CODES
+
+
+def is_unsent(exc: BaseException) -> bool:
+    """Return whether ``exc`` failed before the request could reach the upstream."""
+
+    return isinstance(exc, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout))
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker.
+
+    After ``failure_threshold`` consecutive transient failures the circuit opens and
+    calls fail fast with :class:`CircuitOpenError`. Once ``reset_timeout`` seconds have
+    passed a single half-open probe is let through; its success closes the circuit,
+    its failure re-opens it.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._stats: Dict[str, int] = {
+            "successes": 0,
+            "failures": 0,
+            "rejected": 0,
+            "opened": 0,
+        }
+
+    def before_call(self) -> None:
+        if self.state == CLOSED:
+            return
+        elapsed = time.monotonic() - self._opened_at
+        if self.state == OPEN and elapsed >= self.reset_timeout:
+            self.state = HALF_OPEN
+        if self.state == HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return
+        self._stats["rejected"] += 1
+        raise CircuitOpenError(self.name, max(0.0, self.reset_timeout - elapsed))
+
+    def record_success(self) -> None:
+        self._stats["successes"] += 1
+        self._consecutive_failures = 0
+        self._probe_in_flight = False
+        if self.state != CLOSED:
+            logger.info("circuit %s closed", self.name)
+        self.state = CLOSED
+
+    def record_failure(self) -> None:
+        self._stats["failures"] += 1
+        self._consecutive_failures += 1
+        probe_failed = self.state == HALF_OPEN
+        self._probe_in_flight = False
+        if probe_failed or self._consecutive_failures >= self.failure_threshold:
+            if self.state != OPEN:
+                self._stats["opened"] += 1
+                logger.warning("circuit %s opened after %d failures", self.name, self._consecutive_failures)
+            self.state = OPEN
+            self._opened_at = time.monotonic()
+
+    def release(self) -> None:
+        """Free the half-open probe slot after a call that proved nothing about health."""
+        self._probe_in_flight = False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "state": self.state,
+            "consecutive_failures": self._consecutive_failures,
+        }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """Return the process-wide circuit breaker for upstream ``name``."""
+    breaker = _breakers.get(name)
+    if breaker is None:
+        breaker = CircuitBreaker(
+            name,
+            failure_threshold=config.CIRCUIT_FAILURE_THRESHOLD,
+            reset_timeout=config.CIRCUIT_RESET_TIMEOUT,
+        )
+        _breakers[name] = breaker
+    return breaker
+
+
+def breaker_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: breaker.stats() for name, breaker in _breakers.items()}
+
+
+def backoff_delay(attempt: int, base: Optional[float] = None, cap: Optional[float] = None) -> float:
+    """Full-jitter exponential backoff for the given zero-based retry attempt."""
+    base = config.RETRY_BACKOFF_BASE if base is None else base
+    cap = config.RETRY_BACKOFF_MAX if cap is None else cap
+    return random.uniform(0, min(cap, base * (2**attempt)))
+
+
+async def call_with_retry(
+    func: Callable[[], Awaitable[T]],
+    breaker: CircuitBreaker,
+    retries: Optional[int] = None,
+) -> T:
+    """Call an idempotent upstream operation, retrying transient failures through ``breaker``."""
+
+    max_retries = config.RETRY_ATTEMPTS if retries is None else retries
+    attempt = 0
+    while True:
+        breaker.before_call()
+        try:
+            result = await func()
+        except Exception as exc:  # noqa: BLE001
+            if not is_retryable(exc):
+                breaker.release()
+                raise
+            breaker.record_failure()
+            if attempt >= max_retries:
+                raise
+            delay = backoff_delay(attempt)
+            logger.warning(
+                "%s call failed (%s), retrying in %.2fs (%d/%d)",
+                breaker.name,
+                exc,
+                delay,
+                attempt + 1,
+                max_retries,
+            )
+            attempt += 1
+            await asyncio.sleep(delay)
+        except BaseException:
+            breaker.release()
+            raise
+        else:
+            breaker.record_success()
+            return result
+
+
+async def stream_with_retry(
+    open_stream: Callable[[], AsyncIterator[T]],
+    breaker: CircuitBreaker,
+    retries: Optional[int] = None,
+) -> AsyncIterator[T]:
+    """Iterate a non-idempotent upstream stream through ``breaker``.
+
+    Only failures that happened before the request was sent (see :func:`is_unsent`)
+    are retried, so a request the upstream may already be acting on is never
+    replayed. Other transient failures, including any after the first item, are
+    recorded on the breaker and re-raised.
+    """
+
+    max_retries = config.RETRY_ATTEMPTS if retries is None else retries
+    attempt = 0
+    while True:
+        breaker.before_call()
+        started = False
+        try:
+            async for item in open_stream():
+                if not started:
+                    started = True
+                    breaker.record_success()
+                yield item
+        except Exception as exc:  # noqa: BLE001
+            if not is_retryable(exc):
+                if not started:
+                    breaker.release()
+                raise
+            breaker.record_failure()
+            if started or attempt >= max_retries or not is_unsent(exc):
+                raise
+            delay = backoff_delay(attempt)
+            logger.warning(
+                "%s stream failed (%s), retrying in %.2fs (%d/%d)",
+                breaker.name,
+                exc,
+                delay,
+                attempt + 1,
+                max_retries,
+            )
+            attempt += 1
+            await asyncio.sleep(delay)
+        except BaseException:
+            if not started:
+                breaker.release()
+            raise
+        else:
+            if not started:
+                breaker.record_success()
+            return
@@ -0,0 +1,85 @@
+"""TTL result cache for Ragflow retrieval requests."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, FrozenSet, Iterable, Optional
+
+from data_analyst_mcp import config
+from data_analyst_mcp.cache import TTLCache, stable_hash
+
+if TYPE_CHECKING:
+    from data_analyst_mcp.client.ragflow_server_api_client.models import (
+        RagflowRetrievalRequest,
+        RagflowRetrievalResponseLite,
+    )
+
+
+@dataclass(frozen=True)
+class _CachedRetrieval:
+    dataset_ids: FrozenSet[str]
+    document_ids: FrozenSet[str]
+    response: "RagflowRetrievalResponseLite"
+
+
+class RetrievalCache:
+    """LRU + TTL cache of successful retrieval responses keyed on the request payload."""
+
+    def __init__(self, max_entries: int = 256, ttl: Optional[float] = 300) -> None:
+        self._cache = TTLCache(max_entries=max_entries, ttl=ttl)
+
+    @staticmethod
+    def key(request: "RagflowRetrievalRequest") -> str:
+        return stable_hash(request.to_payload())
+
+    def get(self, request: "RagflowRetrievalRequest") -> Optional["RagflowRetrievalResponseLite"]:
+        entry: Optional[_CachedRetrieval] = self._cache.get(self.key(request))
+        return entry.response if entry is not None else None
+
+    def set(self, request: "RagflowRetrievalRequest", response: "RagflowRetrievalResponseLite") -> None:
+        if not response.is_success():
+            return
+        self._cache.set(
+            self.key(request),
+            _CachedRetrieval(
+                dataset_ids=frozenset(request.dataset_ids or ()),
+                document_ids=frozenset(request.document_ids or ()),
+                response=response,
+            ),
+        )
+
+    def invalidate(
+        self,
+        dataset_ids: Optional[Iterable[str]] = None,
+        document_ids: Optional[Iterable[str]] = None,
+    ) -> int:
+        """Drop cached results touching the given datasets/documents; drop all when none given."""
+
+        datasets = frozenset(dataset_ids or ())
+        documents = frozenset(document_ids or ())
+        if not datasets and not documents:
+            count = len(self._cache)
+            self._cache.clear()
+            return count
+        return self._cache.invalidate_where(
+            lambda _key, entry: bool(entry.dataset_ids & datasets or entry.document_ids & documents)
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        return self._cache.stats()
+
+
+_retrieval_cache: Optional[RetrievalCache] = None
+
+
+def get_retrieval_cache() -> Optional[RetrievalCache]:
+    """Return the process-wide retrieval cache, or ``None`` when caching is disabled."""
+    global _retrieval_cache
+    if not config.RAGFLOW_RETRIEVAL_CACHE_ENABLED:
+        return None
+    if _retrieval_cache is None:
+        _retrieval_cache = RetrievalCache(
+            max_entries=config.RAGFLOW_RETRIEVAL_CACHE_MAX_ENTRIES,
+            ttl=config.RAGFLOW_RETRIEVAL_CACHE_TTL,
+        )
+    return _retrieval_cache
@@ -1,17 +1,24 @@
 """Main module for Vanna MCP server (with Ragflow retrieval)."""
 
+import asyncio
+import importlib.util
 import logging
 from collections.abc import Callable
 from contextlib import asynccontextmanager
 from dataclasses import dataclass
-from typing import Any, AsyncIterator, Awaitable, Dict, List, Optional, cast
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, cast
 
+import httpx
 from mcp.server.fastmcp import Context, FastMCP
 from pydantic import Field
 
-from data_analyst_mcp import config
+from data_analyst_mcp import config, fastjson
+from data_analyst_mcp.admission import admission_controlled, admission_stats
 from data_analyst_mcp.client.ragflow_server_api_client.client import AuthenticatedClient
-from data_analyst_mcp.client.ragflow_server_api_client.models import RagflowRetrievalResponse
+from data_analyst_mcp.client.ragflow_server_api_client.models import (
+    RagflowChunkLite,
+    RagflowRetrievalResponseLite,
+)
 from data_analyst_mcp.client.ragflow_server_api_client.ragflow_client import (
     build_ragflow_client,
     ragflow_retrieve_chunks,
@@ -23,6 +30,10 @@ from data_analyst_mcp.client.vanna_server_api_client.vanna_client import (
     build_vanna_client,
     chat_sse_stream,
 )
+from data_analyst_mcp.fastjson_mcp import FastJSONMCP
+from data_analyst_mcp.resilience import breaker_stats, call_with_retry, get_breaker, stream_with_retry
+from data_analyst_mcp.retrieval_cache import get_retrieval_cache
+from data_analyst_mcp.vanna_event_aggregator import aggregate_vanna_events, build_event_aggregator
 
 logger = logging.getLogger(__name__)
 
@@ -35,17 +46,46 @@ class AppContext:
     vanna_client: VannaClient
 
 
+def http_client_options() -> Tuple[httpx.Timeout, Dict[str, Any]]:
+    """Return the configured timeout and pool settings shared by the API clients."""
+
+    timeout = httpx.Timeout(
+        connect=config.HTTP_CONNECT_TIMEOUT,
+        read=config.HTTP_READ_TIMEOUT,
+        write=config.HTTP_WRITE_TIMEOUT,
+        pool=config.HTTP_POOL_TIMEOUT,
+    )
+    httpx_args: Dict[str, Any] = {
+        "limits": httpx.Limits(
+            max_connections=config.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=config.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=config.HTTP_KEEPALIVE_EXPIRY,
+        ),
+    }
+    if config.HTTP2:
+        if importlib.util.find_spec("h2") is None:
+            logger.warning("HTTP/2 requested but the h2 package is not installed; using HTTP/1.1")
+        else:
+            httpx_args["http2"] = True
+    return timeout, httpx_args
+
+
 @asynccontextmanager
 async def app_lifespan(server: FastMCP) -> AsyncIterator[AppContext]:
     """Manage application lifecycle with typed context."""
 
+    timeout, httpx_args = http_client_options()
     ragflow_client = build_ragflow_client(
         base_url=config.RAGFLOW_API_BASE_URL,
         api_key=config.RAGFLOW_API_KEY,
+        timeout=timeout,
+        httpx_args=httpx_args,
     )
     vanna_client = build_vanna_client(
         base_url=config.VANNA_API_BASE_URL,
         api_key=config.VANNA_API_KEY,
+        timeout=timeout,
+        httpx_args=httpx_args,
     )
 
     try:
@@ -56,7 +96,7 @@ async def app_lifespan(server: FastMCP) -> AsyncIterator[AppContext]:
         logger.info("Vanna MCP Server stopped")
 
 
-mcp = FastMCP("Vanna MCP Server", lifespan=app_lifespan)
+mcp = FastJSONMCP("Vanna MCP Server", lifespan=app_lifespan)
 
 
 def format_response(result: Any, is_error: bool = False) -> Dict[str, Any]:
@@ -82,85 +122,6 @@ def format_response(result: Any, is_error: bool = False) -> Dict[str, Any]:
     return {"status": "success", "response": str(result)}
 
 
-def aggregate_vanna_events(events: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """Aggregate Vanna chat SSE events into a single response."""
-
-    texts: List[str] = []
-    images: List[Dict[str, Any]] = []
-    links: List[Dict[str, Any]] = []
-    buttons: List[Dict[str, Any]] = []
-    dataframes: List[Dict[str, Any]] = []
-    plotlies: List[Dict[str, Any]] = []
-    sqls: List[str] = []
-    errors: List[str] = []
-
-    conversation_id: Optional[str] = None
-
-    for event in events:
-        event_type = event.get("type")
-        cid = event.get("conversation_id")
-        if cid is not None:
-            conversation_id = cid
-
-        if event_type == "text":
-            text = event.get("text")
-            if text:
-                texts.append(text)
-        elif event_type == "image":
-            images.append(
-                {
-                    "image_url": event.get("image_url"),
-                    "caption": event.get("caption"),
-                }
-            )
-        elif event_type == "link":
-            links.append(
-                {
-                    "title": event.get("title"),
-                    "url": event.get("url"),
-                    "description": event.get("description"),
-                }
-            )
-        elif event_type == "buttons":
-            buttons.append(
-                {
-                    "text": event.get("text"),
-                    "buttons": event.get("buttons") or [],
-                }
-            )
-        elif event_type == "dataframe":
-            dataframes.append({"json_table": event.get("json_table")})
-        elif event_type == "plotly":
-            plotlies.append({"json_plotly": event.get("json_plotly")})
-        elif event_type == "sql":
-            query = event.get("query")
-            if query:
-                sqls.append(query)
-        elif event_type == "error":
-            err = event.get("error")
-            if err:
-                errors.append(err)
-        elif event_type == "end":
-            continue
-
-    final_text = "".join(texts) if texts else None
-
-    result: Dict[str, Any] = {
-        "conversation_id": conversation_id,
-        "text": final_text,
-        "images": images or None,
-        "links": links or None,
-        "buttons": buttons or None,
-        "dataframes": dataframes or None,
-        "plotly": plotlies or None,
-        "sql": sqls or None,
-        "errors": errors or None,
-        "raw_events": events,
-    }
-
-    return {k: v for k, v in result.items() if v is not None}
-
-
 async def execute_ragflow_operation(
     operation_name: str,
     operation_func: Callable[[AuthenticatedClient], Awaitable[Any]],
@@ -211,7 +172,109 @@ async def execute_vanna_operation(
         return format_response(str(e), is_error=True)
 
 
+def _through_breaker(call: Callable[[], Awaitable[Any]]) -> Awaitable[Any]:
+    """Send a Ragflow request with retries through the ``ragflow`` circuit breaker."""
+
+    return call_with_retry(call, breaker=get_breaker("ragflow"))
+
+
+# Output key -> RagflowChunkLite attribute.
+RETRIEVAL_CHUNK_FIELDS: Dict[str, str] = {
+    "id": "id",
+    "content": "content",
+    "highlight": "highlight",
+    "document_id": "document_id",
+    "doc_keyword": "document_keyword",
+    "similarity": "similarity",
+}
+DEFAULT_RETRIEVAL_CHUNK_FIELDS = ("content", "highlight", "document_id", "doc_keyword", "similarity")
+
+
+def format_retrieval_chunk(
+    chunk: RagflowChunkLite,
+    fields: Sequence[str] = DEFAULT_RETRIEVAL_CHUNK_FIELDS,
+    max_content_chars: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Normalize a Ragflow chunk for MCP tool output.
+
+    Only ``fields`` are included; with ``max_content_chars`` longer content is cut
+    and the chunk is marked ``content_truncated``.
+    """
+
+    formatted = {name: getattr(chunk, RETRIEVAL_CHUNK_FIELDS[name]) for name in fields}
+    if max_content_chars is not None and "content" in formatted:
+        content = formatted["content"]
+        if len(content) > max_content_chars:
+            formatted["content"] = content[:max_content_chars]
+            formatted["content_truncated"] = True
+    return formatted
+
+
+def resolve_retrieval_fields(
+    fields: Optional[List[str]], include_content: bool = True
+) -> Tuple[str, ...]:
+    """Validate a ``fields`` selection (default: the standard chunk fields)."""
+
+    selected = tuple(dict.fromkeys(fields)) if fields else DEFAULT_RETRIEVAL_CHUNK_FIELDS
+    unknown = [name for name in selected if name not in RETRIEVAL_CHUNK_FIELDS]
+    if unknown:
+        raise ValueError(
+            f"unknown fields {unknown}, expected any of {sorted(RETRIEVAL_CHUNK_FIELDS)}"
+        )
+    if not include_content:
+        selected = tuple(name for name in selected if name != "content")
+    return selected
+
+
+def format_retrieval_response(
+    response: RagflowRetrievalResponseLite,
+    fields: Sequence[str] = DEFAULT_RETRIEVAL_CHUNK_FIELDS,
+    max_content_chars: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Normalize a Ragflow retrieval response, raising if Ragflow reported a failure."""
+
+    if not response.is_success():
+        raise RuntimeError(f"Ragflow retrieval failed: {response.message}")
+
+    data = response.data
+    if data is None:
+        return {"total": 0, "chunks": [], "doc_aggs": []}
+
+    return {
+        "total": data.total,
+        "chunks": [format_retrieval_chunk(chunk, fields, max_content_chars) for chunk in data.chunks],
+        "doc_aggs": [
+            {"doc_id": agg.doc_id, "doc_name": agg.doc_name, "count": agg.count}
+            for agg in data.doc_aggs
+        ],
+    }
+
+
+def merge_retrieval_chunks(
+    responses: List[Tuple[str, RagflowRetrievalResponseLite]],
+) -> List[Dict[str, Any]]:
+    """Merge chunks from several retrievals, deduplicated and sorted by best similarity."""
+
+    merged: Dict[Tuple[Optional[str], ...], Dict[str, Any]] = {}
+    for question, response in responses:
+        if response.data is None:
+            continue
+        for chunk in response.data.chunks:
+            key = (chunk.id,) if chunk.id else (chunk.document_id, chunk.content)
+            entry = merged.get(key)
+            if entry is None:
+                entry = {**format_retrieval_chunk(chunk), "questions": []}
+                merged[key] = entry
+            elif (chunk.similarity or 0) > (entry["similarity"] or 0):
+                entry.update(format_retrieval_chunk(chunk))
+            if question not in entry["questions"]:
+                entry["questions"].append(question)
+
+    return sorted(merged.values(), key=lambda entry: entry["similarity"] or 0, reverse=True)
+
+
 @mcp.tool(name="ragflow_retrieval", description="Execute retrieval query through Ragflow /api/v1/retrieval")
+@admission_controlled("ragflow_retrieval")
 async def ragflow_retrieval(
     ctx: Context,
     question: str = Field(description="Query text for retrieval"),
@@ -233,14 +296,35 @@ async def ragflow_retrieval(
     keyword: bool = Field(default=False, description="Enable keyword retrieval"),
     highlight: bool = Field(default=False, description="Include highlight snippets"),
     use_kg: bool = Field(default=False, description="Use knowledge graph retrieval"),
+    use_cache: bool = Field(
+        default=True, description="Serve identical recent requests from the in-process cache"
+    ),
+    fields: Optional[List[str]] = Field(
+        default=None,
+        description=(
+            "Chunk fields to return, any of id, content, highlight, document_id, doc_keyword, "
+            "similarity (default: all but id); e.g. [\"id\", \"document_id\", \"similarity\"] "
+            "for a first-pass ranking"
+        ),
+    ),
+    include_content: bool = Field(
+        default=True, description="Include chunk content (false drops it from the selected fields)"
+    ),
+    max_content_chars: Optional[int] = Field(
+        default=None, description="Cut chunk content to this many characters", ge=0
+    ),
 ) -> Dict[str, Any]:
     """Call Ragflow retrieval endpoint and normalize the response."""
 
     if not dataset_ids and not document_ids:
         return format_response("dataset_ids or document_ids must be provided", is_error=True)
+    try:
+        selected_fields = resolve_retrieval_fields(fields, include_content)
+    except ValueError as e:
+        return format_response(str(e), is_error=True)
 
     async def _operation(client: AuthenticatedClient) -> Dict[str, Any]:
-        response: RagflowRetrievalResponse = await ragflow_retrieve_chunks(
+        response: RagflowRetrievalResponseLite = await ragflow_retrieve_chunks(
             client=client,
             question=question,
             dataset_ids=dataset_ids,
@@ -253,32 +337,12 @@ async def ragflow_retrieval(
             keyword=keyword,
             highlight=highlight,
             use_kg=use_kg,
+            cache=get_retrieval_cache() if use_cache else None,
+            response_model=RagflowRetrievalResponseLite,
+            wrap_call=_through_breaker,
         )
 
-        if not response.is_success():
-            raise RuntimeError(f"Ragflow retrieval failed: {response.message}")
-
-        data = response.data
-        if data is None:
-            return {"total": 0, "chunks": [], "doc_aggs": []}
-
-        return {
-            "total": data.total,
-            "chunks": [
-                {
-                    "content": chunk.content,
-                    "highlight": chunk.highlight,
-                    "document_id": chunk.document_id,
-                    "doc_keyword": chunk.document_keyword,
-                    "similarity": chunk.similarity,
-                }
-                for chunk in data.chunks
-            ],
-            "doc_aggs": [
-                {"doc_id": agg.doc_id, "doc_name": agg.doc_name, "count": agg.count}
-                for agg in data.doc_aggs
-            ],
-        }
+        return format_retrieval_response(response, selected_fields, max_content_chars)
 
     return await execute_ragflow_operation(
         operation_name=f"ragflow retrieval: {question[:50]}...",
@@ -287,10 +351,157 @@ async def ragflow_retrieval(
     )
 
 
+@mcp.tool(
+    name="ragflow_retrieval_batch",
+    description=(
+        "Execute several Ragflow retrieval questions concurrently with shared filters; "
+        "returns per-question results and a merged, deduplicated chunk set"
+    ),
+)
+@admission_controlled("ragflow_retrieval_batch")
+async def ragflow_retrieval_batch(
+    ctx: Context,
+    questions: List[str] = Field(description="Query texts for retrieval"),
+    dataset_ids: Optional[List[str]] = Field(
+        default=None, description="List of dataset IDs to search within"
+    ),
+    document_ids: Optional[List[str]] = Field(
+        default=None, description="Specific document IDs to constrain search"
+    ),
+    page: int = Field(default=1, description="Page number for paginated results"),
+    page_size: int = Field(default=30, description="Page size for paginated results"),
+    similarity_threshold: float = Field(
+        default=0.2, description="Similarity threshold for vector retrieval"
+    ),
+    vector_similarity_weight: float = Field(
+        default=0.3, description="Weight for vector similarity in ranking"
+    ),
+    top_k: int = Field(default=1024, description="Maximum chunks to consider"),
+    keyword: bool = Field(default=False, description="Enable keyword retrieval"),
+    highlight: bool = Field(default=False, description="Include highlight snippets"),
+    use_kg: bool = Field(default=False, description="Use knowledge graph retrieval"),
+    use_cache: bool = Field(
+        default=True, description="Serve identical recent requests from the in-process cache"
+    ),
+    max_concurrency: Optional[int] = Field(
+        default=None,
+        description="Maximum concurrent retrieval calls (default from RAGFLOW_BATCH_CONCURRENCY)",
+    ),
+) -> Dict[str, Any]:
+    """Fan out Ragflow retrieval over several questions in one tool call."""
+
+    if not questions:
+        return format_response("questions must not be empty", is_error=True)
+    if not dataset_ids and not document_ids:
+        return format_response("dataset_ids or document_ids must be provided", is_error=True)
+
+    async def _operation(client: AuthenticatedClient) -> Dict[str, Any]:
+        semaphore = asyncio.Semaphore(max(1, max_concurrency or config.RAGFLOW_BATCH_CONCURRENCY))
+        cache = get_retrieval_cache() if use_cache else None
+
+        async def _retrieve(
+            question: str,
+        ) -> Tuple[Dict[str, Any], Optional[RagflowRetrievalResponseLite]]:
+            try:
+                async with semaphore:
+                    response = await ragflow_retrieve_chunks(
+                        client=client,
+                        question=question,
+                        dataset_ids=dataset_ids,
+                        document_ids=document_ids,
+                        page=page,
+                        page_size=page_size,
+                        similarity_threshold=similarity_threshold,
+                        vector_similarity_weight=vector_similarity_weight,
+                        top_k=top_k,
+                        keyword=keyword,
+                        highlight=highlight,
+                        use_kg=use_kg,
+                        cache=cache,
+                        response_model=RagflowRetrievalResponseLite,
+                        wrap_call=_through_breaker,
+                    )
+                return {"question": question, **format_retrieval_response(response)}, response
+            except Exception as e:  # noqa: BLE001
+                logger.warning(f"Ragflow retrieval failed for {question[:50]!r}: {str(e)}")
+                return {"question": question, "error": str(e)}, None
+
+        outcomes = await asyncio.gather(*(_retrieve(question) for question in questions))
+
+        results = [result for result, _ in outcomes]
+        succeeded = [
+            (question, response)
+            for question, (_, response) in zip(questions, outcomes)
+            if response is not None
+        ]
+        return {"results": results, "merged_chunks": merge_retrieval_chunks(succeeded)}
+
+    return await execute_ragflow_operation(
+        operation_name=f"ragflow retrieval batch: {len(questions)} questions",
+        operation_func=_operation,
+        ctx=ctx,
+    )
+
+
+@mcp.tool(
+    name="ragflow_retrieval_cache_stats",
+    description="Return hit/miss counters of the ragflow_retrieval result cache",
+)
+async def ragflow_retrieval_cache_stats() -> Dict[str, Any]:
+    """Report retrieval cache statistics."""
+
+    cache = get_retrieval_cache()
+    if cache is None:
+        return format_response("Ragflow retrieval cache is disabled", is_error=True)
+    return format_response(cache.stats())
+
+
+@mcp.tool(
+    name="ragflow_retrieval_cache_invalidate",
+    description="Drop cached ragflow_retrieval results for datasets/documents (all when none given)",
+)
+async def ragflow_retrieval_cache_invalidate(
+    dataset_ids: Optional[List[str]] = Field(
+        default=None, description="Dataset IDs whose cached results should be dropped"
+    ),
+    document_ids: Optional[List[str]] = Field(
+        default=None, description="Document IDs whose cached results should be dropped"
+    ),
+) -> Dict[str, Any]:
+    """Invalidate cached retrieval results."""
+
+    cache = get_retrieval_cache()
+    if cache is None:
+        return format_response("Ragflow retrieval cache is disabled", is_error=True)
+    removed = cache.invalidate(dataset_ids=dataset_ids, document_ids=document_ids)
+    return format_response({"invalidated": removed})
+
+
+@mcp.tool(
+    name="circuit_breaker_stats",
+    description="Return state and counters of the Ragflow/Vanna circuit breakers",
+)
+async def circuit_breaker_stats() -> Dict[str, Any]:
+    """Report upstream circuit breaker state."""
+
+    return format_response(breaker_stats())
+
+
+@mcp.tool(
+    name="tool_admission_stats",
+    description="Return in-flight/queued counts, rejections and queue wait per tool",
+)
+async def tool_admission_stats() -> Dict[str, Any]:
+    """Report per-tool admission control counters."""
+
+    return format_response(admission_stats())
+
+
 @mcp.tool(
     name="vanna_chat_sse",
     description="Call Vanna /api/v0/chat_sse and return aggregated result",
 )
+@admission_controlled("vanna_chat_sse")
 async def vanna_chat_sse(
     ctx: Context,
     message: str = Field(description="User message to send to Vanna"),
@@ -304,25 +515,140 @@ async def vanna_chat_sse(
         default=None,
         description="Filter response types: text/image/link/error/dataframe/plotly/sql",
     ),
+    raw_events: Optional[str] = Field(
+        default=None,
+        description="raw_events retention: none/metadata/full (default from VANNA_RAW_EVENTS)",
+    ),
+    raw_event_types: Optional[List[str]] = Field(
+        default=None, description="Only keep raw events of these types"
+    ),
+    raw_events_max_bytes: Optional[int] = Field(
+        default=None, description="Byte cap for retained raw events (default from config)"
+    ),
 ) -> Dict[str, Any]:
     """Call Vanna chat_sse, aggregate events, and return a single result."""
 
+    return await _chat_sse(
+        "vanna_chat_sse",
+        ctx,
+        message=message,
+        user_email=user_email,
+        conversation_id=conversation_id,
+        agent_id=agent_id,
+        acceptable_responses=acceptable_responses,
+        raw_events=raw_events,
+        raw_event_types=raw_event_types,
+        raw_events_max_bytes=raw_events_max_bytes,
+    )
+
+
+async def _chat_sse(
+    operation_name: str,
+    ctx: Context,
+    message: str,
+    user_email: Optional[str],
+    conversation_id: Optional[str],
+    agent_id: Optional[str],
+    acceptable_responses: Optional[List[str]],
+    raw_events: Optional[str],
+    raw_event_types: Optional[List[str]],
+    raw_events_max_bytes: Optional[int],
+    on_event: Optional[Callable[[int, Dict[str, Any]], Awaitable[None]]] = None,
+) -> Dict[str, Any]:
+    """Shared body of the chat_sse tools; ``on_event`` sees each event as it is aggregated."""
+
     async def _operation(vanna_client: VannaClient) -> Dict[str, Any]:
-        events: List[Dict[str, Any]] = []
-
-        async for event in chat_sse_stream(
-            client=vanna_client,
-            message=message,
-            user_email=user_email,
-            conversation_id=conversation_id,
-            agent_id=agent_id,
-            acceptable_responses=acceptable_responses,
+        aggregator = build_event_aggregator(
+            raw_events=raw_events,
+            raw_event_types=raw_event_types,
+            raw_events_max_bytes=raw_events_max_bytes,
+        )
+
+        async for event in stream_with_retry(
+            lambda: chat_sse_stream(
+                client=vanna_client,
+                message=message,
+                user_email=user_email,
+                conversation_id=conversation_id,
+                agent_id=agent_id,
+                acceptable_responses=acceptable_responses,
+            ),
+            breaker=get_breaker("vanna"),
         ):
-            events.append(event)
+            aggregator.feed(event)
+            if on_event is not None:
+                await on_event(aggregator.event_count, event)
+
+        return aggregator.result()
+
+    return await execute_vanna_operation(operation_name, _operation, ctx)
 
-        return aggregate_vanna_events(events)
 
-    return await execute_vanna_operation("vanna_chat_sse", _operation, ctx)
+def _event_notifier(ctx: Context) -> Callable[[int, Dict[str, Any]], Awaitable[None]]:
+    """Forward each chat event to the client as a log notification.
+
+    A progress notification is only sent when the request carries a progress token;
+    without one the client has nothing to attach it to.
+    """
+
+    meta = ctx.request_context.meta
+    progress_token = meta.progressToken if meta is not None else None
+
+    async def _notify(index: int, event: Dict[str, Any]) -> None:
+        if progress_token is not None:
+            await ctx.report_progress(index)
+        await ctx.log("info", fastjson.dumps(event), logger_name="vanna_chat_sse")
+
+    return _notify
+
+
+@mcp.tool(
+    name="vanna_chat_sse_stream",
+    description=(
+        "Call Vanna /api/v0/chat_sse and return the aggregated result, also sending each "
+        "event to the client as an MCP log notification while the call runs"
+    ),
+)
+@admission_controlled("vanna_chat_sse_stream")
+async def vanna_chat_sse_stream(
+    ctx: Context,
+    message: str = Field(description="User message to send to Vanna"),
+    user_email: Optional[str] = Field(default=None, description="User email"),
+    conversation_id: Optional[str] = Field(
+        default=None,
+        description="Existing conversation id to continue; if omitted a new conversation is started",
+    ),
+    agent_id: Optional[str] = Field(default=None, description="Optional Vanna agent id"),
+    acceptable_responses: Optional[List[str]] = Field(
+        default=None,
+        description="Filter response types: text/image/link/error/dataframe/plotly/sql",
+    ),
+    raw_events: Optional[str] = Field(
+        default=None,
+        description="raw_events retention: none/metadata/full (default from VANNA_RAW_EVENTS)",
+    ),
+    raw_event_types: Optional[List[str]] = Field(
+        default=None, description="Only keep raw events of these types"
+    ),
+    raw_events_max_bytes: Optional[int] = Field(
+        default=None, description="Byte cap for retained raw events (default from config)"
+    ),
+) -> Dict[str, Any]:
+    """Call Vanna chat_sse like ``vanna_chat_sse``, notifying the client of each event."""
+
+    return await _chat_sse(
+        "vanna_chat_sse_stream",
+        ctx,
+        message=message,
+        user_email=user_email,
+        conversation_id=conversation_id,
+        agent_id=agent_id,
+        acceptable_responses=acceptable_responses,
+        raw_events=raw_events,
+        raw_event_types=raw_event_types,
+        raw_events_max_bytes=raw_events_max_bytes,
+        on_event=_event_notifier(ctx),
+    )
 
 
-__all__ = ["mcp"]
+__all__ = ["aggregate_vanna_events", "mcp"]
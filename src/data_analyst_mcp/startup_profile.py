@@ -0,0 +1,108 @@
+"""Import-time breakdown of the MCP entry points, for ``--profile-startup``."""
+
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from typing import List, Tuple
+
+DEFAULT_LIMIT = 25
+
+
+@dataclass
+class ImportTiming:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(output: str) -> List[ImportTiming]:
+    """Parse the ``-X importtime`` lines written by the interpreter to stderr."""
+
+    timings: List[ImportTiming] = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # header line
+        name = fields[2].rstrip()
+        stripped = name.lstrip()
+        timings.append(
+            ImportTiming(
+                module=stripped,
+                self_us=int(fields[0]),
+                cumulative_us=int(fields[1]),
+                depth=(len(name) - len(stripped) - 1) // 2,
+            )
+        )
+    return timings
+
+
+def direct_imports(module: str, timings: List[ImportTiming]) -> List[ImportTiming]:
+    """Return the modules first imported directly by ``module``.
+
+    ``-X importtime`` lists a module after its dependencies, so these are the
+    depth-1 entries between ``module`` and the preceding top-level entry.
+    """
+
+    index = next((i for i, t in enumerate(timings) if t.module == module and t.depth == 0), None)
+    direct: List[ImportTiming] = []
+    if index is None:
+        return direct
+    for timing in reversed(timings[:index]):
+        if timing.depth == 0:
+            break
+        if timing.depth == 1:
+            direct.append(timing)
+    return direct
+
+
+def profile_imports(module: str) -> Tuple[float, List[ImportTiming]]:
+    """Import ``module`` in a fresh interpreter and return its wall time and import timings."""
+
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    elapsed = time.perf_counter() - started
+    if proc.returncode != 0:
+        raise RuntimeError(f"importing {module} failed:\n{proc.stderr.strip()}")
+    return elapsed, parse_importtime(proc.stderr)
+
+
+def format_report(module: str, elapsed: float, timings: List[ImportTiming], limit: int) -> str:
+    lines = [f"Cold start of {module}: {elapsed * 1000:.0f} ms wall (interpreter included)"]
+    total = next((t.cumulative_us for t in timings if t.module == module), None)
+    if total is not None:
+        lines.append(f"Import of {module}: {total / 1000:.0f} ms, {len(timings)} modules")
+
+    direct = direct_imports(module, timings)
+    direct.sort(key=lambda t: t.cumulative_us, reverse=True)
+    lines.append("")
+    lines.append(f"Imports made by {module} by cumulative time:")
+    for timing in direct[:limit]:
+        lines.append(f"  {timing.cumulative_us / 1000:8.1f} ms  {timing.module}")
+
+    heaviest = sorted(timings, key=lambda t: t.self_us, reverse=True)
+    lines.append("")
+    lines.append("Modules by self time:")
+    for timing in heaviest[:limit]:
+        lines.append(f"  {timing.self_us / 1000:8.1f} ms  {timing.module}")
+    return "\n".join(lines)
+
+
+def run_startup_profile(module: str, limit: int = DEFAULT_LIMIT) -> int:
+    """Print the import-time breakdown of ``module``; returns a process exit code."""
+
+    try:
+        elapsed, timings = profile_imports(module)
+    except RuntimeError as exc:
+        print(exc, file=sys.stderr)
+        return 1
+    print(format_report(module, elapsed, timings, limit))
+    return 0
@@ -1,19 +1,16 @@
-from typing import Optional
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
 
-from chromadb.utils import embedding_functions
 from data_analyst_mcp import config
-from vanna import Agent
-from vanna.core.registry import ToolRegistry
+from vanna import Agent, AgentConfig
 from vanna.core.user import RequestContext, User, UserResolver
-from vanna.integrations.chromadb import ChromaAgentMemory
-from vanna.integrations.openai import OpenAILlmService
-from vanna.integrations.postgres import PostgresRunner
-from vanna.tools import RunSqlTool, VisualizeDataTool
-from vanna.tools.agent_memory import (
-    SaveQuestionToolArgsTool,
-    SaveTextMemoryTool,
-    SearchSavedCorrectToolUsesTool,
-)
+
+logger = logging.getLogger(__name__)
+
+WARMUP_EMBEDDING_TEXT = "warm-up"
 
 
 class SimpleUserResolver(UserResolver):
@@ -24,24 +21,101 @@ class SimpleUserResolver(UserResolver):
 
 
 def _build_agent() -> Agent:
+    # The integrations pull in chromadb, the OpenAI SDK, psycopg, pandas and plotly;
+    # import them on first use so importing this module stays cheap.
+    from chromadb.utils import embedding_functions
+    from vanna.core.registry import ToolRegistry
+    from vanna.integrations.chromadb import ChromaAgentMemory
+    from vanna.integrations.openai import OpenAILlmService
+    from vanna.tools import VisualizeDataTool
+    from vanna.tools.agent_memory import (
+        SaveQuestionToolArgsTool,
+        SaveTextMemoryTool,
+        SearchSavedCorrectToolUsesTool,
+    )
+
     llm = OpenAILlmService(
         model=config.VANNA_LLM_MODEL,
         api_key=config.VANNA_LLM_API_KEY,
         base_url=config.VANNA_LLM_BASE_URL,
     )
+    if config.VANNA_LLM_CACHE != "off":
+        from data_analyst_mcp.vanna_llm_cache import CachedLlmService
+
+        llm = CachedLlmService(
+            llm,
+            mode=config.VANNA_LLM_CACHE,
+            ttl=config.VANNA_LLM_CACHE_TTL or None,
+            max_entries=config.VANNA_LLM_CACHE_MAX_ENTRIES,
+        )
+
+    from data_analyst_mcp.vanna_sql_runner import (
+        CachingSqlRunner,
+        PooledPostgresRunner,
+        RowLimitedRunSqlTool,
+    )
 
     db_conn_str = config.VANNA_PG_CONN_STR
-    db_tool = RunSqlTool(sql_runner=PostgresRunner(connection_string=db_conn_str))
+    sql_runner = PooledPostgresRunner(
+        connection_string=db_conn_str,
+        min_size=config.VANNA_PG_POOL_MIN_SIZE,
+        max_size=config.VANNA_PG_POOL_MAX_SIZE,
+        pool_timeout=config.VANNA_PG_POOL_TIMEOUT or None,
+        statement_timeout=config.VANNA_SQL_STATEMENT_TIMEOUT or None,
+        row_limit=config.VANNA_SQL_ROW_LIMIT or None,
+    )
+    if config.VANNA_SQL_CACHE_ENABLED:
+        sql_runner = CachingSqlRunner(
+            sql_runner,
+            ttl=config.VANNA_SQL_CACHE_TTL or None,
+            max_entries=config.VANNA_SQL_CACHE_MAX_ENTRIES,
+            max_bytes=config.VANNA_SQL_CACHE_MAX_BYTES or None,
+        )
+    db_tool = RowLimitedRunSqlTool(sql_runner=sql_runner)
 
-    agent_memory = ChromaAgentMemory(
+    embedding_function = embedding_functions.OpenAIEmbeddingFunction(
+        api_base=config.VANNA_EMBED_BASE_URL,
+        api_key=config.VANNA_EMBED_API_KEY,
+        model_name=config.VANNA_EMBED_MODEL,
+    )
+    memory_class = ChromaAgentMemory
+    if config.VANNA_EMBED_CACHE_ENABLED:
+        from data_analyst_mcp.vanna_embedding_cache import (
+            CachedEmbeddingChromaMemory,
+            CachedEmbeddingFunction,
+        )
+
+        embedding_function = CachedEmbeddingFunction(
+            embedding_function,
+            model=config.VANNA_EMBED_MODEL,
+            max_entries=config.VANNA_EMBED_CACHE_MAX_ENTRIES,
+            max_bytes=config.VANNA_EMBED_CACHE_MAX_BYTES or None,
+            disk_dir=config.VANNA_EMBED_CACHE_DIR or None,
+            batch_window=config.VANNA_EMBED_BATCH_WINDOW_MS / 1000,
+            max_batch_size=config.VANNA_EMBED_BATCH_MAX_SIZE,
+        )
+        memory_class = CachedEmbeddingChromaMemory
+
+    agent_memory = memory_class(
         collection_name=config.VANNA_MEMORY_COLLECTION,
         persist_directory=config.VANNA_CHROMA_DIR,
-        embedding_function=embedding_functions.OpenAIEmbeddingFunction(
-            api_base=config.VANNA_EMBED_BASE_URL,
-            api_key=config.VANNA_EMBED_API_KEY,
-            model_name=config.VANNA_EMBED_MODEL,
-        ),
+        embedding_function=embedding_function,
+    )
+
+    from data_analyst_mcp.vanna_conversation_store import (
+        BoundedMemoryConversationStore,
+        SqliteConversationStore,
+    )
+
+    store_limits = dict(
+        max_conversations=config.VANNA_CONVERSATION_MAX,
+        idle_ttl=config.VANNA_CONVERSATION_IDLE_TTL or None,
+        max_turns=config.VANNA_CONVERSATION_MAX_TURNS or None,
     )
+    if config.VANNA_CONVERSATION_DB:
+        conversation_store = SqliteConversationStore(config.VANNA_CONVERSATION_DB, **store_limits)
+    else:
+        conversation_store = BoundedMemoryConversationStore(**store_limits)
 
     tools = ToolRegistry()
     tools.register_local_tool(db_tool, access_groups=["admin", "user"])
@@ -55,14 +129,75 @@ def _build_agent() -> Agent:
         tool_registry=tools,
         user_resolver=SimpleUserResolver(),
         agent_memory=agent_memory,
+        conversation_store=conversation_store,
+        config=AgentConfig(temperature=config.VANNA_LLM_TEMPERATURE),
     )
 
 
 _agent: Optional[Agent] = None
+_agent_lock = threading.Lock()
 
 
 def get_vanna_agent() -> Agent:
     global _agent
     if _agent is None:
-        _agent = _build_agent()
+        with _agent_lock:
+            if _agent is None:
+                _agent = _build_agent()
     return _agent
+
+
+async def get_sql_runner(agent: Agent) -> Any:
+    """Return the SQL runner behind the agent's ``run_sql`` tool, if any."""
+    run_sql = await agent.tool_registry.get_tool("run_sql")
+    return getattr(run_sql, "sql_runner", None)
+
+
+def _check_database(runner: Any) -> None:
+    """Open the runner's connection pool (or a connection) and run ``SELECT 1``."""
+
+    if hasattr(runner, "ping"):
+        runner.ping()
+        return
+    psycopg2 = runner.psycopg2
+    if runner.connection_string:
+        conn = psycopg2.connect(runner.connection_string)
+    else:
+        conn = psycopg2.connect(**runner.connection_params)
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+    finally:
+        conn.close()
+
+
+def _load_memory(agent_memory: Any) -> None:
+    """Open the Chroma collection and embed one string so the first search is warm."""
+
+    agent_memory._get_collection()
+    embed = agent_memory._get_embedding_function()
+    embed([WARMUP_EMBEDDING_TEXT])
+
+
+async def warm_up_vanna_agent(agent: Agent) -> Dict[str, float]:
+    """Touch the agent's database and memory backends; returns seconds spent per step.
+
+    Any failure propagates so callers can keep the instance out of rotation.
+    """
+
+    timings: Dict[str, float] = {}
+
+    runner = await get_sql_runner(agent)
+    if runner is not None and (hasattr(runner, "ping") or hasattr(runner, "psycopg2")):
+        started = time.perf_counter()
+        await asyncio.to_thread(_check_database, runner)
+        timings["database"] = time.perf_counter() - started
+
+    if agent.agent_memory is not None and hasattr(agent.agent_memory, "_get_collection"):
+        started = time.perf_counter()
+        await asyncio.to_thread(_load_memory, agent.agent_memory)
+        timings["memory"] = time.perf_counter() - started
+
+    logger.info("Vanna agent warm-up finished: %s", timings)
+    return timings
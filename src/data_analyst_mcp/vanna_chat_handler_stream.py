@@ -1,9 +1,83 @@
-from typing import Any, AsyncIterator, Dict, Optional
+from __future__ import annotations
 
-from vanna.servers.base.chat_handler import ChatHandler
-from vanna.servers.base.models import ChatRequest, ChatStreamChunk
+import asyncio
+import logging
+from contextlib import aclosing
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Dict, List, Optional
 
-from data_analyst_mcp.vanna_rich_chunk_adapter import chunk_to_events
+import httpx
+
+from data_analyst_mcp.vanna_rich_chunk_adapter import (
+    build_rich_asset_client,
+    chunk_asset_follow_up_async,
+    chunk_to_events_async,
+    chunk_to_primary_events,
+    has_asset_follow_up,
+)
+
+if TYPE_CHECKING:
+    from vanna.servers.base.chat_handler import ChatHandler
+    from vanna.servers.base.models import ChatStreamChunk
+
+logger = logging.getLogger(__name__)
+
+_FollowUpTask = asyncio.Task[Optional[Dict[str, Any]]]
+
+
+def _follow_up_event(task: _FollowUpTask) -> Optional[Dict[str, Any]]:
+    """Result of a finished follow-up; a failed one is logged and skipped."""
+
+    if task.cancelled():
+        return None
+    exc = task.exception()
+    if exc is not None:
+        logger.warning("rich asset follow-up failed: %s", exc)
+        return None
+    return task.result()
+
+
+async def _pipelined_events(
+    chunks: AsyncIterator[ChatStreamChunk],
+    client: httpx.AsyncClient,
+    on_chunk: Callable[[ChatStreamChunk], None],
+) -> AsyncIterator[Dict[str, Any]]:
+    """Yield primary events per chunk and each follow-up event as soon as it finishes."""
+
+    pending: List[_FollowUpTask] = []
+    next_chunk: Optional["asyncio.Future[ChatStreamChunk]"] = asyncio.ensure_future(chunks.__anext__())
+    try:
+        while next_chunk is not None or pending:
+            waiting: List["asyncio.Future[Any]"] = [*pending]
+            if next_chunk is not None:
+                waiting.append(next_chunk)
+            done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+
+            for task in [task for task in pending if task in done]:
+                pending.remove(task)
+                event = _follow_up_event(task)
+                if event:
+                    yield event
+
+            if next_chunk is not None and next_chunk in done:
+                try:
+                    chunk = next_chunk.result()
+                except StopAsyncIteration:
+                    next_chunk = None
+                    continue
+                on_chunk(chunk)
+                for event in chunk_to_primary_events(chunk):
+                    yield event
+                if has_asset_follow_up(chunk):
+                    pending.append(asyncio.create_task(chunk_asset_follow_up_async(chunk, client)))
+                next_chunk = asyncio.ensure_future(chunks.__anext__())
+    finally:
+        leftovers = [*pending, *([next_chunk] if next_chunk is not None else [])]
+        for task in leftovers:
+            task.cancel()
+        await asyncio.gather(*leftovers, return_exceptions=True)
+        aclose = getattr(chunks, "aclose", None)
+        if aclose is not None:
+            await aclose()
 
 
 async def chat_stream_from_handler(
@@ -11,19 +85,50 @@ async def chat_stream_from_handler(
     message: str,
     conversation_id: Optional[str] = None,
     request_id: Optional[str] = None,
+    asset_client: Optional[httpx.AsyncClient] = None,
+    pipeline_assets: bool = False,
 ) -> AsyncIterator[Dict[str, Any]]:
-    """Stream Vanna chat events from a ChatHandler instance."""
+    """Stream Vanna chat events from a ChatHandler instance.
+
+    ``asset_client`` is the pooled client used for rich asset export/render calls;
+    when omitted a client is created for the duration of this stream.
+
+    With ``pipeline_assets`` the ``dataframe``/``plotly`` event is yielded as soon as
+    its chunk arrives and the export/render runs in the background. The resulting
+    ``link``/``image`` event is yielded as soon as it completes, and any still
+    pending are awaited before the ``end`` event; a failed export/render is logged
+    and skipped.
+    """
+    from vanna.servers.base.models import ChatRequest
+
     chat_request = ChatRequest(
         message=message,
         conversation_id=conversation_id,
         request_id=request_id,
     )
     last_chunk: ChatStreamChunk | None = None
+    owns_client = asset_client is None
+    client = asset_client or build_rich_asset_client()
 
-    async for chunk in chat_handler.handle_stream(chat_request):
+    def _remember(chunk: ChatStreamChunk) -> None:
+        nonlocal last_chunk
         last_chunk = chunk
-        for event in chunk_to_events(chunk):
-            yield event
+
+    try:
+        if pipeline_assets:
+            async with aclosing(
+                _pipelined_events(chat_handler.handle_stream(chat_request), client, _remember)
+            ) as events:
+                async for event in events:
+                    yield event
+        else:
+            async for chunk in chat_handler.handle_stream(chat_request):
+                last_chunk = chunk
+                for event in await chunk_to_events_async(chunk, client):
+                    yield event
+    finally:
+        if owns_client:
+            await client.aclose()
 
     if last_chunk and last_chunk.conversation_id:
         yield {
@@ -0,0 +1,303 @@
+"""Bounded conversation stores for the local Vanna agent.
+
+Vanna's default ``MemoryConversationStore`` keeps every conversation forever. These
+stores cap the number of conversations (least recently used go first), drop
+conversations idle longer than ``idle_ttl`` seconds and keep only the last
+``max_turns`` user turns of each history.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import threading
+import time
+from abc import abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from vanna.core.storage import Conversation, ConversationStore, Message
+from vanna.core.user import User
+
+
+def trim_turns(conversation: Conversation, max_turns: Optional[int]) -> int:
+    """Drop whole turns from the start of the history so at most ``max_turns`` remain.
+
+    A turn starts at a user message, so assistant tool calls and their tool results
+    are never separated. Returns the number of messages removed.
+    """
+
+    if not max_turns:
+        return 0
+    starts = [index for index, message in enumerate(conversation.messages) if message.role == "user"]
+    if len(starts) <= max_turns:
+        return 0
+    cut = starts[len(starts) - max_turns]
+    del conversation.messages[:cut]
+    return cut
+
+
+class _BoundedStore(ConversationStore):
+    def __init__(
+        self,
+        max_conversations: int = 1000,
+        idle_ttl: Optional[float] = None,
+        max_turns: Optional[int] = None,
+    ) -> None:
+        self.max_conversations = max_conversations
+        self.idle_ttl = idle_ttl
+        self.max_turns = max_turns
+        self._stats_lock = threading.Lock()
+        self._stats: Dict[str, int] = {
+            "evicted": 0,
+            "expired": 0,
+            "trimmed_messages": 0,
+        }
+
+    def _record(self, **counters: int) -> None:
+        with self._stats_lock:
+            for name, value in counters.items():
+                self._stats[name] += value
+
+    def _trim(self, conversation: Conversation) -> None:
+        removed = trim_turns(conversation, self.max_turns)
+        if removed:
+            self._record(trimmed_messages=removed)
+
+    async def create_conversation(
+        self, conversation_id: str, user: User, initial_message: str
+    ) -> Conversation:
+        conversation = Conversation(
+            id=conversation_id,
+            user=user,
+            messages=[Message(role="user", content=initial_message)],
+        )
+        await self.update_conversation(conversation)
+        return conversation
+
+    async def stats(self) -> Dict[str, Any]:
+        count = await self._count()
+        with self._stats_lock:
+            return {
+                **self._stats,
+                "conversations": count,
+                "max_conversations": self.max_conversations,
+                "idle_ttl": self.idle_ttl,
+                "max_turns": self.max_turns,
+            }
+
+    @abstractmethod
+    async def _count(self) -> int:
+        """Number of stored conversations."""
+
+
+class BoundedMemoryConversationStore(_BoundedStore):
+    """In-process LRU conversation store with idle expiry and a turn cap."""
+
+    def __init__(
+        self,
+        max_conversations: int = 1000,
+        idle_ttl: Optional[float] = None,
+        max_turns: Optional[int] = None,
+    ) -> None:
+        super().__init__(max_conversations, idle_ttl, max_turns)
+        # conversation id -> (conversation, last access on the monotonic clock)
+        self._conversations: "OrderedDict[str, Tuple[Conversation, float]]" = OrderedDict()
+
+    def _expire(self, now: float) -> None:
+        if self.idle_ttl is None:
+            return
+        # Ordered by last access, so idle conversations are at the front.
+        expired = 0
+        while self._conversations:
+            _, accessed = next(iter(self._conversations.values()))
+            if now - accessed < self.idle_ttl:
+                break
+            self._conversations.popitem(last=False)
+            expired += 1
+        if expired:
+            self._record(expired=expired)
+
+    async def get_conversation(self, conversation_id: str, user: User) -> Optional[Conversation]:
+        now = time.monotonic()
+        self._expire(now)
+        entry = self._conversations.get(conversation_id)
+        if entry is None or entry[0].user.id != user.id:
+            return None
+        self._conversations[conversation_id] = (entry[0], now)
+        self._conversations.move_to_end(conversation_id)
+        return entry[0]
+
+    async def update_conversation(self, conversation: Conversation) -> None:
+        now = time.monotonic()
+        self._trim(conversation)
+        self._conversations[conversation.id] = (conversation, now)
+        self._conversations.move_to_end(conversation.id)
+        self._expire(now)
+        evicted = 0
+        while len(self._conversations) > self.max_conversations:
+            self._conversations.popitem(last=False)
+            evicted += 1
+        if evicted:
+            self._record(evicted=evicted)
+
+    async def delete_conversation(self, conversation_id: str, user: User) -> bool:
+        entry = self._conversations.get(conversation_id)
+        if entry is None or entry[0].user.id != user.id:
+            return False
+        del self._conversations[conversation_id]
+        return True
+
+    async def list_conversations(
+        self, user: User, limit: int = 50, offset: int = 0
+    ) -> List[Conversation]:
+        self._expire(time.monotonic())
+        conversations = [conv for conv, _ in self._conversations.values() if conv.user.id == user.id]
+        conversations.sort(key=lambda conv: conv.updated_at, reverse=True)
+        return conversations[offset : offset + limit]
+
+    async def _count(self) -> int:
+        return len(self._conversations)
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS conversations (
+    id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS conversations_accessed_at ON conversations (accessed_at);
+CREATE INDEX IF NOT EXISTS conversations_user_id ON conversations (user_id, updated_at);
+"""
+
+
+class SqliteConversationStore(_BoundedStore):
+    """Conversation store in a SQLite file, shared by worker processes and kept across restarts.
+
+    Queries run in worker threads with a short-lived connection each; the database
+    uses WAL journaling so readers in other processes are not blocked by writes.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_conversations: int = 1000,
+        idle_ttl: Optional[float] = None,
+        max_turns: Optional[int] = None,
+    ) -> None:
+        super().__init__(max_conversations, idle_ttl, max_turns)
+        self.path = path
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def _query(self, sql: str, params: Tuple[Any, ...] = ()) -> List[Tuple[Any, ...]]:
+        conn = self._connect()
+        try:
+            with conn:
+                return conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+
+    def _get(self, conversation_id: str, user_id: str) -> Optional[str]:
+        now = time.time()
+        conn = self._connect()
+        try:
+            with conn:
+                row = conn.execute(
+                    "SELECT data, accessed_at FROM conversations WHERE id = ? AND user_id = ?",
+                    (conversation_id, user_id),
+                ).fetchone()
+                if row is None:
+                    return None
+                if self.idle_ttl is not None and now - row[1] >= self.idle_ttl:
+                    conn.execute("DELETE FROM conversations WHERE id = ?", (conversation_id,))
+                    self._record(expired=1)
+                    return None
+                conn.execute(
+                    "UPDATE conversations SET accessed_at = ? WHERE id = ?", (now, conversation_id)
+                )
+                return str(row[0])
+        finally:
+            conn.close()
+
+    def _put(self, conversation: Conversation) -> None:
+        now = time.time()
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO conversations (id, user_id, updated_at, accessed_at, data)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (
+                        conversation.id,
+                        conversation.user.id,
+                        conversation.updated_at.timestamp(),
+                        now,
+                        conversation.model_dump_json(),
+                    ),
+                )
+                if self.idle_ttl is not None:
+                    expired = conn.execute(
+                        "DELETE FROM conversations WHERE accessed_at <= ?", (now - self.idle_ttl,)
+                    ).rowcount
+                    if expired:
+                        self._record(expired=expired)
+                evicted = conn.execute(
+                    "DELETE FROM conversations WHERE id IN (SELECT id FROM conversations"
+                    " ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_conversations,),
+                ).rowcount
+                if evicted:
+                    self._record(evicted=evicted)
+        finally:
+            conn.close()
+
+    async def get_conversation(self, conversation_id: str, user: User) -> Optional[Conversation]:
+        data = await asyncio.to_thread(self._get, conversation_id, user.id)
+        return Conversation.model_validate_json(data) if data is not None else None
+
+    async def update_conversation(self, conversation: Conversation) -> None:
+        self._trim(conversation)
+        await asyncio.to_thread(self._put, conversation)
+
+    async def delete_conversation(self, conversation_id: str, user: User) -> bool:
+        def _delete() -> bool:
+            conn = self._connect()
+            try:
+                with conn:
+                    return (
+                        conn.execute(
+                            "DELETE FROM conversations WHERE id = ? AND user_id = ?",
+                            (conversation_id, user.id),
+                        ).rowcount
+                        > 0
+                    )
+            finally:
+                conn.close()
+
+        return await asyncio.to_thread(_delete)
+
+    async def list_conversations(
+        self, user: User, limit: int = 50, offset: int = 0
+    ) -> List[Conversation]:
+        cutoff = time.time() - self.idle_ttl if self.idle_ttl is not None else float("-inf")
+        rows = await asyncio.to_thread(
+            self._query,
+            "SELECT data FROM conversations WHERE user_id = ? AND accessed_at > ?"
+            " ORDER BY updated_at DESC LIMIT ? OFFSET ?",
+            (user.id, cutoff, limit, offset),
+        )
+        return [Conversation.model_validate_json(row[0]) for row in rows]
+
+    async def _count(self) -> int:
+        rows = await asyncio.to_thread(self._query, "SELECT COUNT(*) FROM conversations")
+        return int(rows[0][0])
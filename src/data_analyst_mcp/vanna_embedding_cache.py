@@ -0,0 +1,211 @@
+"""Caching, micro-batching embedding function for the Vanna Chroma agent memory."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from chromadb.api.types import Documents, EmbeddingFunction, Embeddings
+from chromadb.errors import NotFoundError
+from vanna.integrations.chromadb import ChromaAgentMemory
+
+from data_analyst_mcp.cache import TTLCache, stable_hash
+
+logger = logging.getLogger(__name__)
+
+Vector = List[float]
+
+
+@dataclass
+class _BatchRequest:
+    texts: Sequence[str]
+    done: threading.Event = field(default_factory=threading.Event)
+    vectors: Optional[List[Vector]] = None
+    error: Optional[BaseException] = None
+
+
+class EmbeddingBatcher:
+    """Merge embedding calls made concurrently from several threads into fewer API calls.
+
+    The first caller becomes the leader: it waits up to ``window`` seconds (less once
+    ``max_batch_size`` texts are pending) for other callers, then embeds everything
+    pending in chunks of ``max_batch_size`` and hands each caller its vectors. The
+    leader keeps leadership while the call is in flight, so callers arriving meanwhile
+    queue up and are sent together as the next batch. With the default ``window=0`` a
+    lone caller never waits.
+    """
+
+    def __init__(
+        self,
+        embed: Callable[[List[str]], Sequence[Sequence[float]]],
+        window: float = 0,
+        max_batch_size: int = 64,
+    ) -> None:
+        self._embed = embed
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self._cond = threading.Condition()
+        self._pending: List[_BatchRequest] = []
+        self._pending_texts = 0
+        self._leader_active = False
+        self._stats: Dict[str, int] = {
+            "requests": 0,
+            "api_calls": 0,
+            "texts_embedded": 0,
+            "max_batch": 0,
+        }
+
+    def embed(self, texts: Sequence[str]) -> List[Vector]:
+        request = _BatchRequest(texts)
+        with self._cond:
+            self._stats["requests"] += 1
+            self._pending.append(request)
+            self._pending_texts += len(texts)
+            leader = not self._leader_active
+            if leader:
+                self._leader_active = True
+            elif self._pending_texts >= self.max_batch_size:
+                self._cond.notify_all()
+
+        if leader:
+            self._lead()
+        else:
+            request.done.wait()
+
+        if request.error is not None:
+            raise request.error
+        assert request.vectors is not None
+        return request.vectors
+
+    def _lead(self) -> None:
+        window = self.window
+        while True:
+            with self._cond:
+                if window > 0:
+                    self._cond.wait_for(lambda: self._pending_texts >= self.max_batch_size, window)
+                    window = 0
+                batch, self._pending, self._pending_texts = self._pending, [], 0
+                if not batch:
+                    self._leader_active = False
+                    return
+            self._run(batch)
+
+    def _run(self, batch: List[_BatchRequest]) -> None:
+        unique = list(dict.fromkeys(text for request in batch for text in request.texts))
+        try:
+            vectors: Dict[str, Vector] = {}
+            for start in range(0, len(unique), self.max_batch_size):
+                chunk = unique[start : start + self.max_batch_size]
+                embedded = self._embed(chunk)
+                with self._cond:
+                    self._stats["api_calls"] += 1
+                    self._stats["texts_embedded"] += len(chunk)
+                    self._stats["max_batch"] = max(self._stats["max_batch"], len(chunk))
+                for text, vector in zip(chunk, embedded):
+                    vectors[text] = [float(x) for x in vector]
+            for request in batch:
+                request.vectors = [vectors[text] for text in request.texts]
+        except BaseException as exc:
+            # Delivered to each caller; the leader keeps draining the queue.
+            for request in batch:
+                request.error = exc
+        finally:
+            for request in batch:
+                request.done.set()
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return dict(self._stats)
+
+
+def _vector_size(vector: Vector) -> int:
+    # list slot + boxed float per dimension
+    return 32 * len(vector) + 56
+
+
+class CachedEmbeddingFunction(EmbeddingFunction[Documents]):
+    """Wrap a Chroma embedding function with a text-hash vector cache and batching.
+
+    Keys hash ``model`` together with the text, so switching models never reuses
+    vectors. ``name()``/``get_config()`` report the wrapped function, which keeps the
+    collection configuration Chroma persists unchanged.
+    """
+
+    def __init__(
+        self,
+        inner: EmbeddingFunction[Documents],
+        model: str = "",
+        max_entries: int = 4096,
+        max_bytes: Optional[int] = None,
+        disk_dir: Optional[str] = None,
+        batch_window: float = 0,
+        max_batch_size: int = 64,
+    ) -> None:
+        self.inner = inner
+        self.model = model
+        self.cache = TTLCache(
+            max_entries=max_entries,
+            max_bytes=max_bytes,
+            disk_dir=disk_dir or None,
+            sizeof=_vector_size,
+        )
+        self.batcher = EmbeddingBatcher(
+            lambda texts: self.inner(texts), window=batch_window, max_batch_size=max_batch_size
+        )
+
+    def __call__(self, input: Documents) -> Embeddings:
+        keys = [stable_hash([self.model, text]) for text in input]
+        vectors: List[Optional[Vector]] = [self.cache.get(key) for key in keys]
+        missing = list(dict.fromkeys(text for text, vector in zip(input, vectors) if vector is None))
+        if missing:
+            embedded = dict(zip(missing, self.batcher.embed(missing)))
+            for index, (key, text) in enumerate(zip(keys, input)):
+                if vectors[index] is None:
+                    vectors[index] = embedded[text]
+                    self.cache.set(key, embedded[text])
+        return vectors  # type: ignore[return-value]
+
+    def name(self) -> str:  # type: ignore[override]
+        return self.inner.name()
+
+    def get_config(self) -> Dict[str, Any]:
+        return self.inner.get_config()
+
+    def is_legacy(self) -> bool:
+        return self.inner.is_legacy()
+
+    def default_space(self) -> Any:
+        return self.inner.default_space()
+
+    def supported_spaces(self) -> Any:
+        return self.inner.supported_spaces()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"cache": self.cache.stats(), "batching": self.batcher.stats()}
+
+
+class CachedEmbeddingChromaMemory(ChromaAgentMemory):
+    """``ChromaAgentMemory`` that also uses its own embedding function for existing collections.
+
+    The base class opens existing collections without an embedding function, so Chroma
+    rebuilds one from the persisted config and the cache wrapper would be bypassed.
+    """
+
+    def _get_collection(self) -> Any:
+        if self._collection is None:
+            client = self._get_client()
+            embedding_func = self._get_embedding_function()
+            try:
+                self._collection = client.get_collection(
+                    name=self.collection_name, embedding_function=embedding_func
+                )
+            except NotFoundError:
+                return super()._get_collection()
+            except ValueError as exc:
+                # Collection persisted with a different embedding function.
+                logger.warning("embedding cache not used for %s: %s", self.collection_name, exc)
+                self._collection = client.get_collection(name=self.collection_name)
+        return self._collection
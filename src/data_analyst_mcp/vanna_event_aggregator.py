@@ -0,0 +1,186 @@
+"""Incremental aggregation of Vanna chat SSE events into a single response."""
+
+from typing import Any, Collection, Dict, Iterable, List, Optional
+
+from data_analyst_mcp import config
+from data_analyst_mcp.cache import approx_size
+
+RAW_EVENTS_NONE = "none"
+RAW_EVENTS_METADATA = "metadata"
+RAW_EVENTS_FULL = "full"
+RAW_EVENTS_MODES = (RAW_EVENTS_NONE, RAW_EVENTS_METADATA, RAW_EVENTS_FULL)
+
+_METADATA_KEYS = ("type", "conversation_id", "request_id")
+
+
+class VannaEventAggregator:
+    """Build the aggregated chat result as events arrive.
+
+    Events are folded into the result fields on :meth:`feed`, so callers no longer
+    need to buffer the whole stream. Retention of ``raw_events`` is controlled by
+    ``raw_events``:
+
+    - ``"none"``: omit ``raw_events`` from the result
+    - ``"metadata"``: keep only the type and conversation/request ids of each event
+    - ``"full"``: keep whole events, up to ``max_raw_events`` events and
+      ``max_raw_event_bytes`` bytes of JSON; events after the first one that does
+      not fit are dropped
+
+    ``raw_event_types`` restricts retention to the listed event types.
+    """
+
+    def __init__(
+        self,
+        raw_events: str = RAW_EVENTS_FULL,
+        max_raw_events: Optional[int] = None,
+        max_raw_event_bytes: Optional[int] = None,
+        raw_event_types: Optional[Collection[str]] = None,
+    ) -> None:
+        if raw_events not in RAW_EVENTS_MODES:
+            raise ValueError(
+                f"raw_events must be one of {', '.join(RAW_EVENTS_MODES)}, got {raw_events!r}"
+            )
+        self.raw_events_mode = raw_events
+        self.max_raw_events = max_raw_events
+        self.max_raw_event_bytes = max_raw_event_bytes
+        self.raw_event_types = set(raw_event_types) if raw_event_types else None
+
+        self.conversation_id: Optional[str] = None
+        self.texts: List[str] = []
+        self.images: List[Dict[str, Any]] = []
+        self.links: List[Dict[str, Any]] = []
+        self.buttons: List[Dict[str, Any]] = []
+        self.dataframes: List[Dict[str, Any]] = []
+        self.plotlies: List[Dict[str, Any]] = []
+        self.sqls: List[str] = []
+        self.errors: List[str] = []
+        self.raw_events: List[Dict[str, Any]] = []
+        self.raw_event_bytes = 0
+        self._raw_bytes_spent = max_raw_event_bytes is not None and max_raw_event_bytes <= 0
+        self.event_count = 0
+        self.dropped_raw_events = 0
+
+    def feed(self, event: Dict[str, Any]) -> None:
+        self.event_count += 1
+        self._keep_raw(event)
+
+        event_type = event.get("type")
+        cid = event.get("conversation_id")
+        if cid is not None:
+            self.conversation_id = cid
+
+        if event_type == "text":
+            text = event.get("text")
+            if text:
+                self.texts.append(text)
+        elif event_type == "image":
+            self.images.append(
+                {
+                    "image_url": event.get("image_url"),
+                    "caption": event.get("caption"),
+                }
+            )
+        elif event_type == "link":
+            self.links.append(
+                {
+                    "title": event.get("title"),
+                    "url": event.get("url"),
+                    "description": event.get("description"),
+                }
+            )
+        elif event_type == "buttons":
+            self.buttons.append(
+                {
+                    "text": event.get("text"),
+                    "buttons": event.get("buttons") or [],
+                }
+            )
+        elif event_type == "dataframe":
+            self.dataframes.append({"json_table": event.get("json_table")})
+        elif event_type == "plotly":
+            self.plotlies.append({"json_plotly": event.get("json_plotly")})
+        elif event_type == "sql":
+            query = event.get("query")
+            if query:
+                self.sqls.append(query)
+        elif event_type == "error":
+            err = event.get("error")
+            if err:
+                self.errors.append(err)
+
+    def feed_all(self, events: Iterable[Dict[str, Any]]) -> "VannaEventAggregator":
+        for event in events:
+            self.feed(event)
+        return self
+
+    def result(self) -> Dict[str, Any]:
+        final_text = "".join(self.texts) if self.texts else None
+
+        result: Dict[str, Any] = {
+            "conversation_id": self.conversation_id,
+            "text": final_text,
+            "images": self.images or None,
+            "links": self.links or None,
+            "buttons": self.buttons or None,
+            "dataframes": self.dataframes or None,
+            "plotly": self.plotlies or None,
+            "sql": self.sqls or None,
+            "errors": self.errors or None,
+            "raw_events": None if self.raw_events_mode == RAW_EVENTS_NONE else self.raw_events,
+            "raw_events_dropped": self.dropped_raw_events or None,
+        }
+
+        return {k: v for k, v in result.items() if v is not None}
+
+    def _keep_raw(self, event: Dict[str, Any]) -> None:
+        if self.raw_events_mode == RAW_EVENTS_NONE:
+            return
+        if self.raw_event_types is not None and event.get("type") not in self.raw_event_types:
+            return
+        if self._raw_bytes_spent or (
+            self.max_raw_events is not None and len(self.raw_events) >= self.max_raw_events
+        ):
+            self.dropped_raw_events += 1
+            return
+
+        if self.raw_events_mode == RAW_EVENTS_METADATA:
+            kept = {key: event[key] for key in _METADATA_KEYS if key in event}
+        else:
+            kept = event
+        if self.max_raw_event_bytes is not None:
+            size = approx_size(kept)
+            if self.raw_event_bytes + size > self.max_raw_event_bytes:
+                # Once an event does not fit, drop the rest without encoding them.
+                self._raw_bytes_spent = True
+                self.dropped_raw_events += 1
+                return
+            self.raw_event_bytes += size
+        self.raw_events.append(kept)
+
+
+def build_event_aggregator(
+    raw_events: Optional[str] = None,
+    raw_event_types: Optional[Collection[str]] = None,
+    raw_events_max_bytes: Optional[int] = None,
+) -> VannaEventAggregator:
+    """Build an aggregator from tool arguments, falling back to the configured retention.
+
+    Only omitted (``None``) arguments use the configuration; an explicit
+    ``raw_events_max_bytes=0`` keeps no raw events.
+    """
+
+    return VannaEventAggregator(
+        raw_events=config.VANNA_RAW_EVENTS if raw_events is None else raw_events,
+        max_raw_event_bytes=(
+            config.VANNA_RAW_EVENTS_MAX_BYTES if raw_events_max_bytes is None else raw_events_max_bytes
+        ),
+        raw_event_types=raw_event_types,
+    )
+
+
+def aggregate_vanna_events(events: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Aggregate Vanna chat SSE events into a single response."""
+
+    result = VannaEventAggregator(raw_events=RAW_EVENTS_NONE).feed_all(events).result()
+    result["raw_events"] = events
+    return result
@@ -0,0 +1,125 @@
+"""Response cache in front of the Vanna agent's LLM service."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, AsyncGenerator, Dict, List, Optional
+
+from vanna.core.llm import LlmRequest, LlmResponse, LlmService, LlmStreamChunk
+
+from data_analyst_mcp.cache import TTLCache, stable_hash
+
+logger = logging.getLogger(__name__)
+
+CACHE_MODES = ("off", "deterministic", "all")
+
+
+def request_cache_key(model: str, request: LlmRequest) -> str:
+    """Hash everything in ``request`` that shapes the completion (not the user)."""
+
+    tools = [
+        {
+            "name": getattr(tool, "name", None),
+            "description": getattr(tool, "description", None),
+            "parameters": getattr(tool, "parameters", None),
+        }
+        for tool in request.tools or []
+    ]
+    return stable_hash(
+        {
+            "model": model,
+            "system_prompt": request.system_prompt,
+            "messages": [message.model_dump(mode="json") for message in request.messages],
+            "tools": tools,
+            "temperature": request.temperature,
+            "max_tokens": request.max_tokens,
+        }
+    )
+
+
+class CachedLlmService(LlmService):
+    """Replay stored completions for requests identical in model, messages and tools.
+
+    ``mode="deterministic"`` only caches requests sent with temperature 0; ``"all"``
+    caches every request. Streaming and non-streaming calls share entries: a cached
+    completion is replayed to ``stream_request`` as a single chunk. Empty responses
+    and truncated (``finish_reason="length"``) ones are not stored.
+    """
+
+    def __init__(
+        self,
+        llm_service: LlmService,
+        mode: str = "deterministic",
+        ttl: Optional[float] = 3600,
+        max_entries: int = 512,
+    ) -> None:
+        if mode not in CACHE_MODES:
+            raise ValueError(f"invalid LLM cache mode {mode!r}, expected one of {CACHE_MODES}")
+        self.llm_service = llm_service
+        self.mode = mode
+        self.cache = TTLCache(max_entries=max_entries, ttl=ttl)
+        self._stats: Dict[str, int] = {"bypassed": 0, "stored": 0}
+
+    @property
+    def model(self) -> str:
+        return getattr(self.llm_service, "model", "unknown")
+
+    def _key(self, request: LlmRequest) -> Optional[str]:
+        if self.mode == "off" or (self.mode == "deterministic" and request.temperature != 0):
+            self._stats["bypassed"] += 1
+            return None
+        return request_cache_key(self.model, request)
+
+    def _store(self, key: Optional[str], response: LlmResponse) -> None:
+        if key is None or response.finish_reason == "length":
+            return
+        if not response.content and not response.tool_calls:
+            return
+        self.cache.set(key, response.model_dump(mode="json"))
+        self._stats["stored"] += 1
+
+    async def send_request(self, request: LlmRequest) -> LlmResponse:
+        key = self._key(request)
+        cached = self.cache.get(key) if key is not None else None
+        if cached is not None:
+            response = LlmResponse.model_validate(cached)
+            response.metadata["cache"] = "hit"
+            return response
+        response = await self.llm_service.send_request(request)
+        self._store(key, response)
+        return response
+
+    async def stream_request(self, request: LlmRequest) -> AsyncGenerator[LlmStreamChunk, None]:
+        key = self._key(request)
+        cached = self.cache.get(key) if key is not None else None
+        if cached is not None:
+            response = LlmResponse.model_validate(cached)
+            yield LlmStreamChunk(
+                content=response.content,
+                tool_calls=response.tool_calls,
+                finish_reason=response.finish_reason,
+                metadata={"cache": "hit"},
+            )
+            return
+
+        content = ""
+        tool_calls: List[Any] = []
+        finish_reason: Optional[str] = None
+        async for chunk in self.llm_service.stream_request(request):
+            content += chunk.content or ""
+            tool_calls.extend(chunk.tool_calls or [])
+            finish_reason = chunk.finish_reason or finish_reason
+            yield chunk
+        self._store(
+            key,
+            LlmResponse(content=content or None, tool_calls=tool_calls or None, finish_reason=finish_reason),
+        )
+
+    async def validate_tools(self, tools: List[Any]) -> List[str]:
+        return await self.llm_service.validate_tools(tools)
+
+    def clear(self) -> None:
+        self.cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._stats, "mode": self.mode, "cache": self.cache.stats()}
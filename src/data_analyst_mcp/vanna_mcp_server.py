@@ -1,20 +1,46 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, AsyncGenerator, Dict, List, Optional
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+import httpx
 from pydantic import Field
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Mount, Route
 
 from data_analyst_mcp import config
-from data_analyst_mcp.server import aggregate_vanna_events
-from data_analyst_mcp.vanna_agent import get_vanna_agent
+from data_analyst_mcp.admission import admission_controlled, admission_stats
+from data_analyst_mcp.cache import AsyncOnce
+from data_analyst_mcp.fastjson_mcp import FastJSONMCP
+from data_analyst_mcp.multiworker import SessionForwarder, resolve_worker_count, run_workers
 from data_analyst_mcp.vanna_chat_handler_stream import chat_stream_from_handler
-from mcp.server.fastmcp import FastMCP
-from vanna.servers.base.chat_handler import ChatHandler
+from data_analyst_mcp.vanna_event_aggregator import build_event_aggregator
+from data_analyst_mcp.vanna_rich_chunk_adapter import build_rich_asset_client, rich_asset_stats
 
 import logging
 import sys 
 from mcp.server.session import ServerSession
 
+if TYPE_CHECKING:
+    from vanna.servers.base.chat_handler import ChatHandler
+
 ####################################################################################
 # Temporary monkeypatch which avoids crashing when a POST message is received
 # before a connection has been initialized, e.g: after a deployment.
@@ -37,10 +63,19 @@ ServerSession._received_request = _received_request
 class AppState:
     agent: Any
     chat_handler: ChatHandler
+    # 所有会话共享的 rich asset 连接池，由 _sse_lifespan 创建并关闭
+    asset_client: Optional[httpx.AsyncClient] = None
+    # 预热状态：开启 VANNA_WARMUP 时，预热完成前 /ready 返回 503
+    ready: bool = False
+    warmup_error: Optional[str] = None
+    warmup_timings: Dict[str, float] = field(default_factory=dict)
+    # agent / ChatHandler 只构建一次，并发的首次调用等待同一次构建
+    init_once: AsyncOnce[Any] = field(default_factory=AsyncOnce)
 
 
 # 全局 AppState 单例
 _APP_STATE: Optional[AppState] = None
+_APP_STATE_LOCK = threading.Lock()
 
 
 def get_app_state() -> AppState:
@@ -50,26 +85,84 @@ def get_app_state() -> AppState:
     """
     global _APP_STATE
     if _APP_STATE is None:
-        # 初始为 None，占位，保持与原来 lifespan 里的初始状态一致
-        _APP_STATE = AppState(agent=None, chat_handler=None)  # type: ignore[arg-type]
+        with _APP_STATE_LOCK:
+            if _APP_STATE is None:
+                # 初始为 None，占位，保持与原来 lifespan 里的初始状态一致
+                _APP_STATE = AppState(agent=None, chat_handler=None)  # type: ignore[arg-type]
     return _APP_STATE
 
 
-mcp = FastMCP(
+mcp = FastJSONMCP(
     "VannaMCP",
     stateless_http=True,
     json_response=True,
 )
 
 
-def ensure_initialized(state: AppState) -> AppState:
-    """Initialize agent and chat handler on first use."""
+def _build_agent_and_handler() -> Tuple[Any, ChatHandler]:
+    # vanna and its integrations are imported here, not at module load, so the
+    # process answers the MCP handshake before paying for them.
+    from vanna.servers.base.chat_handler import ChatHandler
+
+    from data_analyst_mcp.vanna_agent import get_vanna_agent
+
+    agent = get_vanna_agent()
+    return agent, ChatHandler(agent)
+
+
+async def ensure_initialized(state: AppState) -> AppState:
+    """Initialize agent and chat handler on first use.
+
+    The build runs once, in a worker thread so the event loop keeps serving other
+    sessions; concurrent first calls wait for that single build.
+    """
     if state.agent is None:
-        state.agent = get_vanna_agent()
-        state.chat_handler = ChatHandler(state.agent)
+
+        async def _init() -> Tuple[Any, ChatHandler]:
+            agent, chat_handler = await asyncio.to_thread(_build_agent_and_handler)
+            state.agent, state.chat_handler = agent, chat_handler
+            logger.info("Vanna agent initialized")
+            return agent, chat_handler
+
+        await state.init_once.get(_init)
+    return state
+
+
+async def warm_up(state: AppState) -> AppState:
+    """Build the agent off the event loop, touch its DB and memory backends, then mark ready."""
+    from data_analyst_mcp.vanna_agent import warm_up_vanna_agent
+
+    started = time.perf_counter()
+    try:
+        await ensure_initialized(state)
+        timings = await warm_up_vanna_agent(state.agent)
+    except Exception as e:  # noqa: BLE001
+        state.warmup_error = str(e)
+        logger.exception(f"Vanna agent warm-up failed: {str(e)}")
+        return state
+    timings["total"] = time.perf_counter() - started
+    state.warmup_timings = timings
+    state.warmup_error = None
+    state.ready = True
+    logger.info(f"Vanna agent warmed up in {timings['total']:.2f}s")
     return state
 
 
+def readiness_status(state: AppState) -> Dict[str, Any]:
+    """Without warm-up every instance is routable; with it, only once warm-up succeeded."""
+    status: Dict[str, Any] = {
+        "ready": state.ready or not config.VANNA_WARMUP,
+        "warmup": config.VANNA_WARMUP,
+    }
+    if state.warmup_timings:
+        status["warmup_timings"] = state.warmup_timings
+    if state.warmup_error:
+        status["warmup_error"] = state.warmup_error
+    return status
+
+
+# No admission_controlled here: FastMCP 1.6 returns a generator tool's result without
+# iterating it, so an admission slot taken inside the generator would never be held.
 @mcp.tool()
 async def vanna_chat_stream(
     message: str,
@@ -81,12 +174,14 @@ async def vanna_chat_stream(
     Stream responses from a local Vanna ChatHandler as chat SSE events.
     """
     _ = agent_id
-    state = ensure_initialized(get_app_state())
+    state = await ensure_initialized(get_app_state())
 
     async for event in chat_stream_from_handler(
         chat_handler=state.chat_handler,
         message=message,
         conversation_id=conversation_id,
+        asset_client=state.asset_client,
+        pipeline_assets=config.RICH_ASSET_PIPELINE,
     ):
         event_type = event.get("type")
         if event_type == "end":
@@ -98,6 +193,7 @@ async def vanna_chat_stream(
 
 
 @mcp.tool()
+@admission_controlled("vanna_chat_once")
 async def vanna_chat_once(
     message: str = Field(description="User message to send to Vanna"),
     user_email: Optional[str] = Field(default=None, description="User email"),
@@ -110,24 +206,128 @@ async def vanna_chat_once(
         default=None,
         description="Filter response types: text/image/link/error/dataframe/plotly/sql",
     ),
+    raw_events: Optional[str] = Field(
+        default=None,
+        description="raw_events retention: none/metadata/full (default from VANNA_RAW_EVENTS)",
+    ),
+    raw_event_types: Optional[List[str]] = Field(
+        default=None, description="Only keep raw events of these types"
+    ),
+    raw_events_max_bytes: Optional[int] = Field(
+        default=None, description="Byte cap for retained raw events (default from config)"
+    ),
 ) -> Dict[str, Any]:
     """Return aggregated chat output for a single message."""
     _ = agent_id
-    state = ensure_initialized(get_app_state())
-    events: List[Dict[str, Any]] = []
+    state = await ensure_initialized(get_app_state())
+    aggregator = build_event_aggregator(
+        raw_events=raw_events,
+        raw_event_types=raw_event_types,
+        raw_events_max_bytes=raw_events_max_bytes,
+    )
     async for event in chat_stream_from_handler(
         chat_handler=state.chat_handler,
         message=message,
         conversation_id=conversation_id,
+        asset_client=state.asset_client,
+        pipeline_assets=config.RICH_ASSET_PIPELINE,
     ):
         event_type = event.get("type")
         if event_type == "end":
-            events.append(event)
+            aggregator.feed(event)
             continue
         if acceptable_responses and event_type not in acceptable_responses:
             continue
-        events.append(event)
-    return aggregate_vanna_events(events)
+        aggregator.feed(event)
+    return aggregator.result()
+
+
+@mcp.tool()
+async def vanna_server_stats() -> Dict[str, Any]:
+    """Return runtime counters of the Vanna MCP server (readiness, init, caches, coalescing)."""
+    state = get_app_state()
+    stats: Dict[str, Any] = {
+        "readiness": readiness_status(state),
+        "init": state.init_once.stats(),
+        "admission": admission_stats(),
+        "rich_assets": rich_asset_stats(),
+    }
+    if state.agent is not None:
+        from data_analyst_mcp.vanna_agent import get_sql_runner
+
+        runner = await get_sql_runner(state.agent)
+        if runner is not None and hasattr(runner, "stats"):
+            stats["sql"] = runner.stats()
+        if hasattr(state.agent.conversation_store, "stats"):
+            stats["conversations"] = await state.agent.conversation_store.stats()
+        if hasattr(state.agent.llm_service, "stats"):
+            stats["llm"] = state.agent.llm_service.stats()
+        embedding_function = getattr(state.agent.agent_memory, "_embedding_function", None)
+        if embedding_function is not None and hasattr(embedding_function, "stats"):
+            stats["embeddings"] = embedding_function.stats()
+    return stats
+
+
+@mcp.tool()
+async def vanna_sql_cache_invalidate(
+    contains: Optional[str] = Field(
+        default=None,
+        description="Only drop cached queries whose SQL contains this text (e.g. a table name); empty drops all",
+    ),
+) -> Dict[str, Any]:
+    """Admin: drop cached run_sql results so the next identical query hits the database.
+
+    Only clears the worker process that receives the call; with several workers
+    (VANNA_MCP_WORKERS) the others keep their cached results until they expire.
+    """
+    state = get_app_state()
+    if state.agent is None:
+        return {"invalidated": 0}
+    from data_analyst_mcp.vanna_agent import get_sql_runner
+
+    runner = await get_sql_runner(state.agent)
+    if runner is None or not hasattr(runner, "invalidate"):
+        return {"invalidated": 0}
+    return {"invalidated": runner.invalidate(contains)}
+
+
+async def ready_endpoint(request: Request) -> JSONResponse:
+    """Readiness probe for load balancers: 200 once warm, 503 before."""
+    status = readiness_status(get_app_state())
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
+
+
+@asynccontextmanager
+async def _sse_lifespan(app: Starlette) -> AsyncIterator[None]:
+    state = get_app_state()
+    # Without this lifespan (e.g. mcp.run()) each chat call builds and closes its own client.
+    state.asset_client = build_rich_asset_client()
+    task = asyncio.create_task(warm_up(state)) if config.VANNA_WARMUP else None
+    try:
+        yield
+    finally:
+        if task is not None:
+            task.cancel()
+        client, state.asset_client = state.asset_client, None
+        await client.aclose()
+
+
+def build_sse_app(peer_ports: Optional[Callable[[], Sequence[int]]] = None) -> Starlette:
+    """The FastMCP SSE app plus a ``/ready`` route, warming up the agent on startup.
+
+    In multi-worker mode ``peer_ports`` lists the other workers' loopback ports; the
+    message endpoint then forwards posts for sessions owned by another worker.
+    """
+    routes: List[Any] = []
+    for route in mcp.sse_app().routes:
+        if peer_ports is not None and isinstance(route, Mount):
+            route = Mount(route.path, app=SessionForwarder(route.app, peer_ports))
+        routes.append(route)
+    return Starlette(
+        debug=mcp.settings.debug,
+        routes=[Route("/ready", endpoint=ready_endpoint, methods=["GET"]), *routes],
+        lifespan=_sse_lifespan,
+    )
 
 
 
@@ -143,6 +343,12 @@ logger = logging.getLogger(__name__)
 
 if __name__ == "__main__":
     try:
+        settings = config.configure()
+        if settings.PROFILE_STARTUP:
+            from data_analyst_mcp.startup_profile import run_startup_profile
+
+            sys.exit(run_startup_profile("data_analyst_mcp.vanna_mcp_server"))
+
         log_level = getattr(logging, "INFO")
         logging.getLogger().setLevel(log_level)
         logger.info("Starting Vanna MCP server")
@@ -203,7 +409,31 @@ if __name__ == "__main__":
         logger.info("=" * 80)
  
 
-        mcp.run(transport="sse")
+        workers = resolve_worker_count(config.VANNA_MCP_WORKERS)
+        if workers > 1:
+            if not config.VANNA_CONVERSATION_DB:
+                logger.warning(
+                    "%d workers without VANNA_CONVERSATION_DB: conversation history is kept per "
+                    "worker and lost when a client reconnects to another one",
+                    workers,
+                )
+            # 每个 worker 进程各自构建 agent / AppState
+            run_workers(
+                build_sse_app,
+                host=mcp.settings.host,
+                port=mcp.settings.port,
+                workers=workers,
+                log_level=mcp.settings.log_level.lower(),
+            )
+        else:
+            import uvicorn
+
+            uvicorn.run(
+                build_sse_app(),
+                host=mcp.settings.host,
+                port=mcp.settings.port,
+                log_level=mcp.settings.log_level.lower(),
+            )
 
     except KeyboardInterrupt:
         logger.info("Server stopped by user")
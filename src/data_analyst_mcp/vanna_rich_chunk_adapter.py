@@ -1,10 +1,15 @@
+from __future__ import annotations
+
 import logging
-from typing import Any, Dict, Iterable, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional
 
 import httpx
-from vanna.servers.base.models import ChatStreamChunk
 
 from data_analyst_mcp import config
+from data_analyst_mcp.cache import SingleFlight, TTLCache, stable_hash
+
+if TYPE_CHECKING:
+    from vanna.servers.base.models import ChatStreamChunk
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +24,70 @@ _IMAGE_TYPES = {
     "webp",
 }
 
+_DATAFRAME_EXPORT_PATH = "/api/v0/rich_assets/dataframe/export"
+_CHART_RENDER_PATH = "/api/v0/rich_assets/chart/render"
+
+_asset_cache: Optional[TTLCache] = None
+_asset_flight = SingleFlight()
+
+
+def get_rich_asset_cache() -> Optional[TTLCache]:
+    """Return the process-wide rich asset cache, or ``None`` when caching is disabled."""
+    global _asset_cache
+    if not config.RICH_ASSET_CACHE_ENABLED:
+        return None
+    if _asset_cache is None:
+        _asset_cache = TTLCache(
+            max_entries=config.RICH_ASSET_CACHE_MAX_ENTRIES,
+            ttl=config.RICH_ASSET_CACHE_TTL,
+            max_bytes=config.RICH_ASSET_CACHE_MAX_BYTES,
+            disk_dir=config.RICH_ASSET_CACHE_DIR or None,
+        )
+    return _asset_cache
+
+
+def rich_asset_stats() -> Dict[str, Any]:
+    """Return cache and request coalescing counters for rich asset calls."""
+    cache = get_rich_asset_cache()
+    return {
+        "cache": cache.stats() if cache is not None else None,
+        "single_flight": _asset_flight.stats(),
+    }
+
+
+def _asset_cache_key(path: str, payload: Dict[str, Any], options_field: str) -> str:
+    # conversation/request ids and rich metadata are deliberately left out so that
+    # identical data rendered with identical options shares one asset.
+    return stable_hash(
+        {
+            "path": path,
+            "data": payload["rich"]["data"],
+            "options": payload[options_field],
+        }
+    )
+
+
+def _cached_asset(key: str) -> Optional[Dict[str, Any]]:
+    cache = get_rich_asset_cache()
+    return cache.get(key) if cache is not None else None
+
+
+def _store_asset(key: str, asset: Optional[Dict[str, Any]]) -> None:
+    cache = get_rich_asset_cache()
+    if cache is not None and asset:
+        cache.set(key, asset)
+
+
+async def _cached_asset_async(key: str) -> Optional[Dict[str, Any]]:
+    cache = get_rich_asset_cache()
+    return await cache.aget(key) if cache is not None else None
+
+
+async def _store_asset_async(key: str, asset: Optional[Dict[str, Any]]) -> None:
+    cache = get_rich_asset_cache()
+    if cache is not None and asset:
+        await cache.aset(key, asset)
+
 
 def _normalize_button_data(button: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     label = button.get("label") or button.get("title") or button.get("text")
@@ -297,12 +366,12 @@ def _build_image_event_for_chart(
     }
 
 
-def _export_dataframe_asset(chunk: ChatStreamChunk) -> Optional[Dict[str, Any]]:
+def _dataframe_export_payload(chunk: ChatStreamChunk) -> Optional[Dict[str, Any]]:
     rich = chunk.rich or {}
     data = rich.get("data", {}) or {}
     if not data.get("exportable", True):
         return None
-    payload = {
+    return {
         "conversation_id": chunk.conversation_id,
         "request_id": chunk.request_id,
         "rich": {
@@ -321,23 +390,12 @@ def _export_dataframe_asset(chunk: ChatStreamChunk) -> Optional[Dict[str, Any]]:
             "encoding": "utf-8",
         },
     }
-    try:
-        response = httpx.post(
-            f"{config.RICH_ASSET_BASE_URL}/api/v0/rich_assets/dataframe/export",
-            json=payload,
-            timeout=config.RICH_ASSET_TIMEOUT,
-        )
-        response.raise_for_status()
-        return response.json().get("asset")
-    except httpx.HTTPError as exc:
-        logger.warning("export dataframe asset failed: %s", exc)
-        return None
 
 
-def _render_chart_asset(chunk: ChatStreamChunk) -> Optional[Dict[str, Any]]:
+def _chart_render_payload(chunk: ChatStreamChunk) -> Dict[str, Any]:
     rich = chunk.rich or {}
     data = rich.get("data", {}) or {}
-    payload = {
+    return {
         "conversation_id": chunk.conversation_id,
         "request_id": chunk.request_id,
         "rich": {
@@ -357,17 +415,93 @@ def _render_chart_asset(chunk: ChatStreamChunk) -> Optional[Dict[str, Any]]:
             "background": "white",
         },
     }
+
+
+def _post_asset(path: str, payload: Dict[str, Any], options_field: str, action: str) -> Optional[Dict[str, Any]]:
+    key = _asset_cache_key(path, payload, options_field)
+    cached = _cached_asset(key)
+    if cached is not None:
+        return cached
     try:
         response = httpx.post(
-            f"{config.RICH_ASSET_BASE_URL}/api/v0/rich_assets/chart/render",
+            f"{config.RICH_ASSET_BASE_URL}{path}",
             json=payload,
             timeout=config.RICH_ASSET_TIMEOUT,
         )
         response.raise_for_status()
-        return response.json().get("asset")
+        asset = response.json().get("asset")
     except httpx.HTTPError as exc:
-        logger.warning("render chart asset failed: %s", exc)
+        logger.warning("%s asset failed: %s", action, exc)
+        return None
+    _store_asset(key, asset)
+    return asset
+
+
+def _export_dataframe_asset(chunk: ChatStreamChunk) -> Optional[Dict[str, Any]]:
+    payload = _dataframe_export_payload(chunk)
+    if payload is None:
+        return None
+    return _post_asset(_DATAFRAME_EXPORT_PATH, payload, "export", "export dataframe")
+
+
+def _render_chart_asset(chunk: ChatStreamChunk) -> Optional[Dict[str, Any]]:
+    payload = _chart_render_payload(chunk)
+    return _post_asset(_CHART_RENDER_PATH, payload, "render", "render chart")
+
+
+def build_rich_asset_client() -> httpx.AsyncClient:
+    """Build a pooled async client for the rich asset service."""
+    return httpx.AsyncClient(
+        timeout=config.RICH_ASSET_TIMEOUT,
+        limits=httpx.Limits(
+            max_connections=config.RICH_ASSET_MAX_CONNECTIONS,
+            max_keepalive_connections=config.RICH_ASSET_MAX_KEEPALIVE_CONNECTIONS,
+        ),
+    )
+
+
+async def _post_asset_async(
+    client: httpx.AsyncClient,
+    path: str,
+    payload: Dict[str, Any],
+    options_field: str,
+    action: str,
+) -> Optional[Dict[str, Any]]:
+    key = _asset_cache_key(path, payload, options_field)
+    cached = await _cached_asset_async(key)
+    if cached is not None:
+        return cached
+
+    async def _fetch() -> Optional[Dict[str, Any]]:
+        try:
+            response = await client.post(f"{config.RICH_ASSET_BASE_URL}{path}", json=payload)
+            response.raise_for_status()
+            asset = response.json().get("asset")
+        except httpx.HTTPError as exc:
+            logger.warning("%s asset failed: %s", action, exc)
+            return None
+        await _store_asset_async(key, asset)
+        return asset
+
+    return await _asset_flight.do(key, _fetch)
+
+
+async def _export_dataframe_asset_async(
+    chunk: ChatStreamChunk,
+    client: httpx.AsyncClient,
+) -> Optional[Dict[str, Any]]:
+    payload = _dataframe_export_payload(chunk)
+    if payload is None:
         return None
+    return await _post_asset_async(client, _DATAFRAME_EXPORT_PATH, payload, "export", "export dataframe")
+
+
+async def _render_chart_asset_async(
+    chunk: ChatStreamChunk,
+    client: httpx.AsyncClient,
+) -> Optional[Dict[str, Any]]:
+    payload = _chart_render_payload(chunk)
+    return await _post_asset_async(client, _CHART_RENDER_PATH, payload, "render", "render chart")
 
 
 def _attach_identifiers(chunk: ChatStreamChunk, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -402,3 +536,59 @@ def chunk_to_events(chunk: ChatStreamChunk) -> List[Dict[str, Any]]:
 
     base_events = rich_component_to_events(rich)
     return _attach_identifiers(chunk, base_events)
+
+
+def has_asset_follow_up(chunk: ChatStreamChunk) -> bool:
+    """Return whether the chunk triggers a rich asset export/render call."""
+    rich = chunk.rich or {}
+    return (rich.get("type") or "").lower() in {"dataframe", "chart"}
+
+
+def chunk_to_primary_events(chunk: ChatStreamChunk) -> List[Dict[str, Any]]:
+    """Convert a ChatStreamChunk to the events that need no rich asset round trip."""
+    rich = chunk.rich or {}
+    component_type = (rich.get("type") or "").lower()
+
+    if component_type == "dataframe":
+        return _attach_identifiers(chunk, [_build_dataframe_event_from_rich(rich)])
+    if component_type == "chart":
+        return _attach_identifiers(chunk, [_build_plotly_event_from_rich(rich)])
+    return _attach_identifiers(chunk, rich_component_to_events(rich))
+
+
+async def chunk_asset_follow_up_async(
+    chunk: ChatStreamChunk,
+    client: httpx.AsyncClient,
+) -> Optional[Dict[str, Any]]:
+    """Export/render the chunk's rich asset and build its ``link``/``image`` event."""
+    rich = chunk.rich or {}
+    component_type = (rich.get("type") or "").lower()
+
+    event: Optional[Dict[str, Any]] = None
+    if component_type == "dataframe":
+        asset = await _export_dataframe_asset_async(chunk, client)
+        event = _build_link_event_for_dataframe(chunk, asset or {})
+    elif component_type == "chart":
+        asset = await _render_chart_asset_async(chunk, client)
+        event = _build_image_event_for_chart(chunk, asset or {})
+
+    if event is None:
+        return None
+    return _attach_identifiers(chunk, [event])[0]
+
+
+async def chunk_to_events_async(
+    chunk: ChatStreamChunk,
+    client: httpx.AsyncClient,
+) -> List[Dict[str, Any]]:
+    """Convert a ChatStreamChunk to Vanna chat SSE events without blocking the event loop.
+
+    Same output as :func:`chunk_to_events`, but dataframe exports and chart renders
+    go through the shared pooled ``client`` instead of a blocking ``httpx.post``.
+    """
+    events = chunk_to_primary_events(chunk)
+    if has_asset_follow_up(chunk):
+        follow_up = await chunk_asset_follow_up_async(chunk, client)
+        if follow_up:
+            events.append(follow_up)
+    return events
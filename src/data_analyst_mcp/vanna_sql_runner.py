@@ -0,0 +1,348 @@
+"""Pooled and caching PostgreSQL runners for the Vanna ``RunSqlTool``."""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import logging
+import re
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+import pandas as pd
+import psycopg2
+import psycopg2.errors
+import psycopg2.extras
+import psycopg2.pool
+from vanna.capabilities.sql_runner import RunSqlToolArgs, SqlRunner
+from vanna.tools import RunSqlTool
+
+from data_analyst_mcp.cache import SingleFlight, TTLCache
+
+if TYPE_CHECKING:
+    from vanna.core.tool import ToolContext, ToolResult
+
+logger = logging.getLogger(__name__)
+
+_READ_QUERY_PREFIXES = ("select", "with", "values", "table")
+# Quoted literals and identifiers are case-sensitive and kept verbatim.
+_QUOTED = re.compile(r"('(?:[^']|'')*'|\"(?:[^\"]|\"\")*\")")
+_WHITESPACE = re.compile(r"\s+")
+# Data-modifying CTEs, SELECT INTO and row locks cannot run in a read-only cursor.
+_WRITE_KEYWORDS = re.compile(r"\b(insert|update|delete|merge|into)\b")
+# Functions whose result changes between identical calls.
+_VOLATILE_FUNCTIONS = re.compile(
+    r"\b(now|current_date|current_time|current_timestamp|localtime|localtimestamp"
+    r"|clock_timestamp|statement_timestamp|transaction_timestamp|timeofday"
+    r"|random|gen_random_uuid|uuid_generate_\w+|nextval|currval|lastval|setval"
+    r"|txid_current\w*|pg_sleep\w*|pg_advisory\w*)\b"
+)
+
+
+def _unquoted_text(sql: str) -> str:
+    """Lower-cased ``sql`` with quoted literals and identifiers removed."""
+
+    return " ".join(part.lower() for part in _QUOTED.split(sql)[::2])
+
+
+def is_read_only_query(sql: str) -> bool:
+    """Whether ``sql`` is a plain row query: SELECT/VALUES/TABLE, or WITH without writes."""
+
+    text = _unquoted_text(sql).strip()
+    if not text or text.split(None, 1)[0] not in _READ_QUERY_PREFIXES:
+        return False
+    return _WRITE_KEYWORDS.search(text) is None
+
+
+def is_cacheable_query(sql: str) -> bool:
+    """Whether repeating ``sql`` returns the same rows: read-only and no volatile functions."""
+
+    return is_read_only_query(sql) and _VOLATILE_FUNCTIONS.search(_unquoted_text(sql)) is None
+
+
+class PoolTimeoutError(RuntimeError):
+    """Raised when no pooled connection frees up within ``pool_timeout`` seconds."""
+
+
+class PooledPostgresRunner(SqlRunner):
+    """Run Vanna SQL on a bounded psycopg2 connection pool, off the event loop.
+
+    Each query runs in a worker thread on a pooled connection, inside a transaction
+    with ``statement_timeout`` set when configured. With ``row_limit`` set, row
+    queries are only fetched up to ``row_limit`` rows (read-only ones through a
+    server-side cursor); the result frame then has ``attrs["truncated"] = True``.
+    Statements other than read-only queries are committed, and those without a
+    result report ``rows_affected`` like ``PostgresRunner``.
+    """
+
+    def __init__(
+        self,
+        connection_string: str,
+        min_size: int = 1,
+        max_size: int = 10,
+        pool_timeout: Optional[float] = 30,
+        statement_timeout: Optional[float] = None,
+        row_limit: Optional[int] = None,
+    ) -> None:
+        self.connection_string = connection_string
+        self.min_size = min_size
+        self.max_size = max_size
+        self.pool_timeout = pool_timeout
+        self.statement_timeout = statement_timeout
+        self.row_limit = row_limit
+        self._pool: Optional[psycopg2.pool.ThreadedConnectionPool] = None
+        self._pool_lock = threading.Lock()
+        # ThreadedConnectionPool raises instead of waiting when exhausted; callers
+        # wait on this semaphore for a free connection instead.
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._stats_lock = threading.Lock()
+        self._in_use = 0
+        self._stats: Dict[str, Any] = {
+            "queries": 0,
+            "errors": 0,
+            "statement_timeouts": 0,
+            "pool_timeouts": 0,
+            "truncated": 0,
+            "pool_wait_total": 0.0,
+            "pool_wait_max": 0.0,
+            "query_seconds_total": 0.0,
+            "query_seconds_max": 0.0,
+        }
+
+    def _create_pool(self) -> psycopg2.pool.ThreadedConnectionPool:
+        return psycopg2.pool.ThreadedConnectionPool(
+            self.min_size, self.max_size, dsn=self.connection_string
+        )
+
+    def open(self) -> None:
+        """Create the pool and its ``min_size`` connections if not done yet."""
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = self._create_pool()
+
+    def close(self) -> None:
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.closeall()
+                self._pool = None
+
+    def ping(self) -> None:
+        """Run ``SELECT 1`` on a pooled connection, opening the pool first."""
+        self._execute("SELECT 1")
+
+    async def run_sql(self, args: RunSqlToolArgs, context: "ToolContext") -> pd.DataFrame:
+        return await asyncio.to_thread(self._execute, args.sql)
+
+    def _execute(self, sql: str) -> pd.DataFrame:
+        self.open()
+        assert self._pool is not None
+        pool = self._pool
+
+        wait_started = time.perf_counter()
+        if not self._slots.acquire(timeout=self.pool_timeout):
+            self._record(pool_timeouts=1)
+            raise PoolTimeoutError(f"no database connection available within {self.pool_timeout}s")
+        waited = time.perf_counter() - wait_started
+        with self._stats_lock:
+            self._in_use += 1
+
+        started = time.perf_counter()
+        conn = None
+        broken = False
+        try:
+            conn = pool.getconn()
+            return self._run(conn, sql)
+        except psycopg2.Error as exc:
+            self._record(errors=1, statement_timeouts=int(isinstance(exc, psycopg2.errors.QueryCanceled)))
+            broken = conn is not None and bool(conn.closed)
+            raise
+        finally:
+            if conn is not None:
+                if not broken:
+                    try:
+                        conn.rollback()
+                    except psycopg2.Error:
+                        broken = True
+                pool.putconn(conn, close=broken)
+            with self._stats_lock:
+                self._in_use -= 1
+            self._slots.release()
+            self._record_timing(waited, time.perf_counter() - started)
+
+    def _run(self, conn: Any, sql: str) -> pd.DataFrame:
+        with conn.cursor() as cursor:
+            if self.statement_timeout:
+                cursor.execute("SET LOCAL statement_timeout = %s", (int(self.statement_timeout * 1000),))
+
+        read_only = is_read_only_query(sql)
+        server_side = bool(self.row_limit) and read_only
+        if server_side:
+            # Server-side cursor: rows past the limit are never sent to the client.
+            cursor = conn.cursor(name="vanna_run_sql", cursor_factory=psycopg2.extras.RealDictCursor)
+        else:
+            cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+        try:
+            cursor.execute(sql)
+            # A named cursor has no description until the first fetch.
+            if not server_side and cursor.description is None:
+                conn.commit()
+                return pd.DataFrame({"rows_affected": [cursor.rowcount]})
+
+            truncated = False
+            if self.row_limit:
+                rows: List[Any] = cursor.fetchmany(self.row_limit + 1)
+                if len(rows) > self.row_limit:
+                    rows = rows[: self.row_limit]
+                    truncated = True
+            else:
+                rows = cursor.fetchall()
+            if not read_only:
+                # e.g. ``DELETE ... RETURNING`` or a data-modifying CTE
+                conn.commit()
+        finally:
+            cursor.close()
+
+        frame = pd.DataFrame([dict(row) for row in rows]) if rows else pd.DataFrame()
+        if truncated:
+            self._record(truncated=1)
+            frame.attrs["truncated"] = True
+            frame.attrs["row_limit"] = self.row_limit
+            logger.warning("SQL result truncated to %d rows", self.row_limit)
+        return frame
+
+    def _record(self, **counters: int) -> None:
+        with self._stats_lock:
+            for name, value in counters.items():
+                self._stats[name] += value
+
+    def _record_timing(self, waited: float, elapsed: float) -> None:
+        with self._stats_lock:
+            self._stats["queries"] += 1
+            self._stats["pool_wait_total"] += waited
+            self._stats["pool_wait_max"] = max(self._stats["pool_wait_max"], waited)
+            self._stats["query_seconds_total"] += elapsed
+            self._stats["query_seconds_max"] = max(self._stats["query_seconds_max"], elapsed)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            queries = self._stats["queries"]
+            return {
+                **self._stats,
+                "in_use": self._in_use,
+                "pool_min_size": self.min_size,
+                "pool_max_size": self.max_size,
+                "pool_wait_avg": self._stats["pool_wait_total"] / queries if queries else 0.0,
+                "query_seconds_avg": self._stats["query_seconds_total"] / queries if queries else 0.0,
+            }
+
+
+def normalize_sql(sql: str) -> str:
+    """Normalize SQL text for cache keys: collapse whitespace, lower-case outside quotes."""
+
+    parts = _QUOTED.split(sql.strip().rstrip(";").strip())
+    normalized = []
+    for index, part in enumerate(parts):
+        # re.split with one capture group alternates unquoted / quoted parts.
+        normalized.append(part if index % 2 else _WHITESPACE.sub(" ", part).lower())
+    return "".join(normalized)
+
+
+def _frame_size(frame: pd.DataFrame) -> int:
+    return int(frame.memory_usage(index=True, deep=True).sum())
+
+
+class _RecordingSqlRunner(SqlRunner):
+    def __init__(self, runner: SqlRunner) -> None:
+        self.runner = runner
+        self.frame: Optional[pd.DataFrame] = None
+
+    async def run_sql(self, args: RunSqlToolArgs, context: "ToolContext") -> pd.DataFrame:
+        self.frame = await self.runner.run_sql(args, context)
+        return self.frame
+
+
+class RowLimitedRunSqlTool(RunSqlTool):
+    """``RunSqlTool`` that tells the LLM when the runner cut a result at its row limit.
+
+    The result text gets a note and the metadata ``truncated``/``row_limit`` keys,
+    so partial results are not reported as the full row count.
+    """
+
+    async def execute(self, context: "ToolContext", args: RunSqlToolArgs) -> "ToolResult":
+        # Record the frame on a per-call copy; the tool is shared by concurrent requests.
+        recorder = _RecordingSqlRunner(self.sql_runner)
+        tool = copy.copy(self)
+        tool.sql_runner = recorder
+        result = await RunSqlTool.execute(tool, context, args)
+        frame = recorder.frame
+        if result.success and frame is not None and frame.attrs.get("truncated"):
+            row_limit = frame.attrs.get("row_limit", len(frame))
+            result.result_for_llm += (
+                f"\n\nNOTE: the result was truncated to the first {row_limit} rows; the query "
+                "matches more rows. Aggregate or filter in SQL instead of relying on these rows "
+                "as complete."
+            )
+            result.metadata["truncated"] = True
+            result.metadata["row_limit"] = row_limit
+        return result
+
+
+class CachingSqlRunner(SqlRunner):
+    """Serve repeated row queries from a TTL cache in front of another runner.
+
+    Only :func:`is_cacheable_query` statements are cached. Keys are
+    :func:`normalize_sql` of the query text, so formatting and keyword case
+    differences share an entry; concurrent identical queries run once. Volatile
+    queries are passed through, and statements that may write also clear the cache.
+    """
+
+    def __init__(
+        self,
+        runner: PooledPostgresRunner,
+        ttl: Optional[float] = 300,
+        max_entries: int = 256,
+        max_bytes: Optional[int] = None,
+    ) -> None:
+        self.runner = runner
+        self.cache = TTLCache(max_entries=max_entries, ttl=ttl, max_bytes=max_bytes, sizeof=_frame_size)
+        self._flight = SingleFlight()
+
+    def ping(self) -> None:
+        self.runner.ping()
+
+    def close(self) -> None:
+        self.runner.close()
+
+    async def run_sql(self, args: RunSqlToolArgs, context: "ToolContext") -> pd.DataFrame:
+        if not is_cacheable_query(args.sql):
+            frame = await self.runner.run_sql(args, context)
+            if not is_read_only_query(args.sql):
+                self.cache.clear()
+            return frame
+
+        key = normalize_sql(args.sql)
+        cached = self.cache.get(key)
+        if cached is None:
+
+            async def _run() -> pd.DataFrame:
+                frame = await self.runner.run_sql(args, context)
+                self.cache.set(key, frame)
+                return frame
+
+            cached = await self._flight.do(key, _run)
+        # Callers may mutate the frame; hand out copies.
+        return cached.copy()
+
+    def invalidate(self, contains: Optional[str] = None) -> int:
+        """Drop cached results whose normalized SQL contains ``contains`` (all if empty)."""
+        if not contains:
+            removed = len(self.cache)
+            self.cache.clear()
+            return removed
+        needle = contains.lower()
+        return self.cache.invalidate_where(lambda key, value: needle in key)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.runner.stats(), "cache": self.cache.stats(), "single_flight": self._flight.stats()}
@@ -0,0 +1,115 @@
+import asyncio
+from typing import AsyncIterator
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import patch
+
+from data_analyst_mcp import admission, config
+from data_analyst_mcp.admission import (
+    AdmissionController,
+    AdmissionRejected,
+    admission_controlled,
+    parse_tool_limits,
+)
+
+
+class TestAdmissionController(IsolatedAsyncioTestCase):
+    async def test_excess_calls_queue_then_reject(self) -> None:
+        controller = AdmissionController("tool", max_concurrency=1, max_queue=1)
+        release = asyncio.Event()
+
+        async def call() -> None:
+            async with controller.slot():
+                await release.wait()
+
+        first = asyncio.create_task(call())
+        second = asyncio.create_task(call())
+        await asyncio.sleep(0)
+        self.assertEqual(controller.stats()["in_flight"], 1)
+        self.assertEqual(controller.stats()["queued"], 1)
+
+        with self.assertRaises(AdmissionRejected):
+            async with controller.slot():
+                pass
+
+        release.set()
+        await asyncio.gather(first, second)
+        stats = controller.stats()
+        self.assertEqual(stats["admitted"], 2)
+        self.assertEqual(stats["rejected"], 1)
+        self.assertEqual(stats["in_flight"], 0)
+        self.assertGreater(stats["queue_wait_max"], 0)
+
+    async def test_queue_timeout(self) -> None:
+        controller = AdmissionController("tool", max_concurrency=1, max_queue=5, queue_timeout=0.01)
+        async with controller.slot():
+            with self.assertRaises(AdmissionRejected):
+                async with controller.slot():
+                    pass
+        self.assertEqual(controller.stats()["timed_out"], 1)
+        self.assertEqual(controller.stats()["queued"], 0)
+
+    async def test_timeout_racing_release_does_not_leak_slot(self) -> None:
+        controller = AdmissionController("tool", max_concurrency=1, max_queue=5, queue_timeout=0.01)
+
+        async def hold() -> None:
+            async with controller.slot():
+                await asyncio.sleep(0.01)
+
+        async def wait() -> None:
+            try:
+                async with controller.slot():
+                    pass
+            except AdmissionRejected:
+                pass
+
+        for _ in range(20):
+            await asyncio.gather(hold(), wait())
+
+        self.assertEqual(controller.stats()["in_flight"], 0)
+        self.assertFalse(controller._semaphore.locked())
+
+    async def test_unlimited_only_counts(self) -> None:
+        controller = AdmissionController("tool")
+        async with controller.slot():
+            async with controller.slot():
+                self.assertEqual(controller.stats()["in_flight"], 2)
+        self.assertEqual(controller.stats()["admitted"], 2)
+
+
+class TestAdmissionControlled(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        admission._controllers.clear()
+
+    def tearDown(self) -> None:
+        admission._controllers.clear()
+
+    async def test_decorates_coroutines_and_generators(self) -> None:
+        @admission_controlled("once")
+        async def once(value: int) -> int:
+            return value * 2
+
+        @admission_controlled("stream")
+        async def stream(count: int) -> AsyncIterator[int]:
+            for i in range(count):
+                self.assertEqual(admission.get_controller("stream").in_flight, 1)
+                yield i
+
+        with patch.object(config, "TOOL_CONCURRENCY_LIMITS", "once=2:0"):
+            self.assertEqual(await once(3), 6)
+            self.assertEqual([item async for item in stream(3)], [0, 1, 2])
+
+        stats = admission.admission_stats()
+        self.assertEqual(stats["once"]["max_concurrency"], 2)
+        self.assertEqual(stats["once"]["max_queue"], 0)
+        self.assertEqual(stats["stream"]["admitted"], 1)
+        self.assertEqual(stats["stream"]["in_flight"], 0)
+
+
+class TestParseToolLimits(TestCase):
+    def test_parse(self) -> None:
+        self.assertEqual(
+            parse_tool_limits("vanna_chat_once=4:8, ragflow_retrieval=16"),
+            {"vanna_chat_once": (4, 8), "ragflow_retrieval": (16, None)},
+        )
+        with self.assertRaises(ValueError):
+            parse_tool_limits("vanna_chat_once")
@@ -0,0 +1,163 @@
+import asyncio
+import os
+import tempfile
+import time
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import patch
+
+from data_analyst_mcp.cache import AsyncOnce, SingleFlight, TTLCache, stable_hash
+
+
+class TestTTLCache(TestCase):
+    def test_stable_hash_ignores_key_order(self) -> None:
+        self.assertEqual(stable_hash({"a": 1, "b": [1, 2]}), stable_hash({"b": [1, 2], "a": 1}))
+        self.assertNotEqual(stable_hash({"a": 1}), stable_hash({"a": 2}))
+
+    def test_evicts_least_recently_used(self) -> None:
+        cache = TTLCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_expires_after_ttl(self) -> None:
+        cache = TTLCache(ttl=10)
+        with patch("data_analyst_mcp.cache.time.monotonic", return_value=100.0):
+            cache.set("a", 1)
+        with patch("data_analyst_mcp.cache.time.monotonic", return_value=111.0):
+            self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.stats()["expirations"], 1)
+
+    def test_byte_budget_evicts_oldest(self) -> None:
+        cache = TTLCache(max_bytes=20, sizeof=lambda value: len(value))
+        cache.set("a", "x" * 10)
+        cache.set("b", "y" * 10)
+        cache.set("c", "z" * 10)
+
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.stats()["bytes"], 20)
+
+    def test_disk_tier_survives_new_instance(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            TTLCache(ttl=60, disk_dir=tmp).set("key", {"url": "https://example.com/a.csv"})
+            cache = TTLCache(ttl=60, disk_dir=tmp)
+
+            self.assertEqual(cache.get("key"), {"url": "https://example.com/a.csv"})
+            self.assertEqual(cache.stats()["disk_hits"], 1)
+
+    def test_disk_hit_keeps_remaining_ttl(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            with patch("data_analyst_mcp.cache.time.time", return_value=time.time()):
+                TTLCache(ttl=60, disk_dir=tmp).set("key", 1)
+            cache = TTLCache(ttl=60, disk_dir=tmp)
+            with patch("data_analyst_mcp.cache.time.time", return_value=time.time() + 50), patch(
+                "data_analyst_mcp.cache.time.monotonic", return_value=500.0
+            ):
+                self.assertEqual(cache.get("key"), 1)
+
+            self.assertAlmostEqual(cache._entries["key"].expires_at, 510.0, delta=1)
+
+    def test_disk_tier_is_bounded_and_swept(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = TTLCache(max_entries=8, ttl=60, disk_dir=tmp)
+            for index in range(20):
+                cache.set(f"k{index}", index)
+                # Sweeps run in the background; wait so each one sees the writes so far.
+                cache._sweeper.join()
+
+            self.assertLessEqual(len(os.listdir(tmp)), 9)
+            self.assertGreater(cache.stats()["disk_evictions"], 0)
+            with patch("data_analyst_mcp.cache.time.time", return_value=time.time() + 120):
+                cache.sweep_disk()
+            self.assertEqual(os.listdir(tmp), [])
+
+    def test_async_access_uses_the_disk_tier(self) -> None:
+        async def scenario(tmp: str) -> None:
+            await TTLCache(ttl=60, disk_dir=tmp).aset("key", {"url": "https://example.com/a.csv"})
+            cache = TTLCache(ttl=60, disk_dir=tmp)
+            self.assertEqual(await cache.aget("key"), {"url": "https://example.com/a.csv"})
+            self.assertIsNone(await cache.aget("missing"))
+            self.assertEqual(cache.stats()["disk_hits"], 1)
+            self.assertEqual(cache.stats()["misses"], 1)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            asyncio.run(scenario(tmp))
+
+    def test_invalidate_where_applies_to_disk(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            TTLCache(ttl=60, disk_dir=tmp).set("orders", {"table": "orders"})
+            cache = TTLCache(ttl=60, disk_dir=tmp)
+            cache.set("users", {"table": "users"})
+
+            removed = cache.invalidate_where(lambda key, value: value["table"] == "orders")
+
+            self.assertEqual(removed, 1)
+            self.assertIsNone(cache.get("orders"))
+            self.assertEqual(cache.get("users"), {"table": "users"})
+
+
+class TestSingleFlight(IsolatedAsyncioTestCase):
+    async def test_cancelled_leader_does_not_cancel_followers(self) -> None:
+        flight = SingleFlight()
+        release = asyncio.Event()
+        calls = 0
+
+        async def fetch() -> str:
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return "value"
+
+        leader = asyncio.create_task(flight.do("key", fetch))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.do("key", fetch))
+        await asyncio.sleep(0)
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        self.assertEqual(await follower, "value")
+        self.assertTrue(leader.cancelled())
+        self.assertEqual(calls, 1)
+        self.assertEqual(flight.stats()["in_flight"], 0)
+
+    async def test_exception_reaches_every_caller(self) -> None:
+        flight = SingleFlight()
+
+        async def fail() -> None:
+            await asyncio.sleep(0)
+            raise RuntimeError("boom")
+
+        results = await asyncio.gather(
+            flight.do("key", fail), flight.do("key", fail), return_exceptions=True
+        )
+
+        self.assertTrue(all(isinstance(result, RuntimeError) for result in results))
+        self.assertEqual(flight.stats(), {"calls": 1, "coalesced": 1, "in_flight": 0})
+
+
+class TestAsyncOnce(IsolatedAsyncioTestCase):
+    async def test_cancelled_first_caller_does_not_fail_waiters(self) -> None:
+        once: AsyncOnce[str] = AsyncOnce()
+        release = asyncio.Event()
+
+        async def init() -> str:
+            await release.wait()
+            return "agent"
+
+        first = asyncio.create_task(once.get(init))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(once.get(init))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        self.assertEqual(await second, "agent")
+        self.assertTrue(first.cancelled())
+        self.assertTrue(once.done)
+        self.assertEqual(once.stats()["attempts"], 1)
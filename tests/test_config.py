@@ -0,0 +1,38 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from data_analyst_mcp import config
+
+
+class TestConfig(TestCase):
+    def setUp(self) -> None:
+        config._settings = None
+
+    def tearDown(self) -> None:
+        config._settings = None
+
+    def test_settings_resolved_lazily_and_cached(self) -> None:
+        self.assertIsNone(config._settings)
+        with patch.dict(config.os.environ, {"RAGFLOW_API_PORT": "9000"}):
+            self.assertEqual(config.RAGFLOW_API_PORT, 9000)
+        self.assertIs(config.get_settings(), config._settings)
+        self.assertEqual(config.RAGFLOW_API_BASE_URL, f"http://{config.RAGFLOW_API_HOST}:9000")
+
+    def test_lazy_settings_ignore_host_argv(self) -> None:
+        with patch("sys.argv", ["host-app", "--port", "9000", "--workers", "8"]):
+            settings = config.get_settings()
+        self.assertNotEqual(settings.RAGFLOW_API_PORT, 9000)
+        self.assertNotEqual(settings.VANNA_MCP_WORKERS, 8)
+
+    def test_configure_parses_argv_strictly(self) -> None:
+        settings = config.configure(["--base-url", "http://ragflow:80", "--no-http2"])
+        self.assertEqual(config.RAGFLOW_API_BASE_URL, "http://ragflow:80")
+        self.assertFalse(settings.HTTP2)
+        with self.assertRaises(SystemExit), patch("sys.stderr"):
+            config.configure(["--unknown"])
+
+    def test_unknown_attribute_raises(self) -> None:
+        with self.assertRaises(AttributeError):
+            config.NOT_A_SETTING
+        with self.assertRaises(AttributeError):
+            config.lowercase_name
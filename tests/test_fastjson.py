@@ -0,0 +1,120 @@
+import json
+from datetime import datetime, timezone
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import patch
+
+from pydantic import BaseModel
+
+from data_analyst_mcp import config, fastjson
+from data_analyst_mcp.fastjson_mcp import FastJSONMCP, tool_result_content
+
+
+class _Row(BaseModel):
+    name: str
+    at: datetime
+
+
+PAYLOAD = {
+    "text": "销售额",
+    "rows": [_Row(name="a", at=datetime(2024, 1, 2, tzinfo=timezone.utc))],
+    "tags": {"x"},
+    1: "int key",
+}
+
+
+class _BackendMixin:
+    backend = "auto"
+
+    def setUp(self) -> None:
+        self._patches = [
+            patch.object(config, "JSON_BACKEND", self.backend),
+            patch.object(fastjson, "_backend", None),
+        ]
+        for p in self._patches:
+            p.start()
+
+    def tearDown(self) -> None:
+        for p in reversed(self._patches):
+            p.stop()
+
+
+class TestFastJsonStdlib(_BackendMixin, TestCase):
+    backend = "stdlib"
+
+    def test_round_trip(self) -> None:
+        self.assertEqual(fastjson.backend_name(), "stdlib")
+        encoded = fastjson.dumps(PAYLOAD)
+        self.assertIn("销售额", encoded)
+        self.assertEqual(
+            fastjson.loads(encoded),
+            {
+                "text": "销售额",
+                "rows": [{"name": "a", "at": "2024-01-02T00:00:00Z"}],
+                "tags": ["x"],
+                "1": "int key",
+            },
+        )
+
+    def test_sorted_keys_are_stable(self) -> None:
+        self.assertEqual(fastjson.dumps({"b": 1, "a": 2}, sort_keys=True), '{"a":2,"b":1}')
+
+
+class TestFastJsonOrjson(TestFastJsonStdlib):
+    backend = "auto"
+
+    def test_round_trip(self) -> None:
+        if fastjson.orjson is None:
+            self.skipTest("orjson not installed")
+        self.assertEqual(fastjson.backend_name(), "orjson")
+        with patch.object(config, "JSON_BACKEND", "stdlib"), patch.object(fastjson, "_backend", None):
+            expected = fastjson.loads(fastjson.dumps(PAYLOAD))
+        self.assertEqual(fastjson.loads(fastjson.dumps(PAYLOAD)), expected)
+
+    def test_huge_integers_fall_back_to_stdlib(self) -> None:
+        self.assertEqual(fastjson.loads(fastjson.dumps({"n": 2**70})), {"n": 2**70})
+
+
+class TestFastJsonBackendChoice(TestCase):
+    def test_invalid_backend(self) -> None:
+        with patch.object(config, "JSON_BACKEND", "simdjson"), patch.object(fastjson, "_backend", None):
+            with self.assertRaises(ValueError):
+                fastjson.loads("{}")
+
+    def test_missing_orjson_uses_stdlib(self) -> None:
+        with patch.object(config, "JSON_BACKEND", "orjson"), patch.object(
+            fastjson, "_backend", None
+        ), patch.object(fastjson, "orjson", None):
+            self.assertEqual(fastjson.backend_name(), "stdlib")
+
+
+class TestToolResults(IsolatedAsyncioTestCase):
+    def test_dict_results_are_encoded_once(self) -> None:
+        content = tool_result_content({"status": "success", "response": {"text": "销售额"}})
+        self.assertEqual(len(content), 1)
+        self.assertEqual(json.loads(content[0].text), {"status": "success", "response": {"text": "销售额"}})
+
+    def test_other_results_keep_fastmcp_handling(self) -> None:
+        self.assertEqual(tool_result_content("plain")[0].text, "plain")
+        self.assertEqual(tool_result_content(None), [])
+
+    async def test_call_tool(self) -> None:
+        server = FastJSONMCP("test")
+
+        @server.tool()
+        async def echo(value: str) -> dict:
+            return {"value": value}
+
+        content = await server.call_tool("echo", {"value": "x"})
+        self.assertEqual(json.loads(content[0].text), {"value": "x"})
+
+
+    async def test_call_tool_falls_back_without_fastmcp_internals(self) -> None:
+        server = FastJSONMCP("test")
+
+        @server.tool()
+        async def echo(value: str) -> dict:
+            return {"value": value}
+
+        with patch("data_analyst_mcp.fastjson_mcp._convert_to_content", None):
+            content = await server.call_tool("echo", {"value": "x"})
+        self.assertEqual(json.loads(content[0].text), {"value": "x"})
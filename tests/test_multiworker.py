@@ -0,0 +1,86 @@
+import json
+import multiprocessing
+from unittest import IsolatedAsyncioTestCase, TestCase
+
+import httpx
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+
+from data_analyst_mcp.multiworker import (
+    FORWARDED_HEADER,
+    SessionForwarder,
+    resolve_worker_count,
+    run_workers,
+)
+
+
+async def _local_app(scope, receive, send):
+    message = await receive()
+    body = json.loads(message["body"])
+    status = 202 if body.get("session") == "local" else 404
+    await JSONResponse({"handled": "local"}, status_code=status)(scope, receive, send)
+
+
+class TestSessionForwarder(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.forwarded = []
+
+        def peer(request: httpx.Request) -> httpx.Response:
+            self.forwarded.append(request)
+            if request.url.port == 9002:
+                return httpx.Response(202, json={"handled": "peer"})
+            return httpx.Response(404, json={"error": "Could not find session"})
+
+        self.peer_client = httpx.AsyncClient(transport=httpx.MockTransport(peer))
+        app = SessionForwarder(_local_app, lambda: [9001, 9002], client=self.peer_client)
+        self.client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+    async def asyncTearDown(self) -> None:
+        await self.client.aclose()
+        await self.peer_client.aclose()
+
+    async def test_local_session_is_not_forwarded(self) -> None:
+        response = await self.client.post("/messages/?session_id=a", json={"session": "local"})
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json(), {"handled": "local"})
+        self.assertEqual(self.forwarded, [])
+
+    async def test_unknown_session_is_forwarded_to_owner(self) -> None:
+        response = await self.client.post("/messages/?session_id=b", json={"session": "remote"})
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json(), {"handled": "peer"})
+        self.assertEqual([r.url.port for r in self.forwarded], [9001, 9002])
+        request = self.forwarded[-1]
+        self.assertEqual(str(request.url), "http://127.0.0.1:9002/messages/?session_id=b")
+        self.assertEqual(request.headers[FORWARDED_HEADER], "1")
+        self.assertEqual(json.loads(request.content), {"session": "remote"})
+
+    async def test_forwarded_requests_are_handled_locally_only(self) -> None:
+        response = await self.client.post(
+            "/messages/?session_id=c", json={"session": "remote"}, headers={FORWARDED_HEADER: "1"}
+        )
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(self.forwarded, [])
+
+    def test_resolve_worker_count(self) -> None:
+        self.assertEqual(resolve_worker_count(3), 3)
+        self.assertGreaterEqual(resolve_worker_count(0), 1)
+
+
+class TestRunWorkers(TestCase):
+    def test_parent_exits_when_a_worker_dies(self) -> None:
+        started = multiprocessing.get_context("fork").Value("i", 0)
+
+        def app_factory(peer_ports):
+            with started.get_lock():
+                started.value += 1
+                first = started.value == 1
+            if not first:
+                raise RuntimeError("worker failed to start")
+            return Starlette()
+
+        with self.assertRaises(SystemExit) as raised:
+            run_workers(app_factory, host="127.0.0.1", port=0, workers=2, log_level="error")
+
+        self.assertEqual(raised.exception.code, 1)
+        self.assertEqual(started.value, 2)
@@ -0,0 +1,65 @@
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import patch
+
+import httpx
+
+from data_analyst_mcp.client.ragflow_server_api_client.api.retrieval import retrieval_retrieval_post
+from data_analyst_mcp.client.ragflow_server_api_client.client import AuthenticatedClient
+from data_analyst_mcp.client.ragflow_server_api_client.models import (
+    RagflowRetrievalResponse,
+    RagflowRetrievalResponseLite,
+)
+from data_analyst_mcp.client.ragflow_server_api_client.ragflow_client import ragflow_retrieve_chunks
+from data_analyst_mcp.retrieval_cache import RetrievalCache
+
+BODY = (
+    b'{"code":0,"data":{"chunks":[{"content":"c","similarity":0.5,"id":"ch-1",'
+    b'"content_ltks":"c ltks","positions":[[1,2,3,4,5]],"kb_id":"kb"}],'
+    b'"doc_aggs":[{"doc_id":"d","doc_name":"D","count":1}],"total":1}}'
+)
+
+
+def _client() -> AuthenticatedClient:
+    return AuthenticatedClient(base_url="http://ragflow", token="t")
+
+
+class TestRetrievalParsing(TestCase):
+    def test_parses_full_response_from_raw_body(self) -> None:
+        parsed = retrieval_retrieval_post._parse_response(
+            client=_client(), response=httpx.Response(200, content=BODY.replace(b"[[1,2,3,4,5]]", b'["1"]'))
+        )
+        self.assertIsInstance(parsed, RagflowRetrievalResponse)
+        self.assertEqual(parsed.data.chunks[0].content_ltks, "c ltks")
+
+    def test_lite_model_skips_unused_fields(self) -> None:
+        parsed = retrieval_retrieval_post._parse_response(
+            client=_client(),
+            response=httpx.Response(200, content=BODY),
+            response_model=RagflowRetrievalResponseLite,
+        )
+        chunk = parsed.data.chunks[0]
+        self.assertEqual((chunk.id, chunk.content, chunk.similarity), ("ch-1", "c", 0.5))
+        self.assertFalse(hasattr(chunk, "content_ltks"))
+        self.assertEqual(set(chunk.model_dump()), set(type(chunk).model_fields))
+        self.assertEqual(parsed.data.doc_aggs[0].doc_name, "D")
+
+
+class TestRetrieveChunksCache(IsolatedAsyncioTestCase):
+    async def test_full_callers_do_not_get_lite_cached_responses(self) -> None:
+        cache = RetrievalCache()
+        calls = []
+
+        async def fake_post(*, client, json_body, response_model):
+            calls.append(response_model)
+            return response_model.model_validate_json(BODY.replace(b"[[1,2,3,4,5]]", b'["1"]'))
+
+        with patch.object(retrieval_retrieval_post, "asyncio", fake_post):
+            kwargs = dict(client=_client(), question="q", dataset_ids=["ds"], cache=cache)
+            await ragflow_retrieve_chunks(**kwargs, response_model=RagflowRetrievalResponseLite)
+            await ragflow_retrieve_chunks(**kwargs, response_model=RagflowRetrievalResponseLite)
+            full = await ragflow_retrieve_chunks(**kwargs)
+            lite = await ragflow_retrieve_chunks(**kwargs, response_model=RagflowRetrievalResponseLite)
+
+        self.assertEqual(calls, [RagflowRetrievalResponseLite, RagflowRetrievalResponse])
+        self.assertIsInstance(full, RagflowRetrievalResponse)
+        self.assertIs(lite, full)
@@ -0,0 +1,106 @@
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import patch
+
+import httpx
+
+from data_analyst_mcp.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    call_with_retry,
+    stream_with_retry,
+)
+
+
+def _status_error(status_code: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "https://ragflow.example.com/api/v1/retrieval")
+    return httpx.HTTPStatusError(
+        "upstream error", request=request, response=httpx.Response(status_code, request=request)
+    )
+
+
+@patch("data_analyst_mcp.resilience.backoff_delay", return_value=0)
+class TestResilience(IsolatedAsyncioTestCase):
+    async def test_transient_failure_is_retried(self, _delay) -> None:
+        calls = 0
+
+        async def flaky():
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                raise _status_error(502)
+            return "ok"
+
+        breaker = CircuitBreaker("ragflow")
+        self.assertEqual(await call_with_retry(flaky, breaker, retries=2), "ok")
+        self.assertEqual(calls, 2)
+        self.assertEqual(breaker.state, "closed")
+
+    async def test_client_error_is_not_retried(self, _delay) -> None:
+        calls = 0
+
+        async def bad_request():
+            nonlocal calls
+            calls += 1
+            raise _status_error(400)
+
+        breaker = CircuitBreaker("ragflow")
+        with self.assertRaises(httpx.HTTPStatusError):
+            await call_with_retry(bad_request, breaker, retries=2)
+        self.assertEqual(calls, 1)
+        self.assertEqual(breaker.stats()["failures"], 0)
+
+    async def test_breaker_opens_then_half_open_probe_closes_it(self, _delay) -> None:
+        async def down():
+            raise httpx.ConnectError("refused")
+
+        async def up():
+            return "ok"
+
+        breaker = CircuitBreaker("vanna", failure_threshold=2, reset_timeout=30)
+        with patch("data_analyst_mcp.resilience.time.monotonic", return_value=100.0):
+            with self.assertRaises(httpx.ConnectError):
+                await call_with_retry(down, breaker, retries=1)
+            self.assertEqual(breaker.state, "open")
+            with self.assertRaises(CircuitOpenError):
+                await call_with_retry(up, breaker)
+
+        with patch("data_analyst_mcp.resilience.time.monotonic", return_value=131.0):
+            self.assertEqual(await call_with_retry(up, breaker), "ok")
+        self.assertEqual(breaker.state, "closed")
+        self.assertEqual(breaker.stats()["rejected"], 1)
+
+    async def test_stream_is_not_replayed_after_first_item(self, _delay) -> None:
+        opened = 0
+
+        async def stream():
+            nonlocal opened
+            opened += 1
+            yield {"type": "text", "text": "partial"}
+            raise httpx.ReadError("connection reset")
+
+        breaker = CircuitBreaker("vanna")
+        received = []
+        with self.assertRaises(httpx.ReadError):
+            async for event in stream_with_retry(stream, breaker, retries=3):
+                received.append(event)
+
+        self.assertEqual(opened, 1)
+        self.assertEqual(received, [{"type": "text", "text": "partial"}])
+
+    async def test_stream_retries_only_unsent_requests(self, _delay) -> None:
+        failures = [httpx.ConnectError("refused"), httpx.ReadTimeout("no answer")]
+        opened = 0
+
+        async def stream():
+            nonlocal opened
+            opened += 1
+            raise failures.pop(0)
+            yield {}
+
+        breaker = CircuitBreaker("vanna")
+        with self.assertRaises(httpx.ReadTimeout):
+            async for _event in stream_with_retry(stream, breaker, retries=3):
+                pass
+
+        self.assertEqual(opened, 2)
+        self.assertEqual(breaker.stats()["consecutive_failures"], 2)
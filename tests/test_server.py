@@ -0,0 +1,288 @@
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+
+from data_analyst_mcp import resilience, retrieval_cache, server
+from data_analyst_mcp.client.vanna_server_api_client.api.chat.chat_sse_post import chat_sse_stream
+from data_analyst_mcp.client.vanna_server_api_client.vanna_client import build_vanna_client
+from data_analyst_mcp.client.ragflow_server_api_client.api.retrieval import retrieval_retrieval_post
+from data_analyst_mcp.client.ragflow_server_api_client.models import RagflowRetrievalResponse
+
+
+def _fake_ctx() -> MagicMock:
+    ctx = MagicMock()
+    ctx.request_context.lifespan_context = SimpleNamespace(
+        ragflow_client=MagicMock(), vanna_client=MagicMock()
+    )
+    ctx.report_progress = AsyncMock()
+    ctx.log = AsyncMock()
+    return ctx
+
+
+class TestVannaChatSseStream(IsolatedAsyncioTestCase):
+    async def test_events_are_forwarded_before_aggregation(self) -> None:
+        events = [
+            {"type": "text", "text": "Hello ", "conversation_id": "conv-1"},
+            {"type": "sql", "query": "SELECT 1"},
+            {"type": "end", "conversation_id": "conv-1"},
+        ]
+
+        async def fake_stream(**kwargs):
+            for event in events:
+                yield event
+
+        ctx = _fake_ctx()
+        with patch.object(server, "chat_sse_stream", fake_stream):
+            result = await server.vanna_chat_sse_stream(
+                ctx,
+                message="hi",
+                user_email=None,
+                conversation_id=None,
+                agent_id=None,
+                acceptable_responses=None,
+                raw_events=None,
+                raw_event_types=None,
+                raw_events_max_bytes=None,
+            )
+
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(result["response"]["sql"], ["SELECT 1"])
+        self.assertEqual(ctx.report_progress.await_count, 3)
+        forwarded = [json.loads(call.args[1]) for call in ctx.log.await_args_list]
+        self.assertEqual(forwarded, events)
+
+    async def test_progress_needs_a_progress_token(self) -> None:
+        async def fake_stream(**kwargs):
+            yield {"type": "text", "text": "Hello", "conversation_id": "conv-1"}
+
+        ctx = _fake_ctx()
+        ctx.request_context.meta = None
+        with patch.object(server, "chat_sse_stream", fake_stream):
+            result = await server.vanna_chat_sse_stream(
+                ctx,
+                message="hi",
+                user_email=None,
+                conversation_id=None,
+                agent_id=None,
+                acceptable_responses=None,
+                raw_events=None,
+                raw_event_types=None,
+                raw_events_max_bytes=None,
+            )
+
+        self.assertEqual(result["status"], "success")
+        ctx.report_progress.assert_not_awaited()
+        self.assertEqual(ctx.log.await_count, 1)
+
+
+class TestChatSseTimeout(IsolatedAsyncioTestCase):
+    async def test_stream_keeps_client_timeouts_except_read(self) -> None:
+        timeouts = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            timeouts.append(request.extensions["timeout"])
+            return httpx.Response(200, text='data: {"type": "end"}\n\n')
+
+        client = build_vanna_client(
+            base_url="http://vanna.test",
+            api_key="key",
+            timeout=httpx.Timeout(connect=5, read=60, write=30, pool=10),
+            httpx_args={"transport": httpx.MockTransport(handler)},
+        )
+        events = [event async for event in chat_sse_stream(client, message="hi")]
+        await client.get_async_httpx_client().aclose()
+
+        self.assertEqual(events, [{"type": "end"}])
+        self.assertEqual(timeouts, [{"connect": 5, "read": None, "write": 30, "pool": 10}])
+
+
+def _retrieval_response(content: str) -> RagflowRetrievalResponse:
+    return RagflowRetrievalResponse.model_validate(
+        {
+            "code": 0,
+            "data": {
+                "total": 1,
+                "chunks": [{"content": content, "document_id": "doc-1", "similarity": 0.9}],
+                "doc_aggs": [{"doc_id": "doc-1", "doc_name": "Doc", "count": 1}],
+            },
+        }
+    )
+
+
+class TestRagflowRetrievalCache(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        retrieval_cache._retrieval_cache = None
+
+    async def _retrieve(self, ctx, question: str = "revenue", dataset_ids=("ds-1",), **options):
+        return await server.ragflow_retrieval(
+            ctx,
+            question=question,
+            dataset_ids=list(dataset_ids),
+            document_ids=None,
+            page=1,
+            page_size=30,
+            similarity_threshold=0.2,
+            vector_similarity_weight=0.3,
+            top_k=1024,
+            keyword=False,
+            highlight=False,
+            use_kg=False,
+            use_cache=True,
+            fields=options.get("fields"),
+            include_content=options.get("include_content", True),
+            max_content_chars=options.get("max_content_chars"),
+        )
+
+    async def test_repeated_request_is_served_from_cache(self) -> None:
+        ctx = _fake_ctx()
+        with patch.object(
+            retrieval_retrieval_post, "asyncio", AsyncMock(return_value=_retrieval_response("a"))
+        ) as mock_post:
+            first = await self._retrieve(ctx)
+            second = await self._retrieve(ctx)
+
+        self.assertEqual(mock_post.await_count, 1)
+        self.assertEqual(first, second)
+        stats = retrieval_cache.get_retrieval_cache().stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+
+    async def test_invalidate_by_dataset(self) -> None:
+        ctx = _fake_ctx()
+        with patch.object(
+            retrieval_retrieval_post, "asyncio", AsyncMock(return_value=_retrieval_response("a"))
+        ) as mock_post:
+            await self._retrieve(ctx, dataset_ids=("ds-1",))
+            await self._retrieve(ctx, dataset_ids=("ds-2",))
+            removed = retrieval_cache.get_retrieval_cache().invalidate(dataset_ids=["ds-1"])
+            await self._retrieve(ctx, dataset_ids=("ds-1",))
+            await self._retrieve(ctx, dataset_ids=("ds-2",))
+
+        self.assertEqual(removed, 1)
+        self.assertEqual(mock_post.await_count, 3)
+
+
+class TestRagflowRetrievalCacheBypassesBreaker(IsolatedAsyncioTestCase):
+    setUp = TestRagflowRetrievalCache.setUp
+    _retrieve = TestRagflowRetrievalCache._retrieve
+
+    def tearDown(self) -> None:
+        resilience._breakers.pop("ragflow", None)
+
+    async def test_open_breaker_still_serves_cached_results(self) -> None:
+        ctx = _fake_ctx()
+        with patch.object(
+            retrieval_retrieval_post, "asyncio", AsyncMock(return_value=_retrieval_response("a"))
+        ):
+            await self._retrieve(ctx)
+            breaker = resilience.get_breaker("ragflow")
+            successes = breaker.stats()["successes"]
+            breaker.state = resilience.OPEN
+            breaker._opened_at = float("inf")
+
+            cached = await self._retrieve(ctx)
+            uncached = await self._retrieve(ctx, question="other")
+
+        self.assertEqual(cached["status"], "success")
+        self.assertEqual(uncached["status"], "error")
+        self.assertEqual(breaker.stats()["successes"], successes)
+        self.assertEqual(breaker.state, resilience.OPEN)
+
+
+class TestRagflowRetrievalProjection(IsolatedAsyncioTestCase):
+    setUp = TestRagflowRetrievalCache.setUp
+    _retrieve = TestRagflowRetrievalCache._retrieve
+
+    async def _project(self, **options):
+        ctx = _fake_ctx()
+        with patch.object(
+            retrieval_retrieval_post, "asyncio", AsyncMock(return_value=_retrieval_response("abcdef"))
+        ):
+            result = await self._retrieve(ctx, **options)
+        return result.get("response", result)
+
+    async def test_default_fields_are_unchanged(self) -> None:
+        result = await self._project()
+
+        self.assertEqual(
+            set(result["chunks"][0]), {"content", "highlight", "document_id", "doc_keyword", "similarity"}
+        )
+
+    async def test_selected_fields_only(self) -> None:
+        result = await self._project(fields=["id", "document_id", "similarity"])
+
+        self.assertEqual(result["chunks"], [{"id": None, "document_id": "doc-1", "similarity": 0.9}])
+        self.assertEqual(result["total"], 1)
+
+    async def test_exclude_content_and_truncate(self) -> None:
+        without = await self._project(include_content=False)
+        truncated = await self._project(max_content_chars=3)
+
+        self.assertNotIn("content", without["chunks"][0])
+        self.assertEqual(truncated["chunks"][0]["content"], "abc")
+        self.assertTrue(truncated["chunks"][0]["content_truncated"])
+
+    async def test_unknown_field_is_an_error(self) -> None:
+        ctx = _fake_ctx()
+        result = await self._retrieve(ctx, fields=["content", "embedding"])
+
+        self.assertEqual(result["status"], "error")
+        self.assertIn("embedding", result["error"])
+
+
+class TestRagflowRetrievalBatch(IsolatedAsyncioTestCase):
+    async def test_fans_out_and_merges_duplicate_chunks(self) -> None:
+        in_flight = 0
+        peak = 0
+
+        async def fake_retrieve(*, client, json_body, response_model=RagflowRetrievalResponse):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            if json_body.question == "broken":
+                raise RuntimeError("upstream 502")
+            return response_model.model_validate(
+                {
+                    "code": 0,
+                    "data": {
+                        "total": 2,
+                        "chunks": [
+                            {"id": "shared", "content": "shared", "similarity": len(json_body.question) / 10},
+                            {"id": json_body.question, "content": json_body.question, "similarity": 0.1},
+                        ],
+                        "doc_aggs": [],
+                    },
+                }
+            )
+
+        with patch.object(retrieval_retrieval_post, "asyncio", fake_retrieve):
+            result = await server.ragflow_retrieval_batch(
+                _fake_ctx(),
+                questions=["q1", "q22", "broken"],
+                dataset_ids=["ds-1"],
+                document_ids=None,
+                page=1,
+                page_size=30,
+                similarity_threshold=0.2,
+                vector_similarity_weight=0.3,
+                top_k=1024,
+                keyword=False,
+                highlight=False,
+                use_kg=False,
+                use_cache=False,
+                max_concurrency=2,
+            )
+
+        response = result["response"]
+        self.assertLessEqual(peak, 2)
+        self.assertEqual([r["question"] for r in response["results"]], ["q1", "q22", "broken"])
+        self.assertEqual(response["results"][2]["error"], "upstream 502")
+        merged = response["merged_chunks"]
+        self.assertEqual([chunk["content"] for chunk in merged], ["shared", "q1", "q22"])
+        self.assertEqual(merged[0]["similarity"], 0.3)
+        self.assertEqual(merged[0]["questions"], ["q1", "q22"])
@@ -0,0 +1,31 @@
+from unittest import TestCase
+
+from data_analyst_mcp.startup_profile import direct_imports, format_report, parse_importtime
+
+IMPORTTIME = """\
+import time: self [us] | cumulative | imported package
+import time:       100 |        100 | encodings
+import time:       300 |        300 |     httpx._models
+import time:      1000 |       1300 |   httpx
+import time:        50 |         50 |   data_analyst_mcp.config
+import time:       200 |       1550 | data_analyst_mcp.server
+"""
+
+
+class TestStartupProfile(TestCase):
+    def test_parse_importtime(self) -> None:
+        timings = parse_importtime(IMPORTTIME)
+        self.assertEqual([t.module for t in timings][-1], "data_analyst_mcp.server")
+        self.assertEqual([t.depth for t in timings], [0, 2, 1, 1, 0])
+        self.assertEqual(timings[2].self_us, 1000)
+        self.assertEqual(timings[2].cumulative_us, 1300)
+
+    def test_direct_imports_and_report(self) -> None:
+        timings = parse_importtime(IMPORTTIME)
+        direct = direct_imports("data_analyst_mcp.server", timings)
+        self.assertEqual({t.module for t in direct}, {"httpx", "data_analyst_mcp.config"})
+
+        report = format_report("data_analyst_mcp.server", 0.5, timings, limit=1)
+        self.assertIn("Import of data_analyst_mcp.server: 2 ms, 5 modules", report)
+        self.assertIn("1.3 ms  httpx", report)
+        self.assertNotIn("data_analyst_mcp.config", report)
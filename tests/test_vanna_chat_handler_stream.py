@@ -0,0 +1,139 @@
+import asyncio
+from types import SimpleNamespace
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import patch
+
+import httpx
+
+from data_analyst_mcp import vanna_rich_chunk_adapter
+from data_analyst_mcp.vanna_chat_handler_stream import chat_stream_from_handler
+
+
+class _FakeChatHandler:
+    def __init__(self, chunks):
+        self._chunks = chunks
+
+    async def handle_stream(self, chat_request):
+        for chunk in self._chunks:
+            yield chunk
+
+
+def _chunk(rich):
+    return SimpleNamespace(
+        conversation_id="conv-1",
+        request_id="req-1",
+        timestamp=1234567890,
+        rich=rich,
+    )
+
+
+class TestChatStreamFromHandler(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        vanna_rich_chunk_adapter._asset_cache = None
+
+    async def test_pipeline_yields_primary_event_before_asset_and_flushes_before_end(self) -> None:
+        render_started = asyncio.Event()
+        release_render = asyncio.Event()
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            render_started.set()
+            await release_render.wait()
+            return httpx.Response(200, json={"asset": {"url": "https://files.example.com/export.csv"}})
+
+        chat_handler = _FakeChatHandler(
+            [
+                _chunk({"id": "df-1", "type": "dataframe", "data": {"title": "Results"}}),
+                _chunk({"id": "txt-1", "type": "text", "data": {"content": "done"}}),
+            ]
+        )
+
+        events = []
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            async for event in chat_stream_from_handler(
+                chat_handler=chat_handler,
+                message="hi",
+                asset_client=client,
+                pipeline_assets=True,
+            ):
+                events.append(event)
+                if event["type"] == "text":
+                    await render_started.wait()
+                    release_render.set()
+
+        self.assertEqual([event["type"] for event in events], ["dataframe", "text", "link", "end"])
+        self.assertEqual(events[2]["url"], "https://files.example.com/export.csv")
+        self.assertEqual(events[2]["conversation_id"], "conv-1")
+
+    async def test_pipeline_yields_asset_while_next_chunk_is_pending(self) -> None:
+        next_chunk_allowed = asyncio.Event()
+
+        class _SlowChatHandler:
+            async def handle_stream(self, chat_request):
+                yield _chunk({"id": "df-1", "type": "dataframe", "data": {"title": "Results"}})
+                await next_chunk_allowed.wait()
+                yield _chunk({"id": "txt-1", "type": "text", "data": {"content": "done"}})
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, json={"asset": {"url": "https://files.example.com/export.csv"}})
+
+        events = []
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            async for event in chat_stream_from_handler(
+                chat_handler=_SlowChatHandler(),
+                message="hi",
+                asset_client=client,
+                pipeline_assets=True,
+            ):
+                events.append(event)
+                if event["type"] == "link":
+                    next_chunk_allowed.set()
+
+        self.assertEqual([event["type"] for event in events], ["dataframe", "link", "text", "end"])
+
+    async def test_pipeline_skips_failed_follow_up(self) -> None:
+        async def failing_follow_up(chunk, client):
+            raise RuntimeError("render failed")
+
+        chat_handler = _FakeChatHandler(
+            [
+                _chunk({"id": "df-1", "type": "dataframe", "data": {"title": "Results"}}),
+                _chunk({"id": "txt-1", "type": "text", "data": {"content": "done"}}),
+            ]
+        )
+        with patch(
+            "data_analyst_mcp.vanna_chat_handler_stream.chunk_asset_follow_up_async",
+            failing_follow_up,
+        ), self.assertLogs("data_analyst_mcp.vanna_chat_handler_stream", "WARNING"):
+            async with httpx.AsyncClient() as client:
+                events = [
+                    event
+                    async for event in chat_stream_from_handler(
+                        chat_handler=chat_handler,
+                        message="hi",
+                        asset_client=client,
+                        pipeline_assets=True,
+                    )
+                ]
+
+        self.assertEqual([event["type"] for event in events], ["dataframe", "text", "end"])
+
+    async def test_without_pipeline_link_follows_dataframe(self) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, json={"asset": {"url": "https://files.example.com/export.csv"}})
+
+        chat_handler = _FakeChatHandler(
+            [
+                _chunk({"id": "df-1", "type": "dataframe", "data": {"title": "Results"}}),
+                _chunk({"id": "txt-1", "type": "text", "data": {"content": "done"}}),
+            ]
+        )
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            events = [
+                event
+                async for event in chat_stream_from_handler(
+                    chat_handler=chat_handler, message="hi", asset_client=client
+                )
+            ]
+
+        self.assertEqual([event["type"] for event in events], ["dataframe", "link", "text", "end"])
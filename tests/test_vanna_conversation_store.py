@@ -0,0 +1,115 @@
+import os
+import tempfile
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import patch
+
+from vanna.core.storage import Conversation, Message
+from vanna.core.user import User
+
+from data_analyst_mcp import vanna_conversation_store
+from data_analyst_mcp.vanna_conversation_store import (
+    BoundedMemoryConversationStore,
+    SqliteConversationStore,
+    trim_turns,
+)
+
+ALICE = User(id="alice")
+BOB = User(id="bob")
+
+
+def _conversation(conversation_id: str = "c1", turns: int = 1, user: User = ALICE) -> Conversation:
+    messages = []
+    for turn in range(turns):
+        messages.append(Message(role="user", content=f"question {turn}"))
+        messages.append(Message(role="assistant", content="", tool_calls=None))
+        messages.append(Message(role="tool", content="rows", tool_call_id=f"call_{turn}"))
+        messages.append(Message(role="assistant", content=f"answer {turn}"))
+    return Conversation(id=conversation_id, user=user, messages=messages)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTrimTurns(TestCase):
+    def test_keeps_whole_recent_turns(self) -> None:
+        conversation = _conversation(turns=3)
+        self.assertEqual(trim_turns(conversation, 2), 4)
+        self.assertEqual(conversation.messages[0].content, "question 1")
+        self.assertEqual(len(conversation.messages), 8)
+        self.assertEqual(trim_turns(conversation, None), 0)
+
+
+class TestBoundedMemoryConversationStore(IsolatedAsyncioTestCase):
+    async def test_lru_eviction_and_user_scoping(self) -> None:
+        store = BoundedMemoryConversationStore(max_conversations=2)
+        await store.update_conversation(_conversation("c1"))
+        await store.update_conversation(_conversation("c2"))
+        self.assertIsNotNone(await store.get_conversation("c1", ALICE))
+        await store.update_conversation(_conversation("c3"))
+
+        self.assertIsNone(await store.get_conversation("c2", ALICE))
+        self.assertIsNotNone(await store.get_conversation("c1", ALICE))
+        self.assertIsNone(await store.get_conversation("c1", BOB))
+        self.assertEqual((await store.stats())["evicted"], 1)
+        self.assertEqual((await store.stats())["conversations"], 2)
+
+    async def test_idle_conversations_expire(self) -> None:
+        clock = _Clock()
+        store = BoundedMemoryConversationStore(idle_ttl=60)
+        with patch.object(vanna_conversation_store.time, "monotonic", clock):
+            await store.update_conversation(_conversation("c1"))
+            clock.now += 30
+            await store.update_conversation(_conversation("c2"))
+            clock.now += 45
+            self.assertIsNone(await store.get_conversation("c1", ALICE))
+            self.assertIsNotNone(await store.get_conversation("c2", ALICE))
+        self.assertEqual((await store.stats())["expired"], 1)
+
+    async def test_turn_cap_applies_on_update(self) -> None:
+        store = BoundedMemoryConversationStore(max_turns=1)
+        await store.update_conversation(_conversation(turns=3))
+        stored = await store.get_conversation("c1", ALICE)
+        self.assertEqual([m.content for m in stored.messages if m.role == "user"], ["question 2"])
+        self.assertEqual((await store.stats())["trimmed_messages"], 8)
+
+
+class TestSqliteConversationStore(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp.name, "conversations.db")
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    async def test_round_trip_across_instances(self) -> None:
+        await SqliteConversationStore(self.path, max_turns=2).update_conversation(_conversation(turns=3))
+
+        store = SqliteConversationStore(self.path)
+        stored = await store.get_conversation("c1", ALICE)
+        self.assertEqual(len(stored.messages), 8)
+        self.assertEqual(stored.messages[2].tool_call_id, "call_1")
+        self.assertIsNone(await store.get_conversation("c1", BOB))
+        self.assertEqual([c.id for c in await store.list_conversations(ALICE)], ["c1"])
+        self.assertTrue(await store.delete_conversation("c1", ALICE))
+        self.assertEqual((await store.stats())["conversations"], 0)
+
+    async def test_eviction_and_expiry(self) -> None:
+        clock = _Clock()
+        store = SqliteConversationStore(self.path, max_conversations=2, idle_ttl=60)
+        with patch.object(vanna_conversation_store.time, "time", clock):
+            for conversation_id in ("c1", "c2", "c3"):
+                clock.now += 1
+                await store.update_conversation(_conversation(conversation_id))
+            self.assertIsNone(await store.get_conversation("c1", ALICE))
+            clock.now += 120
+            self.assertIsNone(await store.get_conversation("c3", ALICE))
+
+        stats = (await store.stats())
+        self.assertEqual(stats["evicted"], 1)
+        self.assertEqual(stats["expired"], 1)
+        self.assertEqual(stats["conversations"], 1)
@@ -0,0 +1,157 @@
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List
+from unittest import TestCase
+
+from chromadb.api.types import Documents, EmbeddingFunction, Embeddings
+from chromadb.errors import NotFoundError
+
+from data_analyst_mcp.vanna_embedding_cache import (
+    CachedEmbeddingChromaMemory,
+    CachedEmbeddingFunction,
+    EmbeddingBatcher,
+)
+
+
+class _FakeEmbeddingFunction(EmbeddingFunction[Documents]):
+    def __init__(self, delay: float = 0.0) -> None:
+        self.calls: List[List[str]] = []
+        self.delay = delay
+        self.fail = False
+
+    def __call__(self, input: Documents) -> Embeddings:
+        self.calls.append(list(input))
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("embedding endpoint down")
+        return [[float(len(text)), 1.0] for text in input]
+
+    @staticmethod
+    def name() -> str:
+        return "fake"
+
+    def get_config(self) -> Dict[str, Any]:
+        return {"model": "fake"}
+
+
+class TestCachedEmbeddingFunction(TestCase):
+    def test_repeated_texts_are_embedded_once(self) -> None:
+        inner = _FakeEmbeddingFunction()
+        embed = CachedEmbeddingFunction(inner, model="m", batch_window=0)
+
+        first = embed(["ab", "abc", "ab"])
+        second = embed(["abc", "abcd"])
+
+        self.assertEqual([list(v) for v in first], [[2.0, 1.0], [3.0, 1.0], [2.0, 1.0]])
+        self.assertEqual([list(v) for v in second], [[3.0, 1.0], [4.0, 1.0]])
+        self.assertEqual(inner.calls, [["ab", "abc"], ["abcd"]])
+        self.assertEqual(embed.stats()["cache"]["hits"], 1)
+        self.assertEqual(embed.name(), "fake")
+        self.assertEqual(embed.get_config(), {"model": "fake"})
+
+    def test_model_is_part_of_the_key(self) -> None:
+        inner = _FakeEmbeddingFunction()
+        with tempfile.TemporaryDirectory() as disk_dir:
+            CachedEmbeddingFunction(inner, model="m1", disk_dir=disk_dir, batch_window=0)(["a"])
+            CachedEmbeddingFunction(inner, model="m1", disk_dir=disk_dir, batch_window=0)(["a"])
+            CachedEmbeddingFunction(inner, model="m2", disk_dir=disk_dir, batch_window=0)(["a"])
+        self.assertEqual(inner.calls, [["a"], ["a"]])
+
+    def test_failures_are_not_cached(self) -> None:
+        inner = _FakeEmbeddingFunction()
+        embed = CachedEmbeddingFunction(inner, batch_window=0)
+        inner.fail = True
+        with self.assertRaises(RuntimeError):
+            embed(["a"])
+        inner.fail = False
+        self.assertEqual(list(embed(["a"])[0]), [1.0, 1.0])
+        self.assertEqual(len(inner.calls), 2)
+
+
+class TestEmbeddingBatcher(TestCase):
+    def test_concurrent_calls_share_one_request(self) -> None:
+        inner = _FakeEmbeddingFunction()
+        batcher = EmbeddingBatcher(inner, window=0.2, max_batch_size=3)
+        results: Dict[str, Any] = {}
+
+        def call(text: str) -> None:
+            results[text] = batcher.embed([text])
+
+        threads = [threading.Thread(target=call, args=(text,)) for text in ("a", "bb", "ccc")]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(inner.calls), 1)
+        self.assertEqual(sorted(inner.calls[0]), ["a", "bb", "ccc"])
+        self.assertEqual(results["bb"], [[2.0, 1.0]])
+        self.assertEqual(batcher.stats()["max_batch"], 3)
+
+    def test_callers_during_an_inflight_call_form_one_batch(self) -> None:
+        release = threading.Event()
+        inner = _FakeEmbeddingFunction()
+        gated_calls: List[List[str]] = []
+
+        def embed(texts: List[str]) -> Any:
+            gated_calls.append(list(texts))
+            if len(gated_calls) == 1:
+                release.wait(5)
+            return inner(texts)
+
+        batcher = EmbeddingBatcher(embed, window=0, max_batch_size=8)
+        threads = [threading.Thread(target=batcher.embed, args=([text],)) for text in "abcd"]
+        threads[0].start()
+        while not gated_calls:
+            time.sleep(0.001)
+        for thread in threads[1:]:
+            thread.start()
+        while batcher.stats()["requests"] < 4:
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(inner.calls[0], ["a"])
+        self.assertEqual(len(inner.calls), 2)
+        self.assertEqual(sorted(inner.calls[1]), ["b", "c", "d"])
+        self.assertEqual(batcher.stats()["api_calls"], 2)
+
+    def test_large_input_is_chunked(self) -> None:
+        inner = _FakeEmbeddingFunction()
+        batcher = EmbeddingBatcher(inner, window=0, max_batch_size=2)
+        vectors = batcher.embed(["a", "b", "c"])
+        self.assertEqual(len(vectors), 3)
+        self.assertEqual(inner.calls, [["a", "b"], ["c"]])
+
+
+class _FakeClient:
+    def __init__(self, exists: bool = True) -> None:
+        self.exists = exists
+        self.get_calls: List[Dict[str, Any]] = []
+
+    def get_collection(self, **kwargs: Any) -> Any:
+        self.get_calls.append(kwargs)
+        if not self.exists:
+            raise NotFoundError("missing")
+        return object()
+
+    def create_collection(self, **kwargs: Any) -> Any:
+        return kwargs
+
+
+class TestCachedEmbeddingChromaMemory(TestCase):
+    def test_existing_collection_uses_the_cached_function(self) -> None:
+        embed = CachedEmbeddingFunction(_FakeEmbeddingFunction())
+        memory = CachedEmbeddingChromaMemory(collection_name="c", embedding_function=embed)
+        memory._client = _FakeClient()
+        memory._get_collection()
+        self.assertIs(memory._client.get_calls[0]["embedding_function"], embed)
+
+    def test_new_collection_is_created_with_the_cached_function(self) -> None:
+        embed = CachedEmbeddingFunction(_FakeEmbeddingFunction())
+        memory = CachedEmbeddingChromaMemory(collection_name="c", embedding_function=embed)
+        memory._client = _FakeClient(exists=False)
+        collection = memory._get_collection()
+        self.assertIs(collection["embedding_function"], embed)
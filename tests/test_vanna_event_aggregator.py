@@ -0,0 +1,79 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from data_analyst_mcp import config
+from data_analyst_mcp.vanna_event_aggregator import (
+    VannaEventAggregator,
+    aggregate_vanna_events,
+    build_event_aggregator,
+)
+
+EVENTS = [
+    {"type": "text", "text": "Top ", "conversation_id": "conv-1"},
+    {"type": "text", "text": "customers"},
+    {"type": "sql", "query": "SELECT * FROM customers"},
+    {"type": "dataframe", "json_table": {"rows": [{"a": 1}]}},
+    {"type": "end", "conversation_id": "conv-1"},
+]
+
+
+class TestVannaEventAggregator(TestCase):
+    def test_incremental_matches_list_aggregation(self) -> None:
+        aggregator = VannaEventAggregator()
+        for event in EVENTS:
+            aggregator.feed(event)
+
+        self.assertEqual(aggregator.result(), aggregate_vanna_events(EVENTS))
+        self.assertEqual(aggregator.result()["text"], "Top customers")
+        self.assertEqual(aggregator.result()["conversation_id"], "conv-1")
+
+    def test_raw_events_can_be_omitted(self) -> None:
+        result = VannaEventAggregator(raw_events="none").feed_all(EVENTS).result()
+
+        self.assertNotIn("raw_events", result)
+        self.assertEqual(result["sql"], ["SELECT * FROM customers"])
+
+    def test_raw_events_can_be_capped(self) -> None:
+        result = VannaEventAggregator(max_raw_events=2).feed_all(EVENTS).result()
+
+        self.assertEqual(result["raw_events"], EVENTS[:2])
+        self.assertEqual(result["raw_events_dropped"], 3)
+        self.assertEqual(result["dataframes"], [{"json_table": {"rows": [{"a": 1}]}}])
+
+    def test_metadata_only_raw_events(self) -> None:
+        result = VannaEventAggregator(raw_events="metadata").feed_all(EVENTS).result()
+
+        self.assertEqual(result["raw_events"][0], {"type": "text", "conversation_id": "conv-1"})
+        self.assertEqual(result["raw_events"][3], {"type": "dataframe"})
+
+    def test_raw_events_filtered_by_type_and_byte_cap(self) -> None:
+        by_type = VannaEventAggregator(raw_event_types=["sql"]).feed_all(EVENTS).result()
+        self.assertEqual(by_type["raw_events"], [EVENTS[2]])
+
+        capped = VannaEventAggregator(max_raw_event_bytes=60).feed_all(EVENTS).result()
+        self.assertEqual(capped["raw_events"], EVENTS[:1])
+        self.assertEqual(capped["raw_events_dropped"], 4)
+
+    def test_spent_byte_budget_stops_measuring(self) -> None:
+        aggregator = VannaEventAggregator(max_raw_event_bytes=60)
+        with patch(
+            "data_analyst_mcp.vanna_event_aggregator.approx_size", side_effect=[40, 40]
+        ) as sizeof:
+            aggregator.feed_all(EVENTS)
+
+        self.assertEqual(sizeof.call_count, 2)
+        self.assertEqual(aggregator.dropped_raw_events, 4)
+
+    def test_explicit_zero_budget_overrides_config(self) -> None:
+        with patch.object(config, "VANNA_RAW_EVENTS_MAX_BYTES", 1000):
+            aggregator = build_event_aggregator(raw_events_max_bytes=0)
+            self.assertEqual(build_event_aggregator().max_raw_event_bytes, 1000)
+
+        self.assertEqual(aggregator.feed_all(EVENTS).result()["raw_events"], [])
+        self.assertEqual(aggregator.dropped_raw_events, len(EVENTS))
+        with self.assertRaises(ValueError):
+            build_event_aggregator(raw_events="")
+
+    def test_unknown_mode_is_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            VannaEventAggregator(raw_events="everything")
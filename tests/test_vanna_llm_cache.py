@@ -0,0 +1,98 @@
+from typing import Any, AsyncGenerator, List
+from unittest import IsolatedAsyncioTestCase
+
+from vanna.core.llm import LlmMessage, LlmRequest, LlmResponse, LlmService, LlmStreamChunk
+from vanna.core.tool import ToolCall, ToolSchema
+from vanna.core.user import User
+
+from data_analyst_mcp.vanna_llm_cache import CachedLlmService
+
+
+class _FakeLlmService(LlmService):
+    model = "fake-model"
+
+    def __init__(self) -> None:
+        self.requests: List[LlmRequest] = []
+
+    async def send_request(self, request: LlmRequest) -> LlmResponse:
+        self.requests.append(request)
+        return LlmResponse(
+            content=f"answer {len(self.requests)}",
+            tool_calls=[ToolCall(id="call_1", name="run_sql", arguments={"sql": "SELECT 1"})],
+            finish_reason="stop",
+        )
+
+    async def stream_request(self, request: LlmRequest) -> AsyncGenerator[LlmStreamChunk, None]:
+        self.requests.append(request)
+        yield LlmStreamChunk(content="part ")
+        yield LlmStreamChunk(content="two", finish_reason="stop")
+
+    async def validate_tools(self, tools: List[Any]) -> List[str]:
+        return []
+
+
+def _request(question: str = "total sales?", temperature: float = 0.0, **kwargs: Any) -> LlmRequest:
+    return LlmRequest(
+        messages=[LlmMessage(role="user", content=question)],
+        user=User(id=kwargs.pop("user", "a@example.com")),
+        temperature=temperature,
+        **kwargs,
+    )
+
+
+class TestCachedLlmService(IsolatedAsyncioTestCase):
+    async def test_identical_deterministic_requests_are_replayed(self) -> None:
+        inner = _FakeLlmService()
+        llm = CachedLlmService(inner)
+
+        first = await llm.send_request(_request())
+        second = await llm.send_request(_request(user="b@example.com"))
+
+        self.assertEqual(len(inner.requests), 1)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second.tool_calls[0].arguments, {"sql": "SELECT 1"})
+        self.assertEqual(second.metadata["cache"], "hit")
+        self.assertEqual(llm.stats()["cache"]["hits"], 1)
+
+    async def test_key_covers_messages_and_tools(self) -> None:
+        inner = _FakeLlmService()
+        llm = CachedLlmService(inner)
+        tool = ToolSchema(name="run_sql", description="Run SQL", parameters={"type": "object"})
+
+        await llm.send_request(_request())
+        await llm.send_request(_request("other question"))
+        await llm.send_request(_request(tools=[tool]))
+        await llm.send_request(_request(tools=[tool]))
+
+        self.assertEqual(len(inner.requests), 3)
+
+    async def test_deterministic_mode_skips_sampled_requests(self) -> None:
+        inner = _FakeLlmService()
+        llm = CachedLlmService(inner, mode="deterministic")
+        await llm.send_request(_request(temperature=0.7))
+        await llm.send_request(_request(temperature=0.7))
+        self.assertEqual(len(inner.requests), 2)
+        self.assertEqual(llm.stats()["bypassed"], 2)
+
+        llm_all = CachedLlmService(inner, mode="all")
+        await llm_all.send_request(_request(temperature=0.7))
+        await llm_all.send_request(_request(temperature=0.7))
+        self.assertEqual(len(inner.requests), 3)
+
+    async def test_stream_is_recorded_and_replayed(self) -> None:
+        inner = _FakeLlmService()
+        llm = CachedLlmService(inner)
+
+        streamed = [chunk.content async for chunk in llm.stream_request(_request())]
+        replayed = [chunk async for chunk in llm.stream_request(_request())]
+        response = await llm.send_request(_request())
+
+        self.assertEqual(streamed, ["part ", "two"])
+        self.assertEqual([chunk.content for chunk in replayed], ["part two"])
+        self.assertEqual(replayed[0].finish_reason, "stop")
+        self.assertEqual(response.content, "part two")
+        self.assertEqual(len(inner.requests), 1)
+
+    def test_invalid_mode(self) -> None:
+        with self.assertRaises(ValueError):
+            CachedLlmService(_FakeLlmService(), mode="sometimes")
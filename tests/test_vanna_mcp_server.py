@@ -0,0 +1,126 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import AsyncMock, patch
+
+import httpx
+
+from data_analyst_mcp import config, vanna_agent, vanna_mcp_server
+from data_analyst_mcp.vanna_mcp_server import AppState
+
+
+def _fake_build():
+    return SimpleNamespace(name="agent"), SimpleNamespace(name="handler")
+
+
+class TestEnsureInitialized(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        vanna_mcp_server._APP_STATE = None
+
+    def tearDown(self) -> None:
+        vanna_mcp_server._APP_STATE = None
+
+    async def test_concurrent_first_calls_build_once(self) -> None:
+        builds = []
+        lock = threading.Lock()
+
+        def slow_build():
+            with lock:
+                builds.append(threading.get_ident())
+            time.sleep(0.05)
+            return _fake_build()
+
+        state = vanna_mcp_server.get_app_state()
+        with patch.object(vanna_mcp_server, "_build_agent_and_handler", slow_build):
+            states = await asyncio.gather(
+                *(vanna_mcp_server.ensure_initialized(vanna_mcp_server.get_app_state()) for _ in range(5))
+            )
+
+        self.assertEqual(len(builds), 1)
+        self.assertTrue(all(s is state for s in states))
+        self.assertEqual(state.agent.name, "agent")
+        stats = state.init_once.stats()
+        self.assertEqual(stats["attempts"], 1)
+        self.assertEqual(stats["coalesced"], 4)
+        self.assertTrue(stats["initialized"])
+        self.assertGreaterEqual(stats["init_seconds"], 0.05)
+
+    async def test_failed_build_is_retried(self) -> None:
+        state = vanna_mcp_server.get_app_state()
+        with patch.object(
+            vanna_mcp_server, "_build_agent_and_handler", side_effect=RuntimeError("no db")
+        ):
+            with self.assertRaises(RuntimeError):
+                await vanna_mcp_server.ensure_initialized(state)
+        self.assertIsNone(state.agent)
+
+        with patch.object(vanna_mcp_server, "_build_agent_and_handler", _fake_build):
+            await vanna_mcp_server.ensure_initialized(state)
+        self.assertEqual(state.init_once.stats()["failures"], 1)
+        self.assertEqual(state.agent.name, "agent")
+
+
+class TestWarmUp(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        vanna_mcp_server._APP_STATE = None
+
+    def tearDown(self) -> None:
+        vanna_mcp_server._APP_STATE = None
+
+    async def test_warm_up_marks_state_ready(self) -> None:
+        state = vanna_mcp_server.get_app_state()
+        warm = AsyncMock(return_value={"database": 0.1, "memory": 0.2})
+        with patch.object(vanna_mcp_server, "_build_agent_and_handler", _fake_build), patch.object(
+            vanna_agent, "warm_up_vanna_agent", warm
+        ), patch.object(config, "VANNA_WARMUP", True):
+            self.assertFalse(vanna_mcp_server.readiness_status(state)["ready"])
+            await vanna_mcp_server.warm_up(state)
+            status = vanna_mcp_server.readiness_status(state)
+
+        warm.assert_awaited_once_with(state.agent)
+        self.assertTrue(status["ready"])
+        self.assertEqual(status["warmup_timings"]["memory"], 0.2)
+        self.assertIn("total", status["warmup_timings"])
+
+    async def test_failed_warm_up_stays_unready(self) -> None:
+        state = vanna_mcp_server.get_app_state()
+        warm = AsyncMock(side_effect=RuntimeError("database unreachable"))
+        with patch.object(vanna_mcp_server, "_build_agent_and_handler", _fake_build), patch.object(
+            vanna_agent, "warm_up_vanna_agent", warm
+        ), patch.object(config, "VANNA_WARMUP", True):
+            await vanna_mcp_server.warm_up(state)
+            status = vanna_mcp_server.readiness_status(state)
+
+        self.assertFalse(status["ready"])
+        self.assertEqual(status["warmup_error"], "database unreachable")
+
+    async def test_ready_endpoint(self) -> None:
+        app = vanna_mcp_server.build_sse_app()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            with patch.object(config, "VANNA_WARMUP", True):
+                response = await client.get("/ready")
+                self.assertEqual(response.status_code, 503)
+
+                vanna_mcp_server.get_app_state().ready = True
+                response = await client.get("/ready")
+                self.assertEqual(response.status_code, 200)
+                self.assertTrue(response.json()["ready"])
+
+            vanna_mcp_server.get_app_state().ready = False
+            with patch.object(config, "VANNA_WARMUP", False):
+                response = await client.get("/ready")
+                self.assertEqual(response.status_code, 200)
+
+    async def test_lifespan_owns_the_asset_client(self) -> None:
+        state = vanna_mcp_server.get_app_state()
+        with patch.object(config, "VANNA_WARMUP", False):
+            async with vanna_mcp_server._sse_lifespan(vanna_mcp_server.build_sse_app()):
+                client = state.asset_client
+                self.assertIsInstance(client, httpx.AsyncClient)
+                self.assertFalse(client.is_closed)
+
+        self.assertIsNone(state.asset_client)
+        self.assertTrue(client.is_closed)
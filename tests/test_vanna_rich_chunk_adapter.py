@@ -1,16 +1,27 @@
-import sys
+import asyncio
 from types import SimpleNamespace
-from unittest import TestCase
+from unittest import IsolatedAsyncioTestCase, TestCase
 from unittest.mock import patch
 
 import httpx
 
-sys.argv = [sys.argv[0]]
+from data_analyst_mcp import vanna_rich_chunk_adapter
+from data_analyst_mcp.cache import SingleFlight
+from data_analyst_mcp.vanna_rich_chunk_adapter import chunk_to_events, chunk_to_events_async
 
-from data_analyst_mcp.vanna_rich_chunk_adapter import chunk_to_events
+
+def _asset_response(asset: dict) -> httpx.Response:
+    return httpx.Response(
+        200,
+        json={"asset": asset},
+        request=httpx.Request("POST", "https://assets.example.com"),
+    )
 
 
 class TestVannaRichChunkAdapter(TestCase):
+    def setUp(self) -> None:
+        vanna_rich_chunk_adapter._asset_cache = None
+
     def test_dataframe_adds_link_event(self) -> None:
         chunk = SimpleNamespace(
             conversation_id="conv-1",
@@ -27,10 +38,7 @@ class TestVannaRichChunkAdapter(TestCase):
         )
 
         with patch("data_analyst_mcp.vanna_rich_chunk_adapter.httpx.post") as mock_post:
-            mock_post.return_value = httpx.Response(
-                200,
-                json={"asset": {"url": "https://files.example.com/export.csv"}},
-            )
+            mock_post.return_value = _asset_response({"url": "https://files.example.com/export.csv"})
 
             events = chunk_to_events(chunk)
 
@@ -58,9 +66,8 @@ class TestVannaRichChunkAdapter(TestCase):
         )
 
         with patch("data_analyst_mcp.vanna_rich_chunk_adapter.httpx.post") as mock_post:
-            mock_post.return_value = httpx.Response(
-                200,
-                json={"asset": {"preview_url": "https://files.example.com/chart.png"}},
+            mock_post.return_value = _asset_response(
+                {"preview_url": "https://files.example.com/chart.png"}
             )
 
             events = chunk_to_events(chunk)
@@ -89,3 +96,117 @@ class TestVannaRichChunkAdapter(TestCase):
 
         event_types = [event["type"] for event in events]
         self.assertEqual(event_types, ["dataframe"])
+
+    def test_identical_chart_is_served_from_cache(self) -> None:
+        def make_chunk(conversation_id: str) -> SimpleNamespace:
+            return SimpleNamespace(
+                conversation_id=conversation_id,
+                request_id=f"req-{conversation_id}",
+                timestamp=1234567890,
+                rich={
+                    "id": f"chart-{conversation_id}",
+                    "type": "chart",
+                    "data": {"data": [{"x": [1], "y": [2]}], "layout": {"title": "Revenue"}},
+                },
+            )
+
+        with patch("data_analyst_mcp.vanna_rich_chunk_adapter.httpx.post") as mock_post:
+            mock_post.return_value = _asset_response(
+                {"preview_url": "https://files.example.com/chart.png"}
+            )
+
+            first = chunk_to_events(make_chunk("conv-a"))
+            second = chunk_to_events(make_chunk("conv-b"))
+
+        self.assertEqual(mock_post.call_count, 1)
+        self.assertEqual(first[1]["image_url"], second[1]["image_url"])
+        self.assertEqual(second[1]["conversation_id"], "conv-b")
+
+
+class TestVannaRichChunkAdapterAsync(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        vanna_rich_chunk_adapter._asset_cache = None
+        vanna_rich_chunk_adapter._asset_flight = SingleFlight()
+
+    async def test_chart_adds_image_event_without_blocking_post(self) -> None:
+        requested_paths = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requested_paths.append(request.url.path)
+            return httpx.Response(200, json={"asset": {"preview_url": "https://files.example.com/chart.png"}})
+
+        chunk = SimpleNamespace(
+            conversation_id="conv-4",
+            request_id="req-4",
+            timestamp=1234567893,
+            rich={
+                "id": "chart-2",
+                "type": "chart",
+                "data": {
+                    "title": "Chart Title",
+                    "data": [{"x": [1], "y": [2]}],
+                    "layout": {"title": "Chart Title"},
+                },
+            },
+        )
+
+        with patch("data_analyst_mcp.vanna_rich_chunk_adapter.httpx.post") as mock_post:
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                events = await chunk_to_events_async(chunk, client)
+
+        mock_post.assert_not_called()
+        self.assertEqual(requested_paths, ["/api/v0/rich_assets/chart/render"])
+        self.assertEqual([event["type"] for event in events], ["plotly", "image"])
+        self.assertEqual(events[1]["conversation_id"], "conv-4")
+
+    async def test_export_failure_still_returns_dataframe(self) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            raise httpx.ConnectError("boom", request=request)
+
+        chunk = SimpleNamespace(
+            conversation_id="conv-5",
+            request_id="req-5",
+            timestamp=1234567894,
+            rich={"id": "df-3", "type": "dataframe", "data": {"rows": [{"a": 1}]}},
+        )
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            events = await chunk_to_events_async(chunk, client)
+
+        self.assertEqual([event["type"] for event in events], ["dataframe"])
+
+    async def test_concurrent_identical_renders_are_coalesced(self) -> None:
+        request_count = 0
+        release = asyncio.Event()
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal request_count
+            request_count += 1
+            await release.wait()
+            return httpx.Response(200, json={"asset": {"preview_url": "https://files.example.com/chart.png"}})
+
+        chunks = [
+            SimpleNamespace(
+                conversation_id=f"conv-{i}",
+                request_id=f"req-{i}",
+                timestamp=1234567895,
+                rich={
+                    "id": f"chart-{i}",
+                    "type": "chart",
+                    "data": {"data": [{"x": [1], "y": [3]}], "layout": {"title": "Top customers"}},
+                },
+            )
+            for i in range(3)
+        ]
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            tasks = [asyncio.create_task(chunk_to_events_async(chunk, client)) for chunk in chunks]
+            await asyncio.sleep(0)
+            release.set()
+            results = await asyncio.gather(*tasks)
+
+        self.assertEqual(request_count, 1)
+        self.assertTrue(all(events[1]["type"] == "image" for events in results))
+        stats = vanna_rich_chunk_adapter.rich_asset_stats()["single_flight"]
+        self.assertEqual(stats["calls"], 1)
+        self.assertEqual(stats["coalesced"], 2)
@@ -0,0 +1,270 @@
+import asyncio
+from types import SimpleNamespace
+from unittest import TestCase
+from unittest import IsolatedAsyncioTestCase
+
+import pandas as pd
+import psycopg2.errors
+from vanna.capabilities.sql_runner import RunSqlToolArgs
+
+from data_analyst_mcp.vanna_sql_runner import (
+    CachingSqlRunner,
+    PooledPostgresRunner,
+    PoolTimeoutError,
+    RowLimitedRunSqlTool,
+    is_cacheable_query,
+    is_read_only_query,
+    normalize_sql,
+)
+
+
+class _FakeCursor:
+    def __init__(self, conn, name=None):
+        self.conn = conn
+        self.name = name
+        self.description = None
+        self.rowcount = -1
+        self._rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def execute(self, sql, params=None):
+        self.conn.executed.append((sql, params, self.name))
+        if sql == "fail":
+            raise psycopg2.errors.QueryCanceled("canceling statement due to statement timeout")
+        if sql.startswith("UPDATE"):
+            self.rowcount = 3
+            return
+        self.description = [("n",)]
+        self._rows = [{"n": i} for i in range(5)]
+
+    def fetchmany(self, size):
+        self.conn.fetched.append(size)
+        return self._rows[:size]
+
+    def fetchall(self):
+        return list(self._rows)
+
+    def close(self):
+        pass
+
+
+class _FakeConnection:
+    def __init__(self):
+        self.closed = 0
+        self.executed = []
+        self.fetched = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    def cursor(self, name=None, cursor_factory=None):
+        return _FakeCursor(self, name)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+class _FakePool:
+    def __init__(self):
+        self.conn = _FakeConnection()
+        self.returned = []
+
+    def getconn(self):
+        return self.conn
+
+    def putconn(self, conn, close=False):
+        self.returned.append(close)
+
+
+def _runner(**kwargs):
+    runner = PooledPostgresRunner("postgresql://test", **kwargs)
+    pool = _FakePool()
+    runner._create_pool = lambda: pool
+    return runner, pool
+
+
+class TestPooledPostgresRunner(IsolatedAsyncioTestCase):
+    async def test_select_sets_timeout_and_limits_rows(self) -> None:
+        runner, pool = _runner(statement_timeout=2.5, row_limit=3)
+        frame = await runner.run_sql(SimpleNamespace(sql="SELECT n FROM t"), context=None)
+
+        self.assertEqual(list(frame["n"]), [0, 1, 2])
+        self.assertTrue(frame.attrs["truncated"])
+        executed = pool.conn.executed
+        self.assertEqual(executed[0], ("SET LOCAL statement_timeout = %s", (2500,), None))
+        self.assertEqual(executed[1], ("SELECT n FROM t", None, "vanna_run_sql"))
+        self.assertEqual(pool.conn.fetched, [4])
+        self.assertEqual(pool.returned, [False])
+
+        stats = runner.stats()
+        self.assertEqual(stats["queries"], 1)
+        self.assertEqual(stats["truncated"], 1)
+        self.assertEqual(stats["in_use"], 0)
+
+    async def test_modification_is_committed(self) -> None:
+        runner, pool = _runner()
+        frame = await runner.run_sql(SimpleNamespace(sql="UPDATE t SET n = 1"), context=None)
+        self.assertEqual(frame["rows_affected"].tolist(), [3])
+        self.assertEqual(pool.conn.commits, 1)
+        self.assertEqual(len(pool.conn.executed), 1)
+
+    async def test_data_modifying_cte_uses_plain_cursor_and_commits(self) -> None:
+        runner, pool = _runner(row_limit=3)
+        sql = "WITH gone AS (DELETE FROM t RETURNING n) SELECT n FROM gone"
+        frame = await runner.run_sql(SimpleNamespace(sql=sql), context=None)
+
+        self.assertEqual(pool.conn.executed[0], (sql, None, None))
+        self.assertEqual(len(frame), 3)
+        self.assertEqual(pool.conn.commits, 1)
+
+    async def test_statement_timeout_is_counted(self) -> None:
+        runner, pool = _runner(statement_timeout=1)
+        with self.assertRaises(psycopg2.errors.QueryCanceled):
+            await runner.run_sql(SimpleNamespace(sql="fail"), context=None)
+        stats = runner.stats()
+        self.assertEqual(stats["errors"], 1)
+        self.assertEqual(stats["statement_timeouts"], 1)
+        self.assertEqual(pool.conn.rollbacks, 1)
+
+    async def test_pool_timeout_when_exhausted(self) -> None:
+        runner, _ = _runner(max_size=1, pool_timeout=0.01)
+        runner._slots.acquire()
+        with self.assertRaises(PoolTimeoutError):
+            await runner.run_sql(SimpleNamespace(sql="SELECT 1"), context=None)
+        self.assertEqual(runner.stats()["pool_timeouts"], 1)
+
+
+class TestIsReadOnlyQuery(TestCase):
+    def test_classification(self) -> None:
+        self.assertTrue(is_read_only_query("select * from t"))
+        self.assertTrue(is_read_only_query("WITH x AS (SELECT 1) SELECT * FROM x"))
+        self.assertTrue(is_read_only_query("SELECT 'insert into' AS label"))
+        self.assertFalse(is_read_only_query("WITH x AS (UPDATE t SET n = 1 RETURNING n) SELECT * FROM x"))
+        self.assertFalse(is_read_only_query("SELECT * INTO copy FROM t"))
+        self.assertFalse(is_read_only_query("DELETE FROM t"))
+
+    def test_volatile_queries_are_not_cacheable(self) -> None:
+        self.assertTrue(is_cacheable_query("SELECT n FROM t WHERE label = 'now()'"))
+        self.assertFalse(is_cacheable_query("SELECT now()"))
+        self.assertFalse(is_cacheable_query("SELECT * FROM t ORDER BY RANDOM() LIMIT 5"))
+        self.assertFalse(is_cacheable_query("SELECT nextval('seq')"))
+        self.assertFalse(is_cacheable_query("SELECT * FROM t WHERE day = CURRENT_DATE"))
+
+
+class _FrameRunner:
+    def __init__(self, frame):
+        self.frame = frame
+
+    async def run_sql(self, args, context):
+        return self.frame
+
+
+class TestRowLimitedRunSqlTool(IsolatedAsyncioTestCase):
+    async def _execute(self, frame):
+        tool = RowLimitedRunSqlTool(sql_runner=_FrameRunner(frame), file_system=_FakeFileSystem())
+        return await tool.execute(SimpleNamespace(), RunSqlToolArgs(sql="SELECT n FROM t"))
+
+    async def test_truncated_result_is_reported(self) -> None:
+        frame = pd.DataFrame({"n": [1, 2]})
+        frame.attrs.update(truncated=True, row_limit=2)
+        result = await self._execute(frame)
+
+        self.assertIn("truncated to the first 2 rows", result.result_for_llm)
+        self.assertTrue(result.metadata["truncated"])
+        self.assertEqual(result.metadata["row_count"], 2)
+
+    async def test_complete_result_is_unchanged(self) -> None:
+        result = await self._execute(pd.DataFrame({"n": [1, 2]}))
+
+        self.assertNotIn("truncated", result.metadata)
+
+
+class _FakeFileSystem:
+    async def write_file(self, filename, content, context, overwrite=False):
+        pass
+
+
+class TestNormalizeSql(TestCase):
+    def test_whitespace_and_keyword_case(self) -> None:
+        self.assertEqual(
+            normalize_sql("  SELECT  n\n  FROM t\tWHERE x = 1 ;"),
+            normalize_sql("select n from T where X = 1"),
+        )
+
+    def test_quoted_text_is_kept(self) -> None:
+        self.assertEqual(
+            normalize_sql("SELECT \"Total\" FROM t WHERE name = 'A  B'"),
+            "select \"Total\" from t where name = 'A  B'",
+        )
+        self.assertNotEqual(normalize_sql("SELECT 'A'"), normalize_sql("SELECT 'a'"))
+
+
+class TestCachingSqlRunner(IsolatedAsyncioTestCase):
+    async def test_repeated_query_served_from_cache(self) -> None:
+        runner, pool = _runner()
+        cached = CachingSqlRunner(runner, ttl=60, max_bytes=1 << 20)
+        first = await cached.run_sql(SimpleNamespace(sql="SELECT n FROM t"), context=None)
+        first.loc[0, "n"] = 99
+        second = await cached.run_sql(SimpleNamespace(sql="select n\nfrom t;"), context=None)
+
+        self.assertEqual(list(second["n"]), [0, 1, 2, 3, 4])
+        self.assertEqual(runner.stats()["queries"], 1)
+        stats = cached.stats()
+        self.assertEqual(stats["cache"]["hits"], 1)
+        self.assertGreater(stats["cache"]["bytes"], 0)
+
+    async def test_result_over_budget_is_not_cached(self) -> None:
+        runner, _ = _runner()
+        cached = CachingSqlRunner(runner, ttl=60, max_bytes=8)
+        await cached.run_sql(SimpleNamespace(sql="SELECT n FROM t"), context=None)
+        await cached.run_sql(SimpleNamespace(sql="SELECT n FROM t"), context=None)
+        self.assertEqual(runner.stats()["queries"], 2)
+
+    async def test_concurrent_identical_queries_run_once(self) -> None:
+        runner, _ = _runner()
+        cached = CachingSqlRunner(runner, ttl=60)
+        args = SimpleNamespace(sql="SELECT n FROM t")
+        await asyncio.gather(*(cached.run_sql(args, context=None) for _ in range(3)))
+        self.assertEqual(runner.stats()["queries"], 1)
+
+    async def test_write_clears_cache(self) -> None:
+        runner, _ = _runner()
+        cached = CachingSqlRunner(runner, ttl=60)
+        await cached.run_sql(SimpleNamespace(sql="SELECT n FROM t"), context=None)
+        await cached.run_sql(SimpleNamespace(sql="UPDATE t SET n = 1"), context=None)
+        self.assertEqual(len(cached.cache), 0)
+        await cached.run_sql(SimpleNamespace(sql="UPDATE t SET n = 1"), context=None)
+        self.assertEqual(runner.stats()["queries"], 3)
+
+    async def test_volatile_and_writable_cte_queries_are_not_cached(self) -> None:
+        runner, _ = _runner()
+        cached = CachingSqlRunner(runner, ttl=60)
+        await cached.run_sql(SimpleNamespace(sql="SELECT n FROM t"), context=None)
+        for sql in ("SELECT now()", "SELECT now()"):
+            await cached.run_sql(SimpleNamespace(sql=sql), context=None)
+        self.assertEqual(len(cached.cache), 1)
+
+        cte = "WITH gone AS (DELETE FROM t RETURNING n) SELECT n FROM gone"
+        await cached.run_sql(SimpleNamespace(sql=cte), context=None)
+        await cached.run_sql(SimpleNamespace(sql=cte), context=None)
+
+        self.assertEqual(len(cached.cache), 0)
+        self.assertEqual(runner.stats()["queries"], 5)
+
+    async def test_invalidate_by_text(self) -> None:
+        runner, _ = _runner()
+        cached = CachingSqlRunner(runner, ttl=60)
+        await cached.run_sql(SimpleNamespace(sql="SELECT n FROM orders"), context=None)
+        await cached.run_sql(SimpleNamespace(sql="SELECT n FROM users"), context=None)
+
+        self.assertEqual(cached.invalidate("ORDERS"), 1)
+        self.assertEqual(len(cached.cache), 1)
+        self.assertEqual(cached.invalidate(), 1)
+        self.assertEqual(len(cached.cache), 0)